@@ -3,8 +3,81 @@
 ZetaFrog Desktop Pet - 配置文件
 """
 
+import os
+import sys
+
 # API 配置
 API_BASE_URL = "http://127.0.0.1:3001"
+API_TIMEOUT = 10  # 单次请求超时（秒）
+API_MAX_WORKERS = 4  # 异步请求线程池大小
+
+# GET 响应缓存有效期（秒），按接口前缀最长匹配
+# 过期后会带 ETag 重新验证，未变化时服务端只返回 304
+API_CACHE_TTL = {
+    '/api/frogs/owner': 30,
+    '/api/frogs': 15,
+    '/api/travels/lucky-address': 0,
+    '/api/travels': 30,
+    '/api/friends/list': 60,
+    '/api/friends/requests': 15,
+    '/api/friends/world-online': 15,
+    '/api/badges': 120,
+    '/api/souvenirs': 60,
+    '/api/nft-image': 0,
+}
+API_CACHE_DEFAULT_TTL = 0
+
+# 复用解析结果的条数上限（按最近使用淘汰）
+API_PARSED_MEMO_SIZE = 128
+
+# 实时推送（Socket.IO），断线后按指数退避重连
+REALTIME_URL = API_BASE_URL
+REALTIME_RECONNECT_MIN = 1  # 秒
+REALTIME_RECONNECT_MAX = 60  # 秒
+POLL_FALLBACK_INTERVAL = 30000  # 推送不可用时的轮询间隔（毫秒）
+
+# 纪念品图片生成状态轮询（毫秒）：先快后慢，有图片完成时恢复最快
+IMAGE_POLL_MIN = 3000
+IMAGE_POLL_MAX = 60000
+IMAGE_POLL_BACKOFF = 1.6
+IMAGE_POLL_GIVE_UP = 1800  # 秒，生成超过此时长的任务不再跟踪
+
+# 本地数据目录（快照数据库等）
+if sys.platform == 'win32':
+    DATA_DIR = os.path.join(os.environ.get('APPDATA', os.path.expanduser('~')), 'ZetaFrog')
+else:
+    DATA_DIR = os.path.join(os.environ.get('XDG_CONFIG_HOME', os.path.expanduser('~/.config')), 'zetafrog')
+SNAPSHOT_DB_PATH = os.path.join(DATA_DIR, 'snapshots.db')
+
+# 图片缓存：磁盘（HTTP 缓存）+ 内存（解码并缩放后的图片）
+IMAGE_CACHE_DIR = os.path.join(DATA_DIR, 'image_cache')
+IMAGE_DISK_CACHE_MB = 200
+IMAGE_MEMORY_CACHE_MB = 48
+IMAGE_HOST_CONNECTIONS = 4  # 每个主机同时下载的图片数
+
+# 缩略图：后台线程解码缩放，常用尺寸持久化到磁盘
+THUMBNAIL_DIR = os.path.join(DATA_DIR, 'thumbnails')
+THUMBNAIL_SIZES = (70, 120)  # 画廊卡片 / 详情页
+THUMBNAIL_WORKERS = 2
+
+# 链上访问：每条链一个长连接池，多个 RPC 节点按延迟选择、失败自动切换
+CHAIN_RPC_TIMEOUT = 15  # 单次 RPC 超时（秒）
+CHAIN_RPC_POOL_SIZE = 8  # 每个节点保持的连接数
+CHAIN_RPC_COOLDOWN = 30  # 节点失败后暂停使用的时间（秒），连续失败时翻倍
+CHAIN_PROBE_INTERVAL = 300  # 重新测量各节点延迟的间隔（秒）
+CHAIN_GAS_MARGIN = 1.2  # 预估 gas 的放大系数，留出余量
+CHAIN_NONCE_STALE = 180  # 在途交易多久没有上链视为被丢弃，重新同步 nonce（秒）
+CHAIN_MULTICALL_CHUNK = 100  # 每个 Multicall3 调用合并的读取数，受节点 eth_call gas 上限约束
+# 覆盖 RPC 节点（逗号分隔），用于指向本地测试节点，如 anvil 的 http://127.0.0.1:8545
+CHAIN_RPC_OVERRIDE = os.environ.get('ZETAFROG_RPC_URLS', '')
+
+# 交易确认跟踪：所有在途交易的回执合成一个批量请求，约每个出块间隔查一次，
+# 没有新确认时逐步放慢（毫秒）
+TX_POLL_MIN = 3000
+TX_POLL_MAX = 30000
+TX_POLL_BACKOFF = 1.5
+TX_RECEIPT_BATCH = 50  # 单个批量请求最多查询的交易数
+TX_DROP_TIMEOUT = 1800  # 提交后多久仍未上链视为被丢弃（秒）
 
 # 窗口配置
 WINDOW_SIZE = 200
@@ -13,6 +86,36 @@ WINDOW_ALWAYS_ON_TOP = True
 # 动画配置
 ANIMATION_FPS = 30
 BREATH_DURATION = 3500  # 呼吸动画周期（毫秒）
+ANIMATION_IDLE_TIMEOUT = 300  # 用户无操作多久后暂停动画（秒），0 为不暂停
+SESSION_POLL_INTERVAL = 2000  # 锁屏 / 全屏 / 空闲检测间隔（毫秒）
+
+# 性能配置：'auto' 时接电源用 full，用电池用 balanced，电量低于阈值用 eco
+PERFORMANCE_PROFILE = 'auto'
+BATTERY_LOW_PERCENT = 20
+POWER_POLL_INTERVAL = 60000  # 电源状态检测间隔（毫秒）
+PERFORMANCE_PROFILES = {
+    'full': {
+        'name': '全效',
+        'animation_fps': ANIMATION_FPS,
+        'particle_scale': 1.0,   # 特效粒子数量倍率，0 为关闭粒子
+        'poll_interval': POLL_FALLBACK_INTERVAL,
+        'image_downloads': 6,    # 同时下载的图片数
+    },
+    'balanced': {
+        'name': '均衡',
+        'animation_fps': 20,
+        'particle_scale': 0.5,
+        'poll_interval': POLL_FALLBACK_INTERVAL * 2,
+        'image_downloads': 4,
+    },
+    'eco': {
+        'name': '省电',
+        'animation_fps': 10,
+        'particle_scale': 0.0,
+        'poll_interval': POLL_FALLBACK_INTERVAL * 6,
+        'image_downloads': 2,
+    },
+}
 
 # 状态枚举
 class FrogState:
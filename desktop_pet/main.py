@@ -14,6 +14,15 @@ from PyQt5.QtCore import Qt
 
 from ui.pet_widget import PetWidget
 from ui.theme_config import setup_fluent_theme
+from services.api_client import api_client
+from services.snapshot_store import snapshot_store
+from services.thumbnail_pipeline import thumbnail_pipeline
+from services.realtime_client import realtime_client
+from services.image_status_poller import image_status_poller
+from services.tx_tracker import tx_tracker
+from services.performance_profile import profile_manager
+from ui.components.animation_clock import animation_clock
+from ui.components.session_monitor import session_monitor
 
 
 def main():
@@ -24,14 +33,37 @@ def main():
     
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # 关闭窗口不退出，通过托盘退出
+    app.aboutToQuit.connect(api_client.shutdown)
+    app.aboutToQuit.connect(thumbnail_pipeline.shutdown)
+    app.aboutToQuit.connect(snapshot_store.close)
+    app.aboutToQuit.connect(realtime_client.stop)
+    app.aboutToQuit.connect(tx_tracker.shutdown)
     
     # 初始化 Fluent 暗色主题
     setup_fluent_theme()
     
+    # 性能配置（按电源状态自动切换）
+    profile_manager.start()
+    
     # 创建主窗口
     pet = PetWidget()
     pet.show()
     
+    # 实时推送（不可用时各界面回退到轮询）
+    realtime_client.start()
+    
+    # 纪念品加载后自动跟踪生成中的图片
+    image_status_poller.start()
+    
+    # 继续跟踪上次退出时尚未确认的链上交易
+    tx_tracker.start()
+    
+    # 锁屏 / 全屏应用 / 长时间空闲时暂停所有动画
+    session_monitor.active_changed.connect(
+        lambda active, reason: animation_clock.resume('session') if active
+        else animation_clock.suspend('session'))
+    session_monitor.start()
+    
     # 显示欢迎消息
     pet.tray_icon.showMessage(
         'ZetaFrog 桌面宠物',
@@ -1,2 +1,10 @@
 # -*- coding: utf-8 -*-
 """Models package"""
+
+from models.common import CHAIN_NAMES, RARITY_ORDER, chain_name, parse_time
+from models.frog import Frog
+from models.friend import Friend
+from models.souvenir import Souvenir
+from models.souvenir_index import SouvenirIndex
+from models.badge import Badge
+from models.travel import Travel
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 徽章模型
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from models.common import Model, parse_time, to_int
+
+
+class Badge(Model):
+    """徽章（含当前青蛙的解锁状态）"""
+
+    __slots__ = ('code', 'name', 'description', 'icon', 'rarity', 'category',
+                 'requirement', 'unlocked', 'progress', 'unlocked_at')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.code: str = raw.get('code') or ''
+        self.name: str = raw.get('name') or ''
+        self.description: str = raw.get('description') or ''
+        self.icon: str = raw.get('icon') or '🏆'
+        self.rarity: int = to_int(raw.get('rarity'), 1)
+        self.category: Optional[str] = raw.get('category')
+        self.requirement: str = raw.get('requirement') or ''
+        self.unlocked: bool = bool(raw.get('unlocked', False))
+        self.progress = raw.get('progress', 0) or 0
+        self.unlocked_at: Optional[datetime] = parse_time(raw.get('unlockedAt'))
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> 'Badge':
+        return cls(raw)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 模型公共工具
+链名称、稀有度顺序、时间解析
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+
+
+CHAIN_NAMES = {
+    7001: 'ZetaChain',
+    97: 'BSC',
+    11155111: 'Ethereum',
+    42161: 'Arbitrum',
+}
+
+RARITY_ORDER = {
+    'Common': 1,
+    'Uncommon': 2,
+    'Rare': 3,
+    'Epic': 4,
+    'Legendary': 5,
+}
+
+
+def chain_name(chain_id: Optional[int]) -> str:
+    """链 ID 转显示名称"""
+    if chain_id in CHAIN_NAMES:
+        return CHAIN_NAMES[chain_id]
+    return f'Chain {chain_id}' if chain_id else 'Unknown'
+
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """解析后端返回的 ISO 时间字符串，失败返回 None"""
+    if not value or not isinstance(value, str):
+        return None
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def to_int(value: Any, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Model:
+    """
+    slots 模型基类
+
+    raw 保留原始字典，未建模的字段仍可通过 raw 访问。
+    """
+
+    __slots__ = ('raw',)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({getattr(self, "name", "")!r})'
+
+    def to_dict(self) -> dict:
+        """原始数据（用于快照等序列化场景）"""
+        return self.raw
+
+    @classmethod
+    def _all_slots(cls):
+        for klass in cls.__mro__:
+            yield from getattr(klass, '__slots__', ())
+
+    def update_from(self, other: 'Model') -> bool:
+        """
+        用另一份同类数据原地更新本对象
+
+        Returns:
+            是否有变化
+        """
+        if other.raw == self.raw:
+            return False
+        for name in self._all_slots():
+            setattr(self, name, getattr(other, name))
+        return True
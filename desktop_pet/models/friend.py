@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 好友模型
+"""
+
+from typing import Any, Dict, Optional
+
+from models.common import to_int
+from models.frog import Frog
+
+
+class Friend(Frog):
+    """好友（青蛙字段 + 好友关系字段）"""
+
+    __slots__ = ('friendship_id', 'is_online', 'intimacy')
+
+    def __init__(self, raw: Dict[str, Any]):
+        super().__init__(raw)
+        self.friendship_id: Optional[int] = raw.get('friendshipId')
+        self.is_online: bool = bool(raw.get('isOnline', False))
+        self.intimacy: int = to_int(raw.get('intimacy'))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 青蛙模型
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from models.common import Model, parse_time, to_int
+
+
+class Frog(Model):
+    """青蛙"""
+
+    __slots__ = ('id', 'token_id', 'name', 'owner_address', 'status', 'level', 'xp',
+                 'total_travels', 'personality', 'birthday', 'created_at')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.id: Optional[int] = raw.get('id')
+        self.token_id: Optional[int] = raw.get('tokenId')
+        self.name: str = raw.get('name') or '未命名'
+        self.owner_address: str = (raw.get('ownerAddress') or '').lower()
+        self.status: str = raw.get('status') or 'Idle'
+        self.level: int = to_int(raw.get('level'), 1)
+        self.xp: int = to_int(raw.get('xp'))
+        self.total_travels: int = to_int(raw.get('totalTravels'))
+        self.personality: Optional[str] = raw.get('personality')
+        self.birthday: Optional[datetime] = parse_time(raw.get('birthday'))
+        self.created_at: Optional[datetime] = parse_time(raw.get('createdAt'))
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> 'Frog':
+        return cls(raw)
+
+    @property
+    def api_id(self) -> Optional[int]:
+        """调用后端接口使用的 ID（tokenId，缺失时退回数据库 id）"""
+        return self.token_id if self.token_id is not None else self.id
+
+    @property
+    def is_traveling(self) -> bool:
+        return self.status == 'Traveling'
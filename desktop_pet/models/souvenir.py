@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 纪念品模型
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from models.common import Model, RARITY_ORDER, chain_name, parse_time, to_int
+
+
+def pick_image_url(raw: Dict[str, Any]) -> Optional[str]:
+    """
+    选出最合适的图片地址
+
+    优先 images 中 COMPLETED 的记录，其次第一条记录，最后降级到 imageUrl / metadataUri。
+    """
+    images = raw.get('images')
+    url = None
+    if images and isinstance(images, list):
+        image = next((img for img in images if img.get('status') == 'COMPLETED'), images[0])
+        url = image.get('imageUrl') or image.get('gatewayUrl')
+    if not url:
+        url = raw.get('imageUrl') or raw.get('metadataUri')
+    return url if url and url.startswith('http') else None
+
+
+class Souvenir(Model):
+    """纪念品"""
+
+    __slots__ = ('id', 'token_id', 'frog_id', 'name', 'rarity', 'rarity_order',
+                 'chain_id', 'chain_name', 'image_url', 'images', 'created_at', 'created_ts')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.id: Optional[int] = raw.get('id')
+        self.token_id = raw.get('tokenId')
+        self.frog_id: Optional[int] = raw.get('frogId')
+        self.name: str = raw.get('name') or '纪念品'
+        self.rarity: str = raw.get('rarity') or 'Common'
+        self.rarity_order: int = RARITY_ORDER.get(self.rarity, 1)
+        self.chain_id: int = to_int(raw.get('chainId'), 7001)
+        self.chain_name: str = chain_name(self.chain_id)
+        self.images: List[Dict[str, Any]] = raw.get('images') or []
+        self.image_url: Optional[str] = pick_image_url(raw)
+        self.created_at: Optional[datetime] = parse_time(raw.get('createdAt'))
+        self.created_ts: float = self.created_at.timestamp() if self.created_at else 0.0
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> 'Souvenir':
+        return cls(raw)
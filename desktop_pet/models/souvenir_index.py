@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 纪念品集合索引
+
+每次加载数据时构建一次：按稀有度 / 来源链分桶、各排序方式的排名、
+聚合计数。之后切换筛选和排序只需从桶里取出结果并按排名排列，
+同一组合的结果会被记住，不再对整个集合重新筛选和排序。
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models.souvenir import Souvenir
+
+
+ALL = 'all'
+
+
+class SouvenirIndex:
+    """纪念品集合索引（只读，数据变化时重新构建）"""
+
+    # 排序方式 -> (属性, 是否倒序)
+    SORT_KEYS = {
+        'newest': ('created_ts', True),
+        'oldest': ('created_ts', False),
+        'rarity_desc': ('rarity_order', True),
+        'rarity_asc': ('rarity_order', False),
+    }
+
+    def __init__(self, souvenirs: Iterable[Souvenir] = ()):
+        self.items: List[Souvenir] = list(souvenirs)
+
+        # 分桶：值 -> 位置列表
+        self._by_rarity: Dict[str, List[int]] = {}
+        self._by_chain: Dict[int, List[int]] = {}
+        for pos, s in enumerate(self.items):
+            self._by_rarity.setdefault(s.rarity, []).append(pos)
+            self._by_chain.setdefault(s.chain_id, []).append(pos)
+
+        # 聚合计数
+        self.rarity_counts = Counter({r: len(p) for r, p in self._by_rarity.items()})
+        self.chain_counts = Counter({c: len(p) for c, p in self._by_chain.items()})
+        self._pair_counts = Counter((s.rarity, s.chain_id) for s in self.items)
+
+        # 排序方式 -> 排列（位置序列）/ 排名（位置 -> 名次），按需计算
+        self._orders: Dict[str, Sequence[int]] = {}
+        self._ranks: Dict[str, List[int]] = {}
+        # (rarity, chain, sort) -> 结果
+        self._selections: Dict[Tuple, List[Souvenir]] = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    # ===== 排序 =====
+
+    def order(self, sort: str) -> Sequence[int]:
+        """按 sort 排好的位置序列"""
+        order = self._orders.get(sort)
+        if order is None:
+            attr, reverse = self.SORT_KEYS.get(sort, self.SORT_KEYS['newest'])
+            keys = [getattr(s, attr) for s in self.items]
+            order = self._orders[sort] = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+        return order
+
+    def _rank(self, sort: str) -> List[int]:
+        rank = self._ranks.get(sort)
+        if rank is None:
+            rank = self._ranks[sort] = [0] * len(self.items)
+            for r, pos in enumerate(self.order(sort)):
+                rank[pos] = r
+        return rank
+
+    # ===== 查询 =====
+
+    def _positions(self, rarity, chain) -> Optional[List[int]]:
+        """筛选后的位置（未排序）；不筛选时返回 None"""
+        if rarity == ALL and chain == ALL:
+            return None
+        if chain == ALL:
+            return self._by_rarity.get(rarity, [])
+        if rarity == ALL:
+            return self._by_chain.get(chain, [])
+        # 两个条件都有：遍历较小的桶
+        by_rarity = self._by_rarity.get(rarity, [])
+        by_chain = self._by_chain.get(chain, [])
+        if len(by_rarity) <= len(by_chain):
+            return [p for p in by_rarity if self.items[p].chain_id == chain]
+        return [p for p in by_chain if self.items[p].rarity == rarity]
+
+    def select(self, rarity=ALL, chain=ALL, sort: str = 'newest',
+               exclude_ids: Iterable = ()) -> List[Souvenir]:
+        """
+        筛选并排序
+
+        Args:
+            rarity: 稀有度（'all' 为全部）
+            chain: 链 ID（'all' 为全部）
+            sort: SORT_KEYS 中的排序方式
+            exclude_ids: 排除的纪念品 ID（如合成时已放入槽位的）
+
+        Returns:
+            新列表，调用方可自由修改
+        """
+        key = (rarity, chain, sort)
+        result = self._selections.get(key)
+        if result is None:
+            positions = self._positions(rarity, chain)
+            if positions is None:
+                order = self.order(sort)
+            else:
+                order = sorted(positions, key=self._rank(sort).__getitem__)
+            result = self._selections[key] = [self.items[p] for p in order]
+
+        exclude = set(exclude_ids)
+        if exclude:
+            return [s for s in result if s.id not in exclude]
+        return list(result)
+
+    def count(self, rarity=ALL, chain=ALL) -> int:
+        """筛选结果数量（不需要构建列表）"""
+        if rarity == ALL and chain == ALL:
+            return len(self.items)
+        if chain == ALL:
+            return self.rarity_counts[rarity]
+        if rarity == ALL:
+            return self.chain_counts[chain]
+        return self._pair_counts[(rarity, chain)]
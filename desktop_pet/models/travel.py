@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 旅行模型
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from models.common import Model, chain_name, parse_time, to_int
+from models.souvenir import Souvenir
+
+
+class Travel(Model):
+    """旅行记录"""
+
+    __slots__ = ('id', 'frog_id', 'status', 'chain_id', 'chain_name', 'target_wallet',
+                 'duration', 'progress', 'current_stage', 'start_time', 'end_time', 'souvenir')
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.id: Optional[int] = raw.get('id')
+        self.frog_id: Optional[int] = raw.get('frogId')
+        self.status: str = raw.get('status') or 'Unknown'
+        self.chain_id: int = to_int(raw.get('chainId'))
+        self.chain_name: str = chain_name(self.chain_id)
+        self.target_wallet: Optional[str] = raw.get('targetWallet')
+        self.duration: int = to_int(raw.get('duration'))
+        self.progress: int = to_int(raw.get('progress'))
+        self.current_stage: Optional[str] = raw.get('currentStage')
+        self.start_time: Optional[datetime] = parse_time(raw.get('startTime'))
+        self.end_time: Optional[datetime] = parse_time(raw.get('endTime'))
+        souvenir = raw.get('souvenir')
+        self.souvenir: Optional[Souvenir] = Souvenir(souvenir) if isinstance(souvenir, dict) else None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> 'Travel':
+        return cls(raw)
+
+    @property
+    def start_date(self) -> str:
+        """开始日期 YYYY-MM-DD"""
+        return self.start_time.strftime('%Y-%m-%d') if self.start_time else ''
@@ -1,52 +1,244 @@
 # -*- coding: utf-8 -*-
 """
 ZetaFrog Desktop Pet - API 客户端
+
+同步方法保持原有调用方式；界面代码应优先使用 call_async，
+请求在后台线程池执行，结果通过 Qt 信号回到 GUI 线程。
 """
 
 import requests
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, List, Callable
+import threading
 import sys
 import os
 
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, pyqtSignal
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import API_BASE_URL
+from config import (
+    API_BASE_URL, API_TIMEOUT, API_MAX_WORKERS, API_CACHE_TTL, API_CACHE_DEFAULT_TTL,
+    API_PARSED_MEMO_SIZE
+)
+from services.response_cache import ResponseCache
+from services.single_flight import SingleFlight
+from services.snapshot_store import snapshot_store
+from services.entity_store import entity_store
+from models import Frog, Friend, Souvenir, Badge, Travel
+
+
+class _CallbackDispatcher(QObject):
+    """把工作线程的结果投递回 GUI 线程"""
+    
+    delivered = pyqtSignal(object, object)  # (callback, payload)
+    
+    def __init__(self):
+        super().__init__()
+        # 跨线程 emit 时自动走队列连接，槽函数在本对象所在线程（GUI）执行
+        self.delivered.connect(self._deliver)
+    
+    def _deliver(self, callback, payload):
+        callback(payload)
 
 
 class ApiClient:
     """API 客户端基类"""
     
-    def __init__(self, base_url: str = API_BASE_URL):
+    def __init__(self, base_url: str = API_BASE_URL, max_workers: int = API_MAX_WORKERS):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-        })
+        self._local = threading.local()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._dispatcher = _CallbackDispatcher()
+        self._cache = ResponseCache(API_CACHE_TTL, API_CACHE_DEFAULT_TTL)
+        self._inflight = SingleFlight()
+        self._stats = {'network': 0, 'cache_hits': 0, 'not_modified': 0}
+        self._stats_lock = threading.Lock()
+        # (kind, key) -> (原始数据, 模型)，LRU，最多 API_PARSED_MEMO_SIZE 条
+        self._parsed: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._parsed_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """每个线程独立的 Session（requests.Session 不保证线程安全）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'Content-Type': 'application/json',
+            })
+            self._local.session = session
+        return session
+    
+    @staticmethod
+    def _normalize_endpoint(endpoint: str) -> str:
+        """自动补全 /api 前缀"""
+        if not endpoint.startswith('/api'):
+            endpoint = f"/api{endpoint}" if endpoint.startswith('/') else f"/api/{endpoint}"
+        return endpoint
     
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """发送请求"""
-        # 自动补全 /api 前缀
-        if not endpoint.startswith('/api'):
-            endpoint = f"/api{endpoint}" if endpoint.startswith('/') else f"/api/{endpoint}"
-        
+        endpoint = self._normalize_endpoint(endpoint)
+        kwargs.setdefault('timeout', API_TIMEOUT)
+
+        if method != 'GET':
+            return self._send(method, endpoint, None, **kwargs)
+
+        # GET 先查缓存；未命中时相同请求只发一次，其余调用共享结果
+        cache_key = ResponseCache.make_key(endpoint, kwargs.get('params'))
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached.is_fresh:
+            self._count('cache_hits')
+            return cached.data
+        return self._inflight.do(cache_key, lambda: self._send(method, endpoint, cache_key, **kwargs))
+
+    def _send(self, method: str, endpoint: str, cache_key, **kwargs) -> Dict[str, Any]:
+        """实际发出网络请求；cache_key 不为空时参与缓存与条件请求"""
         url = f"{self.base_url}{endpoint}"
-        
+
+        # 过期缓存带条件请求头
+        cached = self._cache.get(cache_key) if cache_key is not None else None
+        if cached is not None and cached.can_revalidate:
+            kwargs['headers'] = {**kwargs.get('headers', {}), **cached.conditional_headers()}
+
         try:
             print(f"[API] {method} {url}")  # 调试日志
+            self._count('network')
             response = self.session.request(method, url, **kwargs)
             print(f"[API] Response: {response.status_code}")  # 调试日志
+
+            if response.status_code == 304 and cached is not None:
+                self._count('not_modified')
+                self._cache.touch(cache_key)
+                return cached.data
+            
             response.raise_for_status()
             data = response.json()
             print(f"[API] Data: {data}")  # 调试日志
             
             # 统一返回结构
             if isinstance(data, dict) and 'success' in data:
-                return data
-            return {'success': True, 'data': data}
+                result = data
+            else:
+                result = {'success': True, 'data': data}
+            
+            if cache_key is not None and result.get('success'):
+                self._cache.put(cache_key, result,
+                                etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified'))
+            return result
             
         except requests.exceptions.RequestException as e:
             print(f"[API] Error: {e}")  # 调试日志
             return {'success': False, 'error': str(e)}
     
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        请求统计
+
+        network: 实际发出的请求数；cache_hits: 缓存直接命中；
+        not_modified: 304 重新验证；coalesced: 并发相同 GET 被合并的次数；
+        saved: 省掉的网络请求总数（cache_hits + coalesced）
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['coalesced'] = self._inflight.coalesced
+        stats['saved'] = stats['cache_hits'] + stats['coalesced']
+        return stats
+
+    def invalidate_cache(self, *endpoints: str):
+        """
+        使缓存过期（按接口前缀）
+        
+        写操作成功后调用，例如 invalidate_cache('/travels', '/frogs')；
+        不传参数时清空全部缓存。
+        """
+        if not endpoints:
+            self._cache.clear()
+            with self._parsed_lock:
+                self._parsed.clear()
+            return
+        self._cache.invalidate(self._normalize_endpoint(e) for e in endpoints)
+    
+    # ===== 异步模式 =====
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix='api'
+                )
+            return self._executor
+    
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """
+        在后台线程池中执行同名的同步方法
+        
+        Args:
+            method: 方法名，如 'get_frogs_by_owner'
+            
+        Returns:
+            concurrent.futures.Future
+        """
+        func = getattr(self, method)
+        return self._get_executor().submit(func, *args, **kwargs)
+    
+    def call_async(self, method: str, *args,
+                   on_success: Optional[Callable[[Any], None]] = None,
+                   on_error: Optional[Callable[[Exception], None]] = None,
+                   owner: Optional[QObject] = None,
+                   **kwargs) -> Future:
+        """
+        异步调用，回调在 GUI 线程执行
+        
+        Args:
+            method: 方法名
+            on_success: 成功回调，参数为同步方法的返回值
+            on_error: 异常回调，参数为异常对象
+            owner: 回调所属的 Qt 对象；对象已销毁（如对话框已关闭）时丢弃结果
+            
+        Returns:
+            concurrent.futures.Future
+        """
+        future = self.submit(method, *args, **kwargs)
+        
+        def deliver(callback, payload):
+            if callback is None:
+                return
+            if owner is not None and sip.isdeleted(owner):
+                return
+            callback(payload)
+        
+        def on_done(f: Future):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                print(f"[API] Async {method} failed: {error}")
+                self._dispatcher.delivered.emit(lambda e: deliver(on_error, e), error)
+            else:
+                self._dispatcher.delivered.emit(lambda r: deliver(on_success, r), f.result())
+        
+        future.add_done_callback(on_done)
+        return future
+    
+    def shutdown(self):
+        """关闭线程池（退出程序时调用）"""
+        print(f"[API] Stats: {self.get_stats()}")
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """GET 请求"""
         return self._request('GET', endpoint, params=params)
@@ -63,24 +255,67 @@ class ApiClient:
         """DELETE 请求"""
         return self._request('DELETE', endpoint)
     
+    def _get_snapshot(self, kind: str, key: Any, endpoint: str,
+                      params: Optional[Dict] = None, default: Any = None,
+                      model: Optional[Callable[[Dict], Any]] = None,
+                      entity: Optional[str] = None) -> Any:
+        """
+        GET 并维护本地快照，按 model 解析为模型对象
+        
+        成功时保存到快照；请求失败（后端不可用等）时返回上次的快照。
+        缓存命中时原始数据是同一个对象，直接复用上次解析的结果。
+        给出 entity 时合并进实体存储，返回全局共享的规范对象。
+        """
+        result = self.get(endpoint, params)
+        if result.get('success'):
+            data = result.get('data', default)
+            with self._parsed_lock:
+                memo = self._parsed.get((kind, key))
+                if memo is not None and memo[0] is data:
+                    self._parsed.move_to_end((kind, key))
+                    return memo[1]
+            if data is not None:
+                snapshot_store.save(kind, key, data)
+        else:
+            data = snapshot_store.load(kind, key, default)
+        
+        if model is None or data is None:
+            return data
+        if isinstance(data, list):
+            parsed = [model(item) for item in data]
+            if entity:
+                parsed = entity_store.merge(entity, parsed, scope=key)
+        else:
+            parsed = model(data)
+            if entity:
+                parsed = entity_store.merge_one(entity, parsed)
+        with self._parsed_lock:
+            self._parsed[(kind, key)] = (data, parsed)
+            self._parsed.move_to_end((kind, key))
+            while len(self._parsed) > API_PARSED_MEMO_SIZE:
+                self._parsed.popitem(last=False)
+        return parsed
+    
     # ===== Frog API =====
     
-    def get_frogs_by_owner(self, address: str) -> List[Dict]:
+    def get_frogs_by_owner(self, address: str) -> List[Frog]:
         """获取用户的所有青蛙"""
-        result = self.get(f'/frogs/owner/{address.lower()}')
-        return result.get('data', []) if result.get('success') else []
+        address = address.lower()
+        return self._get_snapshot('frogs', address, f'/frogs/owner/{address}',
+                                  default=[], model=Frog, entity='frog')
     
-    def get_frog_detail(self, token_id: int, viewer_address: Optional[str] = None) -> Optional[Dict]:
+    def get_frog_detail(self, token_id: int, viewer_address: Optional[str] = None) -> Optional[Frog]:
         """获取青蛙详情"""
         endpoint = f'/frogs/{token_id}'
         if viewer_address:
             endpoint += f'?viewerAddress={viewer_address.lower()}'
-        result = self.get(endpoint)
-        return result.get('data') if result.get('success') else None
+        return self._get_snapshot('frog', token_id, endpoint, model=Frog, entity='frog')
     
     def sync_frog(self, token_id: int) -> bool:
         """同步青蛙数据"""
         result = self.post('/frogs/sync', {'tokenId': token_id})
+        if result.get('success'):
+            self.invalidate_cache('/frogs')
         return result.get('success', False)
     
     # ===== Travel API =====
@@ -93,10 +328,10 @@ class ApiClient:
         result = self.get('/travels/history', params=params)
         return result.get('data', {}) if result.get('success') else {}
     
-    def get_frog_travels(self, frog_id: int) -> List[Dict]:
+    def get_frog_travels(self, frog_id: int) -> List[Travel]:
         """获取青蛙旅行列表"""
-        result = self.get(f'/travels/{frog_id}')
-        return result.get('data', []) if result.get('success') else []
+        return self._get_snapshot('travels', frog_id, f'/travels/{frog_id}',
+                                  default=[], model=Travel, entity='travel')
     
     def get_lucky_address(self, chain: str) -> Optional[str]:
         """获取幸运地址"""
@@ -114,17 +349,18 @@ class ApiClient:
         }
         if target_address:
             data['targetAddress'] = target_address
-        return self.post('/travels/start', data)  # 修复：使用复数 travels
+        result = self.post('/travels/start', data)  # 修复：使用复数 travels
+        if result.get('success'):
+            self.invalidate_cache('/travels', '/frogs')
+            entity_store.update('frog', frog_id, {'status': 'Traveling'})
+        return result
     
     # ===== Friends API =====
     
-    def get_friends(self, frog_id: int) -> List[Dict]:
+    def get_friends(self, frog_id: int) -> List[Friend]:
         """获取好友列表"""
-        result = self.get(f'/friends/list/{frog_id}')  # 修复：使用 /list/ 路径
-        if result.get('success'):
-            return result.get('data', [])
-        # 兼容直接返回数组的情况
-        return result if isinstance(result, list) else []
+        return self._get_snapshot('friends', frog_id, f'/friends/list/{frog_id}',  # 修复：使用 /list/ 路径
+                                  default=[], model=Friend, entity='friend')
     
     def get_friend_requests(self, frog_id: int) -> List[Dict]:
         """获取好友请求"""
@@ -133,68 +369,88 @@ class ApiClient:
             return result.get('data', [])
         return result if isinstance(result, list) else []
     
-    def get_world_online(self, frog_id: int) -> List[Dict]:
+    def get_world_online(self, frog_id: int) -> List[Frog]:
         """获取世界在线列表"""
         result = self.get(f'/friends/world-online', {'currentFrogId': frog_id})
-        return result.get('data', []) if result.get('success') else []
+        return [Frog(f) for f in result.get('data', [])] if result.get('success') else []
     
     def add_friend(self, from_frog_id: int, to_frog_id: int) -> Dict:
         """发送好友请求"""
-        return self.post('/friends/request', {  # 修复：使用 /request 路径
+        result = self.post('/friends/request', {  # 修复：使用 /request 路径
             'requesterId': from_frog_id,
             'addresseeId': to_frog_id,
         })
+        if result.get('success'):
+            self.invalidate_cache('/friends')
+        return result
     
     def accept_friend(self, friendship_id: int) -> Dict:
         """接受好友请求"""
-        return self.put(f'/friends/request/{friendship_id}/respond', {  # 修复：使用正确路径
+        result = self.put(f'/friends/request/{friendship_id}/respond', {  # 修复：使用正确路径
             'status': 'Accepted'
         })
+        if result.get('success'):
+            self.invalidate_cache('/friends')
+        return result
     
     # ===== Badges API =====
     
-    def get_badges(self, frog_id: Optional[int] = None, owner_address: Optional[str] = None) -> List[Dict]:
+    def get_badges(self, frog_id: Optional[int] = None, owner_address: Optional[str] = None) -> List[Badge]:
         """获取徽章"""
         if frog_id:
-            result = self.get(f'/badges/{frog_id}')
+            return self._get_snapshot('badges', frog_id, f'/badges/{frog_id}',
+                                      default=[], model=Badge, entity='badge')
         elif owner_address:
-            result = self.get('/badges', {'ownerAddress': owner_address})
-        else:
-            return []
-        return result.get('data', []) if result.get('success') else []
+            return self._get_snapshot('badges', f'owner:{owner_address.lower()}', '/badges',
+                                      {'ownerAddress': owner_address}, default=[], model=Badge, entity='badge')
+        return []
     
     # ===== Souvenirs API =====
     
-    def get_souvenirs(self, frog_id: Optional[int] = None, owner_address: Optional[str] = None) -> List[Dict]:
+    def get_souvenirs(self, frog_id: Optional[int] = None, owner_address: Optional[str] = None) -> List[Souvenir]:
         """获取纪念品"""
         if frog_id:
-            result = self.get(f'/souvenirs/{frog_id}')
+            return self._get_snapshot('souvenirs', frog_id, f'/souvenirs/{frog_id}',
+                                      default=[], model=Souvenir, entity='souvenir')
         elif owner_address:
-            result = self.get('/souvenirs', {'ownerAddress': owner_address})
-        else:
-            return []
-        return result.get('data', []) if result.get('success') else []
+            return self._get_snapshot('souvenirs', f'owner:{owner_address.lower()}', '/souvenirs',
+                                      {'ownerAddress': owner_address}, default=[], model=Souvenir, entity='souvenir')
+        return []
     
     def get_souvenir_image_status(self, souvenir_id: str) -> Dict:
         """获取纪念品图片状态"""
         return self.get(f'/nft-image/status/{souvenir_id}')
     
+    def get_souvenir_images(self, frog_token_id: int, limit: int = 20) -> Optional[List[Dict]]:
+        """批量获取某只青蛙最近的纪念品图片记录（按创建时间倒序），失败返回 None"""
+        result = self.get(f'/nft-image/list/{frog_token_id}', {'limit': limit})
+        if not result.get('success'):
+            return None
+        return result.get('data') or []
+    
     def gift_souvenir(self, souvenir_id: int, to_frog_id: int) -> Dict:
         """赠送纪念品给好友"""
-        return self.post('/souvenirs/gift', {
+        result = self.post('/souvenirs/gift', {
             'souvenirId': souvenir_id,
             'toFrogId': to_frog_id
         })
+        if result.get('success'):
+            self.invalidate_cache('/souvenirs')
+            entity_store.remove('souvenir', souvenir_id)
+        return result
     
     # ===== Interaction API =====
     
     def send_interaction(self, from_frog_id: int, to_frog_id: int, action_type: str) -> Dict:
         """发送好友互动"""
-        return self.post('/friends/interact', {
+        result = self.post('/friends/interact', {
             'fromFrogId': from_frog_id,
             'toFrogId': to_frog_id,
             'actionType': action_type  # wave, feed, gift, message, visit
         })
+        if result.get('success'):
+            self.invalidate_cache('/friends/list')  # 亲密度会变化
+        return result
     
     def accept_friend_request(self, request_id: int) -> Dict:
         """接受好友请求 (别名方法)"""
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 链上访问
+
+每条链一个共享的 Web3 实例（chain_pool.get(chain_id)），底层是保持长连接的
+requests.Session，不再每次铸造都重新建立连接。链配置中的多个 RPC 节点按测得的
+延迟排序，当前节点连接失败、超时或返回 429/5xx 时自动换下一个，失败的节点冷却
+一段时间后再参与选择。
+
+设置环境变量 ZETAFROG_RPC_URLS 可以让所有请求指向本地测试节点（anvil 等）。
+web3 较重，只在需要上链的工作线程中按需导入本模块。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.providers.rpc import HTTPProvider
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    CHAIN_RPC_TIMEOUT, CHAIN_RPC_POOL_SIZE, CHAIN_RPC_COOLDOWN,
+    CHAIN_PROBE_INTERVAL, CHAIN_RPC_OVERRIDE
+)
+from services.contracts import CHAINS, CHAIN_CONFIG, ZETAFROG_ADDRESS, ZETAFROG_ABI
+
+
+# 延迟滑动平均中新样本的权重
+LATENCY_ALPHA = 0.3
+
+# 测量延迟时的超时（秒）
+PROBE_TIMEOUT = 5
+
+# 连续失败时冷却时间最多翻倍的次数
+MAX_COOLDOWN_DOUBLINGS = 5
+
+
+def _is_endpoint_failure(error: Exception) -> bool:
+    """是否是节点本身的问题（换个节点可能成功）"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class RpcEndpoint:
+    """单个 RPC 节点及其健康状况"""
+
+    def __init__(self, url: str, order: int):
+        self.url = url
+        self.order = order  # 配置中的顺序，延迟未知时按此排序
+        self.latency: Optional[float] = None  # 秒，指数滑动平均
+        self.failures = 0  # 连续失败次数
+        self.down_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def record_success(self, elapsed: float):
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency += LATENCY_ALPHA * (elapsed - self.latency)
+        self.failures = 0
+        self.down_until = 0.0
+        self.requests += 1
+
+    def record_failure(self):
+        self.failures += 1
+        self.errors += 1
+        self.requests += 1
+        cooldown = CHAIN_RPC_COOLDOWN * 2 ** min(self.failures - 1, MAX_COOLDOWN_DOUBLINGS)
+        self.down_until = time.monotonic() + cooldown
+
+    def sort_key(self, now: float):
+        # 可用的在前；测过延迟的按延迟，没测过的按配置顺序排在后面
+        return (now < self.down_until, self.latency is None, self.latency or 0.0, self.order)
+
+
+class FailoverHTTPProvider(HTTPProvider):
+    """
+    多节点 HTTP Provider
+
+    所有节点共用一个 Session（按主机保持连接池）。每次请求按
+    RpcEndpoint.sort_key 依次尝试，全部失败时抛出最后一个错误；
+    冷却中的节点排在最后，所有节点都不可用时仍会尝试。
+
+    覆盖的是 web3 7+ HTTPProvider 的 _make_request / make_batch_request。
+    """
+
+    def __init__(self, urls: Sequence[str], session: requests.Session,
+                 timeout: float = CHAIN_RPC_TIMEOUT, chain_id: Optional[int] = None):
+        # 重试由切换节点负责，关闭 HTTPProvider 自带的同节点重试
+        super().__init__(urls[0], request_kwargs={'timeout': timeout},
+                         exception_retry_configuration=None)
+        # 请求直接走这个 Session，不经过 web3 内部按线程缓存的会话
+        self._session = session
+        self.endpoints = [RpcEndpoint(url, i) for i, url in enumerate(urls)]
+        self.chain_id = chain_id
+        self._lock = threading.Lock()
+        self._last_probe = 0.0
+        self._probing = False
+
+    def __str__(self) -> str:
+        return f"RPC failover {', '.join(e.url for e in self.endpoints)}"
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """按优先级排好的节点"""
+        now = time.monotonic()
+        with self._lock:
+            return sorted(self.endpoints, key=lambda e: e.sort_key(now))
+
+    def _post_to(self, url: str, request_data: bytes, **kwargs) -> bytes:
+        response = self._session.post(url, data=request_data, **kwargs)
+        response.raise_for_status()
+        return response.content
+
+    def _post(self, request_data: bytes) -> bytes:
+        self._maybe_probe()
+        last_error: Optional[Exception] = None
+        for endpoint in self.ranked():
+            start = time.monotonic()
+            try:
+                raw = self._post_to(endpoint.url, request_data, **self.get_request_kwargs())
+            except (requests.RequestException, OSError) as e:
+                if not _is_endpoint_failure(e):
+                    raise
+                with self._lock:
+                    endpoint.record_failure()
+                print(f"[Chain] 节点不可用，切换下一个: {endpoint.url} ({e})")
+                last_error = e
+                continue
+            with self._lock:
+                endpoint.record_success(time.monotonic() - start)
+            self.endpoint_uri = endpoint.url
+            return raw
+        raise last_error
+
+    def _make_request(self, method, request_data: bytes) -> bytes:
+        return self._post(request_data)
+
+    def make_batch_request(self, batch_requests):
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        response = self.decode_rpc_response(self._post(request_data))
+        if not isinstance(response, list):
+            # 整批出错时节点只返回一个错误对象
+            return response
+        return sorted(response, key=lambda r: r.get('id', 0))
+
+    # ===== 延迟测量 =====
+
+    def _maybe_probe(self):
+        """定期在后台测量各节点延迟，不阻塞当前请求"""
+        if len(self.endpoints) < 2:
+            return
+        with self._lock:
+            if self._probing or time.monotonic() - self._last_probe < CHAIN_PROBE_INTERVAL:
+                return
+            self._probing = True
+        threading.Thread(target=self.probe, name='rpc-probe', daemon=True).start()
+
+    def probe(self):
+        """
+        并发向每个节点发送 eth_chainId 测量延迟
+
+        返回的链 ID 与配置不符的节点按故障处理（例如配置错了网络）。
+        """
+        request_data = self.encode_rpc_request('eth_chainId', [])
+        kwargs = {**self.get_request_kwargs(), 'timeout': PROBE_TIMEOUT}
+
+        def measure(endpoint: RpcEndpoint):
+            start = time.monotonic()
+            try:
+                raw = self._post_to(endpoint.url, request_data, **kwargs)
+                chain_id = int(self.decode_rpc_response(raw)['result'], 16)
+            except (requests.RequestException, OSError, ValueError, KeyError, TypeError) as e:
+                print(f"[Chain] 节点测速失败: {endpoint.url} ({e})")
+                chain_id = None
+            if chain_id is not None and self.chain_id is not None and chain_id != self.chain_id:
+                print(f"[Chain] 节点链 ID 不符: {endpoint.url} ({chain_id} != {self.chain_id})")
+                chain_id = None
+            with self._lock:
+                if chain_id is None:
+                    endpoint.record_failure()
+                else:
+                    endpoint.record_success(time.monotonic() - start)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.endpoints)) as executor:
+                list(executor.map(measure, self.endpoints))
+        finally:
+            with self._lock:
+                self._last_probe = time.monotonic()
+                self._probing = False
+
+
+class ChainClient:
+    """
+    单条链的访问入口
+
+    - w3: 共享的 Web3 实例（线程安全，可在多个工作线程中使用）
+    - contract(address, abi): 按地址缓存的合约对象
+    """
+
+    def __init__(self, chain: Dict, rpc_urls: Optional[Sequence[str]] = None):
+        self.chain = chain
+        self.chain_id: int = chain['chain_id']
+        urls = list(rpc_urls or chain.get('rpc_urls') or [chain['rpc_url']])
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(urls), pool_maxsize=CHAIN_RPC_POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.provider = FailoverHTTPProvider(urls, self.session, CHAIN_RPC_TIMEOUT, self.chain_id)
+        self.w3 = Web3(self.provider)
+        self._contracts: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def is_connected(self) -> bool:
+        return self.w3.is_connected()
+
+    def contract(self, address: str, abi: List[Dict]):
+        """合约对象（同一地址只构建一次）"""
+        address = Web3.to_checksum_address(address)
+        with self._lock:
+            contract = self._contracts.get(address)
+            if contract is None:
+                contract = self._contracts[address] = self.w3.eth.contract(address=address, abi=abi)
+        return contract
+
+    def zetafrog(self):
+        return self.contract(ZETAFROG_ADDRESS, ZETAFROG_ABI)
+
+    def get_stats(self) -> List[Dict]:
+        """各节点状态（调试用）"""
+        now = time.monotonic()
+        return [{
+            'url': e.url,
+            'latency_ms': None if e.latency is None else round(e.latency * 1000, 1),
+            'requests': e.requests,
+            'errors': e.errors,
+            'available': now >= e.down_until,
+        } for e in self.provider.ranked()]
+
+    def close(self):
+        self.session.close()
+
+
+class ChainPool:
+    """按 chain_id 复用 ChainClient"""
+
+    def __init__(self):
+        self._clients: Dict[int, ChainClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, chain_id: int = CHAIN_CONFIG['chain_id']) -> ChainClient:
+        with self._lock:
+            client = self._clients.get(chain_id)
+            if client is None:
+                chain = CHAINS.get(chain_id)
+                if chain is None:
+                    raise ValueError(f'不支持的链: {chain_id}')
+                override = [url.strip() for url in CHAIN_RPC_OVERRIDE.split(',') if url.strip()]
+                client = self._clients[chain_id] = ChainClient(chain, override or None)
+            return client
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+# 全局实例
+chain_pool = ChainPool()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 链上批量读取
+
+钱包里或好友列表中有很多只青蛙时，逐个 eth_call getFrog 要等很多个往返。
+这里把多次只读调用合并进 Multicall3.aggregate3（每 CHAIN_MULTICALL_CHUNK 个一组，
+避免超过节点 eth_call 的 gas 上限），多组再合成一个 JSON-RPC 批量请求，
+通常一次往返即可读完。单个调用失败（如 tokenId 不存在）只影响它自己。
+
+读取方式（mode）：
+- 'multicall': Multicall3 聚合（默认）；链上没有 Multicall3 时自动退回 'batch'
+- 'batch': 每个调用一个 eth_call，合成 JSON-RPC 批量请求
+- 'sequential': 逐个 eth_call
+后两种不依赖任何已部署的辅助合约，可直接在本地开发链（anvil 等）上对比测速。
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CHAIN_MULTICALL_CHUNK
+from services.chain_client import ChainClient
+from services.contracts import MULTICALL3_ADDRESS, MULTICALL3_ABI, FROG_STATUS_NAMES
+
+
+# 一次只读调用：(合约对象, 函数名, 参数)
+Call = Tuple[Any, str, Sequence[Any]]
+
+MODES = ('multicall', 'batch', 'sequential')
+
+
+class MulticallUnavailable(Exception):
+    """链上没有 Multicall3 合约"""
+
+
+class ChainReader:
+    """
+    只读调用批量执行器
+
+    用法：
+        reader = ChainReader(chain_pool.get())
+        frogs = reader.get_frogs([1, 2, 3])   # {tokenId: 青蛙数据 或 None}
+    """
+
+    def __init__(self, chain: ChainClient, mode: str = 'multicall'):
+        if mode not in MODES:
+            raise ValueError(f'不支持的读取方式: {mode}')
+        self.chain = chain
+        self.mode = mode
+        self._output_types: Dict[Tuple[str, str], List[str]] = {}
+
+    # ===== 通用读取 =====
+
+    def read(self, calls: Sequence[Call]) -> List[Optional[Any]]:
+        """
+        批量执行只读调用
+
+        Returns:
+            与 calls 一一对应的解码结果；单个返回值直接给出，多个返回值为 tuple；
+            调用失败为 None
+        """
+        if not calls:
+            return []
+        encoded = [(contract.address, contract.encode_abi(fn_name, args=list(args)))
+                   for contract, fn_name, args in calls]
+
+        if self.mode == 'multicall':
+            try:
+                raw = self._read_multicall(encoded)
+            except MulticallUnavailable as e:
+                print(f"[ChainReader] {e}，改为批量 eth_call")
+                self.mode = 'batch'
+        if self.mode != 'multicall':
+            raw = self._read_direct(encoded)
+
+        return [self._decode(contract, fn_name, data)
+                for (contract, fn_name, _), data in zip(calls, raw)]
+
+    def _read_multicall(self, encoded: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+        address = self.chain.chain.get('multicall3', MULTICALL3_ADDRESS)
+        multicall = self.chain.contract(address, MULTICALL3_ABI)
+
+        chunks = [encoded[i:i + CHAIN_MULTICALL_CHUNK] for i in range(0, len(encoded), CHAIN_MULTICALL_CHUNK)]
+        aggregate_calls = [{
+            'to': multicall.address,
+            'data': multicall.encode_abi('aggregate3', args=[[(target, True, data) for target, data in chunk]]),
+        } for chunk in chunks]
+
+        results: List[Optional[bytes]] = []
+        for chunk, response in zip(chunks, self._eth_calls(aggregate_calls)):
+            result = response.get('result')
+            if result in (None, '0x'):
+                if result == '0x':
+                    # 目标地址没有代码时 eth_call 返回空
+                    raise MulticallUnavailable(f'链 {self.chain.chain_id} 上没有 Multicall3')
+                print(f"[ChainReader] Multicall 调用失败: {response.get('error')}")
+                results.extend([None] * len(chunk))
+                continue
+            (entries,) = self.chain.w3.codec.decode(['(bool,bytes)[]'], bytes.fromhex(result[2:]))
+            results.extend(data if success else None for success, data in entries)
+        return results
+
+    def _read_direct(self, encoded: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+        responses = self._eth_calls([{'to': target, 'data': data} for target, data in encoded])
+        return [bytes.fromhex(r['result'][2:]) if r.get('result') else None for r in responses]
+
+    def _eth_calls(self, calls: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """执行一组 eth_call，返回 JSON-RPC 响应（含 result 或 error）"""
+        provider = self.chain.provider
+        rpc_requests = [('eth_call', [call, 'latest']) for call in calls]
+        if self.mode != 'sequential' and len(rpc_requests) > 1:
+            responses = []
+            for i in range(0, len(rpc_requests), CHAIN_MULTICALL_CHUNK):
+                chunk = rpc_requests[i:i + CHAIN_MULTICALL_CHUNK]
+                try:
+                    batch = provider.make_batch_request(chunk)
+                except (ValueError, TypeError, KeyError, requests.HTTPError) as e:
+                    # 节点拒绝批量请求（400、返回非 JSON 等）
+                    print(f"[ChainReader] 批量请求不可用，改为逐个查询: {e}")
+                    batch = None
+                if not isinstance(batch, list) or len(batch) != len(chunk):
+                    # 节点不支持批量请求
+                    batch = [provider.make_request(method, params) for method, params in chunk]
+                responses.extend(batch)
+            return responses
+        return [provider.make_request(method, params) for method, params in rpc_requests]
+
+    def _decode(self, contract, fn_name: str, data: Optional[bytes]) -> Optional[Any]:
+        if not data:
+            return None
+        key = (contract.address, fn_name)
+        types = self._output_types.get(key)
+        if types is None:
+            outputs = contract.get_function_by_name(fn_name).abi['outputs']
+            types = self._output_types[key] = [output['type'] for output in outputs]
+        try:
+            values = self.chain.w3.codec.decode(types, data)
+        except Exception as e:
+            print(f"[ChainReader] 解码 {fn_name} 返回值失败: {e}")
+            return None
+        return values[0] if len(values) == 1 else tuple(values)
+
+    # ===== ZetaFrogNFT =====
+
+    def get_frogs(self, token_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """
+        批量读取青蛙链上数据
+
+        Returns:
+            tokenId -> 与后端字段一致的 dict（可直接用于 Frog(...)），不存在的为 None
+        """
+        token_ids = list(dict.fromkeys(int(t) for t in token_ids))
+        contract = self.chain.zetafrog()
+        results = self.read([(contract, 'getFrog', [token_id]) for token_id in token_ids])
+        return {token_id: None if result is None else _frog_from_chain(token_id, result)
+                for token_id, result in zip(token_ids, results)}
+
+    def get_balances(self, addresses: Iterable[str]) -> Dict[str, Optional[int]]:
+        """批量读取各地址持有的青蛙数量"""
+        addresses = list(dict.fromkeys(addresses))
+        contract = self.chain.zetafrog()
+        results = self.read([(contract, 'balanceOf', [self.chain.w3.to_checksum_address(a)])
+                             for a in addresses])
+        return dict(zip(addresses, results))
+
+    def get_total_supply(self) -> Optional[int]:
+        return self.read([(self.chain.zetafrog(), 'totalSupply', [])])[0]
+
+
+def _frog_from_chain(token_id: int, values: Tuple) -> Dict[str, Any]:
+    name, birthday, total_travels, status, xp, level = values
+    return {
+        'tokenId': token_id,
+        'name': name,
+        'birthday': datetime.fromtimestamp(birthday, tz=timezone.utc).isoformat() if birthday else None,
+        'totalTravels': total_travels,
+        'status': FROG_STATUS_NAMES[status] if status < len(FROG_STATUS_NAMES) else str(status),
+        'xp': xp,
+        'level': level,
+    }
@@ -12,10 +12,27 @@ CHAIN_CONFIG = {
     "chain_id": 7001,
     "name": "ZetaChain Athens",
     "rpc_url": "https://zetachain-athens-evm.blockpi.network/v1/rpc/public",
+    # 备用节点，services/chain_client 按延迟选择并在失败时切换
+    "rpc_urls": [
+        "https://zetachain-athens-evm.blockpi.network/v1/rpc/public",
+        "https://zetachain-testnet.public.blastapi.io",
+        "https://zeta-chain-testnet.drpc.org",
+    ],
     "symbol": "ZETA",
     "explorer": "https://athens.explorer.zetachain.com"
 }
 
+# Multicall3（各 EVM 链上地址相同）；本地测试链部署在别处时可在链配置中用 "multicall3" 覆盖
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# 支持的链：chain_id -> 配置
+CHAINS = {
+    CHAIN_CONFIG["chain_id"]: CHAIN_CONFIG,
+}
+
+# 青蛙状态（ZetaFrogNFT.FrogStatus 枚举顺序）
+FROG_STATUS_NAMES = ("Idle", "Traveling", "CrossChainLocked")
+
 # ZetaFrogNFT ABI (仅包含需要的函数)
 ZETAFROG_ABI = [
     # mintFrog - 铸造青蛙
@@ -83,3 +100,35 @@ ZETAFROG_ABI = [
         "type": "event"
     }
 ]
+
+# Multicall3 ABI (仅 aggregate3)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
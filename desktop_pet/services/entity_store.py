@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 实体存储（identity map）
+
+同一只青蛙 / 同一件纪念品在所有对话框里都是同一个对象：
+新数据到达时原地更新并发出通知，界面按需局部刷新，不必整体重新拉取。
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+
+# 各类实体的主键属性
+ENTITY_KEYS = {
+    'frog': 'api_id',
+    'friend': 'id',
+    'souvenir': 'id',
+    'badge': 'code',
+    'travel': 'id',
+}
+
+# 徽章的解锁状态因青蛙而异，主键需要带上所属集合
+SCOPED_KINDS = {'badge'}
+
+
+class EntityStore(QObject):
+    """
+    客户端实体存储（线程安全，通知总在 GUI 线程发出）
+
+    - merge: 合并一批数据，返回规范对象列表，并记录集合成员（如某钱包的青蛙）
+    - update: 部分字段更新（原始字段名，如 {'status': 'Traveling'}）
+    """
+
+    # (kind, entity) 某个实体的字段发生变化
+    entity_changed = pyqtSignal(str, object)
+    # (kind, scope) 某个集合的成员或顺序发生变化
+    collection_changed = pyqtSignal(str, object)
+
+    _notify = pyqtSignal(list)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.RLock()
+        self._entities: Dict[str, Dict[Hashable, Any]] = {kind: {} for kind in ENTITY_KEYS}
+        self._collections: Dict[Tuple[str, Hashable], Tuple[Hashable, ...]] = {}
+        # 工作线程里合并的数据，也要在 GUI 线程通知界面
+        self._notify.connect(self._dispatch, Qt.QueuedConnection)
+
+    def _key(self, kind: str, entity: Any, scope: Hashable = None) -> Hashable:
+        key = getattr(entity, ENTITY_KEYS[kind])
+        return (scope, key) if kind in SCOPED_KINDS else key
+
+    def _canonical(self, kind: str, entity: Any, scope: Hashable, events: list) -> Any:
+        key = self._key(kind, entity, scope)
+        existing = self._entities[kind].get(key)
+        if existing is None:
+            self._entities[kind][key] = entity
+            return entity
+        if existing.update_from(entity):
+            events.append(('entity', kind, existing))
+        return existing
+
+    def merge(self, kind: str, items: Iterable[Any], scope: Hashable = None) -> List[Any]:
+        """
+        合并一批实体
+
+        Args:
+            kind: 'frog' / 'friend' / 'souvenir' / 'badge' / 'travel'
+            items: 模型对象
+            scope: 集合标识（如钱包地址、青蛙 ID）；给出时记录集合成员
+
+        Returns:
+            规范对象列表（与 items 顺序一致）
+        """
+        events = []
+        with self._lock:
+            result = [self._canonical(kind, item, scope, events) for item in items]
+            if scope is not None:
+                keys = tuple(self._key(kind, item, scope) for item in result)
+                if self._collections.get((kind, scope)) != keys:
+                    self._collections[(kind, scope)] = keys
+                    events.append(('collection', kind, scope))
+        if events:
+            self._notify.emit(events)
+        return result
+
+    def merge_one(self, kind: str, item: Any, scope: Hashable = None) -> Any:
+        """合并单个实体（不改变集合成员）"""
+        if item is None:
+            return None
+        events = []
+        with self._lock:
+            result = self._canonical(kind, item, scope, events)
+        if events:
+            self._notify.emit(events)
+        return result
+
+    def update(self, kind: str, key: Hashable, fields: Dict[str, Any],
+               scope: Hashable = None) -> Optional[Any]:
+        """
+        部分更新：用原始字段覆盖后重新解析，派生字段随之更新
+
+        Returns:
+            更新后的实体；不存在时返回 None
+        """
+        if kind in SCOPED_KINDS:
+            key = (scope, key)
+        events = []
+        with self._lock:
+            existing = self._entities[kind].get(key)
+            if existing is None:
+                return None
+            if existing.update_from(type(existing)({**existing.raw, **fields})):
+                events.append(('entity', kind, existing))
+        if events:
+            self._notify.emit(events)
+        return existing
+
+    def get(self, kind: str, key: Hashable, scope: Hashable = None) -> Optional[Any]:
+        if kind in SCOPED_KINDS:
+            key = (scope, key)
+        with self._lock:
+            return self._entities[kind].get(key)
+
+    def find(self, kind: str, predicate: Callable[[Any], bool]) -> List[Any]:
+        """按条件查找实体"""
+        with self._lock:
+            return [e for e in self._entities[kind].values() if predicate(e)]
+
+    def collection(self, kind: str, scope: Hashable) -> List[Any]:
+        """集合当前成员（规范对象）"""
+        with self._lock:
+            entities = self._entities[kind]
+            return [entities[k] for k in self._collections.get((kind, scope), ()) if k in entities]
+
+    def remove(self, kind: str, key: Hashable, scope: Hashable = None):
+        """删除实体，并从所有集合中移除"""
+        if kind in SCOPED_KINDS:
+            key = (scope, key)
+        events = []
+        with self._lock:
+            if self._entities[kind].pop(key, None) is None:
+                return
+            for (c_kind, c_scope), keys in list(self._collections.items()):
+                if c_kind == kind and key in keys:
+                    self._collections[(c_kind, c_scope)] = tuple(k for k in keys if k != key)
+                    events.append(('collection', kind, c_scope))
+        if events:
+            self._notify.emit(events)
+
+    def _dispatch(self, events: list):
+        for event_type, kind, payload in events:
+            if event_type == 'entity':
+                self.entity_changed.emit(kind, payload)
+            else:
+                self.collection_changed.emit(kind, payload)
+
+
+# 全局实例
+entity_store = EntityStore()
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 图片加载服务
+
+所有界面共用：
+- 一个 QNetworkAccessManager + QNetworkDiskCache（重复打开不重复下载）
+- 内存 LRU：按 (url, 尺寸) 缓存解码并缩放好的 QPixmap
+- 解码和缩放交给 thumbnail_pipeline 的后台线程，常用尺寸的缩略图
+  保存在磁盘上，命中时不再下载原图
+- 并发限制：总数随性能配置变化，每个主机另有上限
+- 请求可取消：不再需要的图片（如滚出视野）不会继续下载
+- 预取请求（prefetch=True）排在普通请求之后，真正需要时可提升（promote）
+"""
+
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QUrl, QSize
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtNetwork import (
+    QNetworkAccessManager, QNetworkDiskCache, QNetworkRequest, QNetworkReply
+)
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    IMAGE_CACHE_DIR, IMAGE_DISK_CACHE_MB, IMAGE_MEMORY_CACHE_MB, IMAGE_HOST_CONNECTIONS,
+    THUMBNAIL_SIZES
+)
+from services.performance_profile import profile_manager
+from services.thumbnail_pipeline import thumbnail_pipeline
+
+
+class ImageLoader(QObject):
+    """
+    图片加载（只能在 GUI 线程使用）
+
+    load(url, callback, owner, size) 返回请求编号，完成后以 QPixmap 调用
+    callback（失败为 None）；owner 已销毁时不回调。同一 url 的多个请求
+    共用一次下载。cached(url, size) 可同步取内存中的图片。
+
+    每个 url 依次经过：thumb（读磁盘缩略图）→ queued → download → decode。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._manager: Optional[QNetworkAccessManager] = None
+
+        # 内存 LRU：(url, w, h) -> QPixmap
+        self._memory: 'OrderedDict[Tuple[str, int, int], QPixmap]' = OrderedDict()
+        self._memory_bytes = 0
+        self.memory_limit = IMAGE_MEMORY_CACHE_MB * 1024 * 1024
+
+        # url -> {ticket: (size, callback, owner)}
+        self._waiters: Dict[str, Dict[int, tuple]] = {}
+        self._ticket_urls: Dict[int, str] = {}
+        self._prefetch: Set[int] = set()            # 低优先级的请求编号
+        self._next_ticket = 0
+        self._stage: Dict[str, str] = {}           # url -> 当前阶段
+        self._queue = deque()                       # 等待开始的 url
+        self._replies: Dict[str, QNetworkReply] = {}
+        self._host_active: Dict[str, int] = {}
+
+        self.max_concurrent = profile_manager.get('image_downloads')
+        self.per_host = IMAGE_HOST_CONNECTIONS
+        profile_manager.profile_changed.connect(self._on_profile_changed)
+
+        self._stats = {'requests': 0, 'memory_hits': 0, 'thumbnail_hits': 0,
+                       'disk_hits': 0, 'network': 0, 'cancelled': 0}
+
+    def _get_manager(self) -> QNetworkAccessManager:
+        if self._manager is None:
+            self._manager = QNetworkAccessManager(self)
+            try:
+                os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+                cache = QNetworkDiskCache(self._manager)
+                cache.setCacheDirectory(IMAGE_CACHE_DIR)
+                cache.setMaximumCacheSize(IMAGE_DISK_CACHE_MB * 1024 * 1024)
+                self._manager.setCache(cache)
+            except OSError as e:
+                print(f"[Image] 磁盘缓存不可用: {e}")
+        return self._manager
+
+    # ===== 内存缓存 =====
+
+    @staticmethod
+    def _size_key(size: Optional[QSize]) -> Tuple[int, int]:
+        return (size.width(), size.height()) if size else (0, 0)
+
+    def cached(self, url: str, size: Optional[QSize] = None) -> Optional[QPixmap]:
+        key = (url,) + self._size_key(size)
+        pixmap = self._memory.get(key)
+        if pixmap is not None:
+            self._memory.move_to_end(key)
+        return pixmap
+
+    def _remember(self, key, pixmap: QPixmap):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.width() * old.height() * 4
+        self._memory[key] = pixmap
+        self._memory_bytes += pixmap.width() * pixmap.height() * 4
+        while self._memory_bytes > self.memory_limit and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.width() * evicted.height() * 4
+
+    # ===== 请求 =====
+
+    def load(self, url: str, callback: Callable, owner: Optional[QObject] = None,
+             size: Optional[QSize] = None, prefetch: bool = False) -> Optional[int]:
+        """
+        请求图片
+
+        Args:
+            prefetch: 预取（如视野外即将滚到的单元格），排在普通请求之后
+
+        Returns:
+            请求编号（用于 cancel）；内存命中时直接回调并返回 None
+        """
+        self._stats['requests'] += 1
+        pixmap = self.cached(url, size)
+        if pixmap is not None:
+            self._stats['memory_hits'] += 1
+            callback(pixmap)
+            return None
+
+        self._next_ticket += 1
+        ticket = self._next_ticket
+        self._ticket_urls[ticket] = url
+        waiters = self._waiters.setdefault(url, {})
+        waiters[ticket] = (size, callback, owner)
+        if prefetch:
+            self._prefetch.add(ticket)
+        if url not in self._stage:
+            self._begin(url, self._size_key(size))
+        elif not prefetch:
+            self._requeue(url)
+        return ticket
+
+    def promote(self, ticket: Optional[int]):
+        """把预取请求提升为普通优先级（单元格已滚入视野）"""
+        if ticket in self._prefetch:
+            self._prefetch.discard(ticket)
+            self._requeue(self._ticket_urls[ticket])
+
+    def cancel(self, ticket: Optional[int]):
+        """取消请求；某个 url 没有任何等待者时停止下载"""
+        url = self._ticket_urls.pop(ticket, None)
+        if url is None:
+            return
+        self._prefetch.discard(ticket)
+        waiters = self._waiters.get(url, {})
+        waiters.pop(ticket, None)
+        if waiters:
+            return
+        self._waiters.pop(url, None)
+        self._stats['cancelled'] += 1
+        stage = self._stage.get(url)
+        if stage == 'download':
+            self._replies[url].abort()
+        elif stage == 'queued':
+            self._stage.pop(url)
+            self._queue.remove(url)
+        # thumb / decode 阶段在后台线程，完成后发现没有等待者即结束
+
+    def cancel_owner(self, owner: QObject):
+        """取消某个对象发起的全部请求"""
+        for ticket, url in list(self._ticket_urls.items()):
+            entry = self._waiters.get(url, {}).get(ticket)
+            if entry is not None and entry[2] is owner:
+                self.cancel(ticket)
+
+    def _begin(self, url: str, key: Tuple[int, int]):
+        w, h = key
+        if w == h and w in THUMBNAIL_SIZES:
+            self._stage[url] = 'thumb'
+            thumbnail_pipeline.read(url, w, lambda image: self._on_thumbnail_read(url, key, image))
+        else:
+            self._enqueue(url)
+
+    def _is_prefetch(self, url: str) -> bool:
+        return all(ticket in self._prefetch for ticket in self._waiters.get(url, ()))
+
+    def _enqueue(self, url: str):
+        """普通请求排在所有预取请求之前，预取请求排在队尾"""
+        self._stage[url] = 'queued'
+        if self._is_prefetch(url):
+            self._queue.append(url)
+        else:
+            index = next((i for i, queued in enumerate(self._queue) if self._is_prefetch(queued)),
+                         len(self._queue))
+            self._queue.insert(index, url)
+        self._pump()
+
+    def _requeue(self, url: str):
+        """优先级变化后调整在队列中的位置"""
+        if self._stage.get(url) == 'queued':
+            self._queue.remove(url)
+            self._enqueue(url)
+
+    def _pump(self):
+        """按总并发和每主机并发开始排队中的下载"""
+        if not self._queue:
+            return
+        skipped = deque()
+        while self._queue and len(self._replies) < self.max_concurrent:
+            url = self._queue.popleft()
+            host = QUrl(url).host()
+            if self._host_active.get(host, 0) >= self.per_host:
+                skipped.append(url)
+                continue
+            self._start(url, host)
+        skipped.extend(self._queue)
+        self._queue = skipped
+
+    def _start(self, url: str, host: str):
+        request = QNetworkRequest(QUrl(url))
+        request.setAttribute(QNetworkRequest.CacheLoadControlAttribute, QNetworkRequest.PreferCache)
+        request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        reply = self._get_manager().get(request)
+        self._stage[url] = 'download'
+        self._replies[url] = reply
+        self._host_active[host] = self._host_active.get(host, 0) + 1
+        reply.finished.connect(lambda: self._on_finished(url, host, reply))
+
+    # ===== 完成 =====
+
+    def _on_thumbnail_read(self, url: str, key: Tuple[int, int], image):
+        if url not in self._waiters:
+            self._stage.pop(url, None)
+            return
+        if image is not None:
+            self._stats['thumbnail_hits'] += 1
+            if not self._deliver(url, {key: image}):
+                self._stage.pop(url, None)
+                return
+        # 没有缩略图，或还有其他尺寸在等待
+        self._enqueue(url)
+
+    def _on_finished(self, url: str, host: str, reply: QNetworkReply):
+        self._replies.pop(url, None)
+        self._host_active[host] = max(0, self._host_active.get(host, 0) - 1)
+
+        data = None
+        if reply.error() == QNetworkReply.NoError:
+            data = bytes(reply.readAll())
+            if reply.attribute(QNetworkRequest.SourceIsFromCacheAttribute):
+                self._stats['disk_hits'] += 1
+            else:
+                self._stats['network'] += 1
+        elif reply.error() != QNetworkReply.OperationCanceledError:
+            print(f"[Image] 下载失败 {url}: {reply.errorString()}")
+        reply.deleteLater()
+
+        if data is None or url not in self._waiters:
+            self._stage.pop(url, None)
+            self._fail(url)
+        else:
+            self._stage[url] = 'decode'
+            sizes = {self._size_key(size) for size, _, _ in self._waiters[url].values()}
+            thumbnail_pipeline.decode(url, data, sizes,
+                                      lambda images: self._on_decoded(url, sizes, images))
+        self._pump()
+
+    def _on_decoded(self, url: str, sizes, images):
+        if images is None:
+            self._stage.pop(url, None)
+            self._fail(url)
+            return
+        remaining = self._deliver(url, images, failed=sizes)
+        self._stage.pop(url, None)
+        if remaining:
+            # 解码期间又来了新尺寸的请求（原图已在 HTTP 磁盘缓存中）
+            size = next(iter(self._waiters[url].values()))[0]
+            self._begin(url, self._size_key(size))
+
+    def _fail(self, url: str):
+        self._deliver(url, {}, failed={self._size_key(w[0]) for w in self._waiters.get(url, {}).values()})
+
+    def _deliver(self, url: str, images, failed=()) -> int:
+        """
+        把解码结果（{尺寸: QImage}）交给对应尺寸的等待者
+
+        failed 中的尺寸没有结果时以 None 回调。
+        Returns:
+            仍在等待其他尺寸的请求数
+        """
+        waiters = self._waiters.get(url, {})
+        pixmaps = {}
+        for ticket, (size, callback, owner) in list(waiters.items()):
+            key = self._size_key(size)
+            if key in images:
+                pixmap = pixmaps.get(key)
+                if pixmap is None:
+                    pixmap = pixmaps[key] = QPixmap.fromImage(images[key])
+                    self._remember((url,) + key, pixmap)
+            elif key in failed:
+                pixmap = None
+            else:
+                continue
+            waiters.pop(ticket, None)
+            self._ticket_urls.pop(ticket, None)
+            self._prefetch.discard(ticket)
+            if owner is not None and sip.isdeleted(owner):
+                continue
+            callback(pixmap)
+        if not waiters:
+            self._waiters.pop(url, None)
+        return len(waiters)
+
+    def _on_profile_changed(self, name, profile):
+        self.max_concurrent = profile['image_downloads']
+        self._pump()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            'memory_items': len(self._memory),
+            'memory_kb': self._memory_bytes // 1024,
+            'in_flight': len(self._replies),
+            'decoding': sum(1 for stage in self._stage.values() if stage in ('thumb', 'decode')),
+            'queued': len(self._queue),
+            'prefetch': len(self._prefetch),
+        }
+
+
+# 全局实例
+image_loader = ImageLoader()
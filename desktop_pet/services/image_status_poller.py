@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 纪念品图片生成状态轮询
+
+纪念品加载后（任何界面通过 entity_store 合并的青蛙纪念品集合），
+收集图片仍在生成中的任务，按青蛙批量查询 /nft-image/list/{tokenId}：
+刚开始每 IMAGE_POLL_MIN 查一次，没有变化时按 IMAGE_POLL_BACKOFF 逐步放慢到
+IMAGE_POLL_MAX；有图片完成或出现新任务时恢复最快。完成的图片写回
+entity_store，画廊等界面通过 entity_changed 只刷新对应的卡片。
+"""
+
+import time
+from typing import Dict, Hashable, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import IMAGE_POLL_MIN, IMAGE_POLL_MAX, IMAGE_POLL_BACKOFF, IMAGE_POLL_GIVE_UP
+from services.api_client import api_client
+from services.entity_store import entity_store
+
+
+# 仍在生成中的状态（COMPLETED / FAILED 为终态）
+PENDING_IMAGE_STATUSES = {'PENDING', 'GENERATING', 'PROCESSING', 'UPLOADING'}
+
+# 从图片记录写回纪念品的字段
+IMAGE_FIELDS = ('status', 'imageUrl', 'gatewayUrl', 'ipfsHash')
+
+# 单次查询的记录数上限（接口按创建时间倒序分页）
+MAX_BATCH = 100
+
+
+class ImageStatusPoller(QObject):
+    """
+    图片状态批量轮询
+
+    每只青蛙一次请求覆盖它所有待生成的图片；没有待生成的图片时定时器停止。
+    """
+
+    # 某件纪念品的图片生成完成（更新后的纪念品）
+    image_completed = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        # 青蛙 tokenId -> {图片记录 id: (纪念品 id, 开始跟踪的时间)}
+        self._pending: Dict[Hashable, Dict[str, Tuple[Hashable, float]]] = {}
+        self._interval = IMAGE_POLL_MIN
+        self._outstanding = 0
+        self._changed = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._poll)
+
+    def start(self):
+        """开始监听纪念品加载"""
+        entity_store.collection_changed.connect(self._on_collection_changed)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(images) for images in self._pending.values())
+
+    # ===== 跟踪 =====
+
+    def track(self, frog_token_id, souvenirs):
+        """收集这些纪念品中仍在生成的图片"""
+        pending = self._pending.setdefault(frog_token_id, {})
+        now = time.monotonic()
+        added = False
+        for souvenir in souvenirs:
+            for image in souvenir.images:
+                image_id = image.get('id')
+                if image_id and image.get('status') in PENDING_IMAGE_STATUSES and image_id not in pending:
+                    pending[image_id] = (souvenir.id, now)
+                    added = True
+        if not pending:
+            del self._pending[frog_token_id]
+        if added:
+            # 新任务：恢复最快的轮询
+            self._interval = IMAGE_POLL_MIN
+            if self._outstanding == 0:
+                self._timer.start(self._interval)
+
+    def _on_collection_changed(self, kind, scope):
+        # 'owner:<地址>' 形式的集合没有对应的青蛙 tokenId
+        if kind != 'souvenir' or scope is None or str(scope).startswith('owner:'):
+            return
+        self.track(scope, entity_store.collection('souvenir', scope))
+
+    # ===== 轮询 =====
+
+    def _poll(self):
+        if not self._pending:
+            return
+        self._changed = False
+        for frog_token_id, images in list(self._pending.items()):
+            self._outstanding += 1
+            limit = min(MAX_BATCH, max(20, len(images) * 2))
+            api_client.call_async(
+                'get_souvenir_images', frog_token_id, limit,
+                on_success=lambda records, t=frog_token_id: self._on_records(t, records),
+                on_error=lambda e: self._on_records(None, None),
+                owner=self,
+            )
+
+    def _on_records(self, frog_token_id, records):
+        self._outstanding -= 1
+        if records is not None:
+            self._apply_records(frog_token_id, records)
+        if self._outstanding > 0:
+            return
+
+        # 本轮全部返回后安排下一轮
+        if self._changed:
+            self._interval = IMAGE_POLL_MIN
+        else:
+            self._interval = min(IMAGE_POLL_MAX, int(self._interval * IMAGE_POLL_BACKOFF))
+        if self._pending:
+            self._timer.start(self._interval)
+
+    def _apply_records(self, frog_token_id, records):
+        pending = self._pending.get(frog_token_id)
+        if not pending:
+            return
+        by_id = {record.get('id'): record for record in records}
+        now = time.monotonic()
+        for image_id, (souvenir_id, since) in list(pending.items()):
+            record = by_id.get(image_id)
+            if record is None or record.get('status') in PENDING_IMAGE_STATUSES:
+                if now - since > IMAGE_POLL_GIVE_UP:
+                    del pending[image_id]
+                continue
+            del pending[image_id]
+            self._changed = True
+            self._update_souvenir(souvenir_id, record)
+        if not pending:
+            del self._pending[frog_token_id]
+
+    def _update_souvenir(self, souvenir_id, record):
+        """把图片记录写回纪念品，界面经 entity_changed 刷新"""
+        souvenir = entity_store.get('souvenir', souvenir_id)
+        if souvenir is None:
+            return
+        fields = {k: record[k] for k in IMAGE_FIELDS if k in record}
+        images = [{**image, **fields} if image.get('id') == record.get('id') else image
+                  for image in souvenir.images]
+        api_client.invalidate_cache('/souvenirs')
+        updated = entity_store.update('souvenir', souvenir_id, {'images': images})
+        if updated is not None and record.get('status') == 'COMPLETED':
+            print(f"[ImagePoller] 纪念品 {souvenir_id} 图片已生成")
+            self.image_completed.emit(updated)
+
+
+# 全局实例
+image_status_poller = ImageStatusPoller()
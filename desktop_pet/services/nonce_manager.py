@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 本地 nonce 管理
+
+连续发起多笔交易（连续铸造、连续出发旅行）时，每次都从链上取 nonce 会
+拿到同一个值而互相冲突，只能等上一笔确认后再发。这里按 (链, 账户) 在本地
+记录已分配、已发出的 nonce，多笔交易可以同时在途：
+
+- reserve: 以链上 pending nonce 为下限分配下一个 nonce
+- release: 签名或发送失败时归还，下次优先复用，避免留下空洞
+- mark_sent / mark_done: 交易已广播 / 已上链
+- resync: 出现 nonce 冲突或交易被丢弃时丢弃本地状态，以链上为准
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CHAIN_NONCE_STALE
+
+
+# 节点返回这些错误时说明本地 nonce 与链上不一致
+NONCE_ERRORS = ('nonce too low', 'nonce too high', 'replacement transaction underpriced',
+                'invalid nonce')
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+
+class _AccountNonces:
+    """单个账户在单条链上的 nonce 状态"""
+
+    def __init__(self):
+        self.next: Optional[int] = None  # 下一个未分配的 nonce
+        self.free: Set[int] = set()  # 归还的 nonce
+        self.in_flight: Dict[int, float] = {}  # 已分配 / 已发出的 nonce -> 最后一次更新时间
+
+
+class NonceManager:
+    """按 (chain_id, 地址) 管理 nonce（线程安全）"""
+
+    def __init__(self):
+        self._accounts: Dict[Tuple[int, str], _AccountNonces] = {}
+        self._lock = threading.Lock()
+
+    def _account(self, chain_id: int, address: str) -> _AccountNonces:
+        key = (chain_id, address.lower())
+        account = self._accounts.get(key)
+        if account is None:
+            account = self._accounts[key] = _AccountNonces()
+        return account
+
+    def reserve(self, chain_id: int, address: str, chain_nonce: int) -> int:
+        """
+        分配一个 nonce
+
+        Args:
+            chain_nonce: 链上的 pending nonce（eth_getTransactionCount(..., 'pending')）
+        """
+        now = time.monotonic()
+        with self._lock:
+            account = self._account(chain_id, address)
+
+            # 低于链上 nonce 的都已上链或被替换
+            account.free = {n for n in account.free if n >= chain_nonce}
+            for n in [n for n in account.in_flight if n < chain_nonce]:
+                del account.in_flight[n]
+
+            # 本地超前于链上、且在途交易都很久没有进展：视为被节点丢弃，以链上为准
+            if account.next is not None and account.next > chain_nonce and account.in_flight \
+                    and all(now - t > CHAIN_NONCE_STALE for t in account.in_flight.values()):
+                print(f"[Nonce] {address} 在途交易长时间未上链，重新同步到 {chain_nonce}")
+                account.next = None
+                account.free.clear()
+                account.in_flight.clear()
+
+            if account.free:
+                nonce = min(account.free)
+                account.free.discard(nonce)
+            else:
+                nonce = chain_nonce if account.next is None else max(account.next, chain_nonce)
+                account.next = nonce + 1
+            account.in_flight[nonce] = now
+            return nonce
+
+    def release(self, chain_id: int, address: str, nonce: int):
+        """交易没有发出去，归还 nonce"""
+        with self._lock:
+            account = self._account(chain_id, address)
+            account.in_flight.pop(nonce, None)
+            account.free.add(nonce)
+            # 归还的是最末尾的 nonce 时直接回退
+            while account.next is not None and account.next - 1 in account.free:
+                account.next -= 1
+                account.free.discard(account.next)
+
+    def mark_sent(self, chain_id: int, address: str, nonce: int):
+        with self._lock:
+            account = self._account(chain_id, address)
+            account.in_flight[nonce] = time.monotonic()
+
+    def mark_done(self, chain_id: int, address: str, nonce: int):
+        """交易已上链（无论成功与否，nonce 都已被消耗）"""
+        with self._lock:
+            self._account(chain_id, address).in_flight.pop(nonce, None)
+
+    def resync(self, chain_id: int, address: str):
+        """丢弃本地状态，下次分配以链上 nonce 为准"""
+        with self._lock:
+            self._accounts.pop((chain_id, address.lower()), None)
+
+    def pending_count(self, chain_id: int, address: str) -> int:
+        with self._lock:
+            account = self._accounts.get((chain_id, address.lower()))
+            return len(account.in_flight) if account else 0
+
+
+# 全局实例
+nonce_manager = NonceManager()
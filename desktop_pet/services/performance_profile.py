@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 性能配置（全效 / 均衡 / 省电）
+
+自动模式下根据电源状态切换：接电源 full，用电池 balanced，电量低 eco。
+切换时发出 profile_changed，动画帧率、粒子数量、轮询间隔、
+图片并发数等由各模块监听后即时生效，无需重启。
+"""
+
+import ctypes
+import glob
+import os
+import sys
+from typing import Any, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    PERFORMANCE_PROFILE, PERFORMANCE_PROFILES, BATTERY_LOW_PERCENT, POWER_POLL_INTERVAL
+)
+from services.snapshot_store import snapshot_store
+
+
+AUTO = 'auto'
+
+
+class _SYSTEM_POWER_STATUS(ctypes.Structure):
+    _fields_ = [
+        ('ACLineStatus', ctypes.c_ubyte),
+        ('BatteryFlag', ctypes.c_ubyte),
+        ('BatteryLifePercent', ctypes.c_ubyte),
+        ('SystemStatusFlag', ctypes.c_ubyte),
+        ('BatteryLifeTime', ctypes.c_ulong),
+        ('BatteryFullLifeTime', ctypes.c_ulong),
+    ]
+
+
+def read_power_status() -> Tuple[bool, Optional[int]]:
+    """
+    读取电源状态
+
+    Returns:
+        (是否接电源, 电量百分比)；无电池或无法判断时视为接电源
+    """
+    if sys.platform == 'win32':
+        status = _SYSTEM_POWER_STATUS()
+        try:
+            if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+                return True, None
+        except (AttributeError, OSError):
+            return True, None
+        percent = status.BatteryLifePercent if status.BatteryLifePercent <= 100 else None
+        # ACLineStatus: 0 电池, 1 电源, 255 未知；BatteryFlag 128 表示没有电池
+        if status.BatteryFlag == 128 or status.ACLineStatus != 0:
+            return True, percent
+        return False, percent
+
+    if sys.platform.startswith('linux'):
+        on_ac, discharging, percent = False, False, None
+        for supply in glob.glob('/sys/class/power_supply/*'):
+            kind = _read_sysfs(supply, 'type')
+            if kind in ('Mains', 'USB') and _read_sysfs(supply, 'online') == '1':
+                on_ac = True
+            elif kind == 'Battery' and _read_sysfs(supply, 'scope') != 'Device':
+                if _read_sysfs(supply, 'status') == 'Discharging':
+                    discharging = True
+                capacity = _read_sysfs(supply, 'capacity')
+                if capacity and capacity.isdigit():
+                    percent = int(capacity) if percent is None else min(percent, int(capacity))
+        return on_ac or not discharging, percent
+
+    return True, None
+
+
+def _read_sysfs(path: str, name: str) -> str:
+    try:
+        with open(os.path.join(path, name), 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+class ProfileManager(QObject):
+    """
+    性能配置管理
+
+    mode 为用户选择（'auto' 或配置名），profile 为当前生效的配置名。
+    """
+
+    # (生效的配置名, 配置内容)
+    profile_changed = pyqtSignal(str, dict)
+
+    def __init__(self):
+        super().__init__()
+        self._mode = PERFORMANCE_PROFILE
+        self._profile = 'full' if self._mode == AUTO else self._mode
+        self._power: Tuple[bool, Optional[int]] = (True, None)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(POWER_POLL_INTERVAL)
+        self._timer.timeout.connect(self._poll_power)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def profile(self) -> str:
+        return self._profile
+
+    @property
+    def on_battery(self) -> bool:
+        return not self._power[0]
+
+    def get(self, key: str) -> Any:
+        """当前配置中的某项，如 get('animation_fps')"""
+        return PERFORMANCE_PROFILES[self._profile][key]
+
+    def start(self):
+        """恢复上次选择的模式并开始检测电源"""
+        saved = snapshot_store.load('settings', 'performance_profile')
+        if saved == AUTO or saved in PERFORMANCE_PROFILES:
+            self._mode = saved
+        self._poll_power()
+        self._timer.start()
+
+    def set_mode(self, mode: str):
+        """切换模式（托盘菜单），立即生效并记住"""
+        if mode != AUTO and mode not in PERFORMANCE_PROFILES:
+            return
+        self._mode = mode
+        snapshot_store.save('settings', 'performance_profile', mode)
+        self._apply()
+
+    def _poll_power(self):
+        self._power = read_power_status()
+        self._apply()
+
+    def _resolve(self) -> str:
+        if self._mode != AUTO:
+            return self._mode
+        on_ac, percent = self._power
+        if on_ac:
+            return 'full'
+        if percent is not None and percent <= BATTERY_LOW_PERCENT:
+            return 'eco'
+        return 'balanced'
+
+    def _apply(self):
+        profile = self._resolve()
+        if profile == self._profile:
+            return
+        self._profile = profile
+        print(f"[Profile] 切换到 {PERFORMANCE_PROFILES[profile]['name']} ({profile})")
+        self.profile_changed.emit(profile, dict(PERFORMANCE_PROFILES[profile]))
+
+
+# 全局实例
+profile_manager = ProfileManager()
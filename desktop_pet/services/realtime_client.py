@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 实时推送客户端（Socket.IO）
+
+订阅当前钱包和青蛙的房间，把后端推送的旅行 / 状态 / 好友事件
+写入 entity_store 并转发给界面；断线后按指数退避自动重连。
+python-socketio 未安装时不启用，界面回退到定时轮询。
+"""
+
+import random
+import threading
+from typing import Any, Dict, Optional, Set
+import sys
+import os
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import REALTIME_URL, REALTIME_RECONNECT_MIN, REALTIME_RECONNECT_MAX
+from services.api_client import api_client
+from services.entity_store import entity_store
+
+try:
+    import socketio
+except ImportError:  # 可选依赖
+    socketio = None
+
+
+# 关心的服务端事件
+TRAVEL_EVENTS = (
+    'travel:started', 'travel:progress', 'travel:completed',
+    'travel:update', 'travel:stageUpdate', 'travel:error',
+)
+FROG_EVENTS = ('frog:statusChanged',)
+FRIEND_EVENTS = (
+    'friend:onlineStatusChanged', 'friend:requestReceived',
+    'friend:requestStatusChanged', 'friend:removed',
+)
+
+
+class RealtimeClient(QObject):
+    """
+    Socket.IO 客户端
+
+    事件在 socketio 的后台线程中到达，信号跨线程 emit 后在 GUI 线程处理。
+    """
+
+    connection_changed = pyqtSignal(bool)
+    # (事件名, 数据)，如 ('travel:progress', {'frogId': 3, 'percentage': 40, ...})
+    event_received = pyqtSignal(str, object)
+
+    def __init__(self, url: str = REALTIME_URL):
+        super().__init__()
+        self.url = url
+        self._lock = threading.Lock()
+        self._emit_lock = threading.Lock()  # socketio.Client.emit 非线程安全
+        self._frogs: Set[int] = set()
+        self._wallet: Optional[str] = None
+        self._sio = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._connected = False
+
+    @property
+    def available(self) -> bool:
+        return socketio is not None
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    # ===== 生命周期 =====
+
+    def start(self):
+        """启动后台连接线程（可重复调用）"""
+        if not self.available:
+            print("[Realtime] python-socketio 未安装，使用轮询")
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='realtime', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """断开并停止重连（退出程序时调用）"""
+        self._stop.set()
+        sio = self._sio
+        if sio is not None:
+            try:
+                sio.disconnect()
+            except Exception:
+                pass
+
+    def _run(self):
+        """连接 → 等待断开 → 退避重连"""
+        delay = REALTIME_RECONNECT_MIN
+        while not self._stop.is_set():
+            sio = socketio.Client(reconnection=False)
+            self._bind(sio)
+            self._sio = sio
+            try:
+                sio.connect(self.url, auth=self._auth(), transports=['websocket', 'polling'],
+                            wait_timeout=10)
+                delay = REALTIME_RECONNECT_MIN
+                sio.wait()
+            except Exception as e:
+                print(f"[Realtime] 连接失败: {e}")
+            finally:
+                self._set_connected(False)
+
+            if self._stop.is_set():
+                break
+            # 指数退避 + 抖动，避免后端重启时所有客户端同时重连
+            wait = delay * (0.5 + random.random())
+            print(f"[Realtime] {wait:.1f}s 后重连")
+            self._stop.wait(wait)
+            delay = min(delay * 2, REALTIME_RECONNECT_MAX)
+
+    def _auth(self) -> Dict[str, Any]:
+        # 带上钱包地址，服务端据此判断主人在线
+        return {'walletAddress': self._wallet} if self._wallet else {}
+
+    def _bind(self, sio):
+        sio.on('connect', self._on_connect)
+        sio.on('disconnect', self._on_disconnect)
+        for event in TRAVEL_EVENTS + FROG_EVENTS + FRIEND_EVENTS:
+            sio.on(event, lambda data=None, event=event: self._on_event(event, data))
+
+    def _set_connected(self, connected: bool):
+        if self._connected != connected:
+            self._connected = connected
+            self.connection_changed.emit(connected)
+
+    def _on_connect(self):
+        print(f"[Realtime] 已连接 {self.url}")
+        # 重连后重新加入房间
+        with self._lock:
+            wallet, frogs = self._wallet, set(self._frogs)
+        if wallet:
+            self._emit('subscribe:wallet', wallet)
+        for frog_id in frogs:
+            self._emit('subscribe:frog', frog_id)
+        self._set_connected(True)
+        # 断线期间可能错过推送，让缓存过期以便下次读取时对账
+        api_client.invalidate_cache('/frogs', '/travels', '/friends')
+
+    def _on_disconnect(self, *args):
+        print("[Realtime] 连接断开")
+        self._set_connected(False)
+
+    def _emit(self, event: str, data: Any):
+        # connect 回调执行时 sio.connected 还未置位，以命名空间是否已连接为准
+        sio = self._sio
+        if sio is not None and sio.namespaces:
+            try:
+                with self._emit_lock:
+                    sio.emit(event, data)
+            except Exception as e:
+                print(f"[Realtime] 发送 {event} 失败: {e}")
+
+    # ===== 订阅 =====
+
+    def set_wallet(self, address: Optional[str]):
+        """切换订阅的钱包"""
+        address = address.lower() if address else None
+        with self._lock:
+            old, self._wallet = self._wallet, address
+        if old == address:
+            return
+        # 钱包地址在握手时传给服务端，切换后重连一次，_on_connect 会重新订阅
+        sio = self._sio
+        if sio is not None and sio.connected:
+            sio.disconnect()
+
+    def set_frogs(self, token_ids):
+        """设置订阅的青蛙（tokenId），自动增减房间"""
+        new = {int(t) for t in token_ids if t is not None}
+        with self._lock:
+            old, self._frogs = self._frogs, new
+        for frog_id in old - new:
+            self._emit('unsubscribe:frog', frog_id)
+        for frog_id in new - old:
+            self._emit('subscribe:frog', frog_id)
+
+    # ===== 事件处理 =====
+
+    def _on_event(self, event: str, data: Any):
+        if not isinstance(data, dict):
+            data = {'data': data}
+        try:
+            self._apply(event, data)
+        except Exception as e:
+            print(f"[Realtime] 处理 {event} 失败: {e}")
+        self.event_received.emit(event, data)
+
+    def _apply(self, event: str, data: Dict[str, Any]):
+        """把推送写进缓存 / 实体存储，已打开的界面通过 entity_store 刷新"""
+        frog_id = data.get('frogId', data.get('tokenId'))
+
+        if event == 'frog:statusChanged' and frog_id is not None:
+            entity_store.update('frog', frog_id, {'status': data.get('status')})
+        elif event == 'travel:started' and frog_id is not None:
+            api_client.invalidate_cache('/travels')
+            entity_store.update('frog', frog_id, {'status': 'Traveling'})
+        elif event == 'travel:completed':
+            api_client.invalidate_cache('/frogs', '/travels', '/souvenirs', '/badges')
+            if frog_id is not None:
+                entity_store.update('frog', frog_id, {'status': 'Idle'})
+        elif event == 'friend:onlineStatusChanged' and frog_id is not None:
+            for friend in entity_store.find('friend', lambda f: frog_id in (f.token_id, f.id)):
+                entity_store.update('friend', friend.id, {'isOnline': bool(data.get('isOnline'))})
+        elif event in ('friend:requestReceived', 'friend:requestStatusChanged'):
+            api_client.invalidate_cache('/friends')
+        elif event == 'friend:removed':
+            api_client.invalidate_cache('/friends/list')
+
+
+# 全局实例
+realtime_client = RealtimeClient()
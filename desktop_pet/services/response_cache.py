@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - API 响应缓存
+
+按接口前缀配置 TTL；过期后若有 ETag / Last-Modified，
+则带条件请求头重新验证，服务端返回 304 时直接复用缓存。
+"""
+
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple, Iterable
+
+
+CacheKey = Tuple[str, Tuple]
+
+
+class CacheEntry:
+    """单条缓存记录"""
+
+    __slots__ = ('endpoint', 'data', 'etag', 'last_modified', 'expires_at')
+
+    def __init__(self, endpoint: str, data: Dict[str, Any], etag: Optional[str],
+                 last_modified: Optional[str], expires_at: float):
+        self.endpoint = endpoint
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """条件请求头"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    GET 响应缓存（线程安全）
+
+    ttl_rules: {接口前缀: 秒}，按最长前缀匹配；未匹配时使用 default_ttl。
+    TTL 为 0 的接口不会直接命中，但仍保存校验信息用于 304 重新验证。
+    """
+
+    def __init__(self, ttl_rules: Optional[Dict[str, float]] = None, default_ttl: float = 0):
+        self._rules = sorted((ttl_rules or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._default_ttl = default_ttl
+        self._entries: Dict[CacheKey, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> CacheKey:
+        if not params:
+            return endpoint, ()
+        return endpoint, tuple(sorted((str(k), str(v)) for k, v in params.items()))
+
+    def ttl_for(self, endpoint: str) -> float:
+        path = endpoint.split('?', 1)[0]
+        for prefix, ttl in self._rules:
+            if path.startswith(prefix):
+                return ttl
+        return self._default_ttl
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: CacheKey, data: Dict[str, Any],
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        endpoint = key[0]
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        entry = CacheEntry(endpoint, data, etag, last_modified, time.monotonic() + ttl)
+        with self._lock:
+            self._entries[key] = entry
+
+    def touch(self, key: CacheKey) -> Optional[CacheEntry]:
+        """304 之后延长有效期"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl_for(entry.endpoint)
+            return entry
+
+    def invalidate(self, prefixes: Iterable[str]):
+        """
+        使指定前缀下的缓存过期
+
+        只标记过期、保留 ETag，下次请求仍可走 304 重新验证。
+        """
+        prefixes = tuple(prefixes)
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.endpoint.startswith(prefixes):
+                    entry.expires_at = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 相同请求合并（single-flight）
+
+同一个 key 的调用正在进行时，后来者不再发起新请求，
+而是等待并共享第一个调用的结果（包括异常）。
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """并发相同调用合并器（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.executed = 0   # 实际执行次数
+        self.coalesced = 0  # 被合并（节省）的次数
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        执行 fn；若相同 key 已在执行中，则等待其结果
+
+        Returns:
+            fn 的返回值（并发等待者拿到的是同一个对象）
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
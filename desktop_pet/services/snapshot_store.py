@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 本地快照存储
+
+把最近一次成功拿到的青蛙、纪念品、徽章、好友、旅行数据存进 SQLite，
+启动时先用快照渲染，后端不可用时也能继续使用。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import SNAPSHOT_DB_PATH
+
+
+class SnapshotStore:
+    """
+    快照存储（线程安全）
+
+    以 (kind, key) 为主键保存 JSON，例如 ('frogs', '0xabc...')、('souvenirs', '3')。
+    内容未变化时不写盘。
+    """
+
+    def __init__(self, path: str = SNAPSHOT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._digests: Dict[Tuple[str, str], str] = {}
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """延迟打开数据库；打不开时降级为不持久化"""
+        if self._conn is None:
+            try:
+                if self.path != ':memory:':
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS snapshots (
+                        kind TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        digest TEXT NOT NULL,
+                        updated_at REAL NOT NULL,
+                        PRIMARY KEY (kind, key)
+                    )
+                ''')
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                print(f"[Snapshot] 打开数据库失败: {e}")
+                self.path = None
+                return None
+        return self._conn
+
+    def save(self, kind: str, key: Any, data: Any) -> bool:
+        """
+        保存快照
+
+        Returns:
+            是否实际写入（内容相同则跳过）
+        """
+        key = str(key)
+        payload = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+        digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+        with self._lock:
+            if self._digests.get((kind, key)) == digest or self.path is None:
+                return False
+            conn = self._connect()
+            if conn is None:
+                return False
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO snapshots (kind, key, payload, digest, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (kind, key, payload, digest, time.time())
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Snapshot] 写入失败: {e}")
+                return False
+            self._digests[(kind, key)] = digest
+            return True
+
+    def load(self, kind: str, key: Any, default: Any = None) -> Any:
+        """读取快照，不存在时返回 default"""
+        entry = self.load_with_time(kind, key)
+        return default if entry is None else entry[0]
+
+    def load_with_time(self, kind: str, key: Any) -> Optional[Tuple[Any, float]]:
+        """读取快照及其保存时间（time.time()）"""
+        key = str(key)
+        with self._lock:
+            if self.path is None:
+                return None
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    'SELECT payload, digest, updated_at FROM snapshots WHERE kind = ? AND key = ?',
+                    (kind, key)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[Snapshot] 读取失败: {e}")
+                return None
+            if row is None:
+                return None
+            self._digests[(kind, key)] = row[1]
+        try:
+            return json.loads(row[0]), row[2]
+        except ValueError:
+            return None
+
+    def delete(self, kind: str, key: Any):
+        key = str(key)
+        with self._lock:
+            self._digests.pop((kind, key), None)
+            conn = self._connect() if self.path is not None else None
+            if conn is None:
+                return
+            try:
+                conn.execute('DELETE FROM snapshots WHERE kind = ? AND key = ?', (kind, key))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Snapshot] 删除失败: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# 全局实例
+snapshot_store = SnapshotStore()
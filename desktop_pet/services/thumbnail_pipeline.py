@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 缩略图流水线
+
+图片解码和缩放在后台线程池中完成（Pillow，JPEG 用 draft 模式在解码时
+按 1/2~1/8 降采样），THUMBNAIL_SIZES 中的尺寸保存到磁盘，下次直接读取
+小图。结果以 QImage 通过 Qt 信号回到 GUI 线程，只需转成 QPixmap 即可绘制。
+"""
+
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+from PyQt5.QtCore import QObject, QBuffer, QByteArray, QIODevice, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import THUMBNAIL_DIR, THUMBNAIL_SIZES, THUMBNAIL_WORKERS
+
+
+# (宽, 高)；(0, 0) 表示原图
+SizeKey = Tuple[int, int]
+
+
+def _to_qimage(im: Image.Image) -> QImage:
+    """Pillow 图片转 QImage（拷贝一份，不依赖 Pillow 的缓冲区）"""
+    im = im.convert('RGBA')
+    data = im.tobytes('raw', 'RGBA')
+    return QImage(data, im.width, im.height, im.width * 4, QImage.Format_RGBA8888).copy()
+
+
+def _decode_with_pillow(data: bytes, sizes: Iterable[SizeKey]) -> Dict[SizeKey, QImage]:
+    sizes = list(sizes)
+    with Image.open(io.BytesIO(data)) as im:
+        if (0, 0) not in sizes:
+            # 只对 JPEG 生效：解码时直接按不小于目标的比例降采样
+            largest = max(max(w, h) for w, h in sizes)
+            im.draft('RGB' if im.mode not in ('L', 'RGB') else im.mode, (largest, largest))
+        im.load()
+        images = {}
+        for w, h in sizes:
+            if (w, h) == (0, 0):
+                images[(w, h)] = _to_qimage(im)
+                continue
+            thumb = im.copy()
+            thumb.thumbnail((w, h), Image.LANCZOS)
+            images[(w, h)] = _to_qimage(thumb)
+        return images
+
+
+def _decode_with_qt(data: bytes, sizes: Iterable[SizeKey]) -> Dict[SizeKey, QImage]:
+    """Pillow 不支持的格式（如 SVG）交给 Qt 的图片插件"""
+    images = {}
+    for w, h in sizes:
+        buffer = QBuffer()
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+        original = reader.size()
+        if (w, h) != (0, 0) and original.isValid():
+            reader.setScaledSize(original.scaled(QSize(w, h), Qt.KeepAspectRatio))
+        image = reader.read()
+        if not image.isNull():
+            images[(w, h)] = image
+    return images
+
+
+class ThumbnailPipeline(QObject):
+    """
+    后台解码 + 磁盘缩略图
+
+    - read(url, size, callback): 读取磁盘上的缩略图，没有时回调 None
+    - decode(url, data, sizes, callback): 解码下载到的图片，回调 {尺寸: QImage}，
+      其中 THUMBNAIL_SIZES 内的尺寸同时写入磁盘
+    回调都在 GUI 线程执行。
+    """
+
+    _delivered = pyqtSignal(object, object)  # (callback, payload)
+
+    def __init__(self, directory: str = THUMBNAIL_DIR, max_workers: int = THUMBNAIL_WORKERS):
+        super().__init__()
+        self.directory = directory
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # 跨线程 emit 走队列连接，回调在 GUI 线程执行
+        self._delivered.connect(self._deliver)
+
+    def _deliver(self, callback, payload):
+        callback(payload)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix='thumb'
+                )
+            return self._executor
+
+    def _submit(self, func, callback: Callable, *args) -> Future:
+        def on_done(f: Future):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                print(f"[Thumb] 处理失败: {error}")
+            self._delivered.emit(callback, None if error else f.result())
+
+        future = self._get_executor().submit(func, *args)
+        future.add_done_callback(on_done)
+        return future
+
+    def path_for(self, url: str, size: int) -> str:
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f'{digest}_{size}.png')
+
+    # ===== 读取 =====
+
+    def read(self, url: str, size: int, callback: Callable[[Optional[QImage]], None]) -> Future:
+        return self._submit(self._read, callback, url, size)
+
+    def _read(self, url: str, size: int) -> Optional[QImage]:
+        path = self.path_for(url, size)
+        if not os.path.exists(path):
+            return None
+        image = QImage(path)
+        return None if image.isNull() else image
+
+    # ===== 解码 =====
+
+    def decode(self, url: str, data: bytes, sizes: Iterable[SizeKey],
+               callback: Callable[[Optional[Dict[SizeKey, QImage]]], None]) -> Future:
+        """
+        Args:
+            sizes: 需要的尺寸；THUMBNAIL_SIZES 会一并生成，一次解码全部写入磁盘
+        """
+        wanted = set(sizes) | {(s, s) for s in THUMBNAIL_SIZES}
+        return self._submit(self._decode, callback, url, data, wanted)
+
+    def _decode(self, url: str, data: bytes, sizes) -> Dict[SizeKey, QImage]:
+        try:
+            images = _decode_with_pillow(data, sizes)
+        except (UnidentifiedImageError, OSError, ValueError):
+            images = _decode_with_qt(data, sizes)
+
+        for size in THUMBNAIL_SIZES:
+            image = images.get((size, size))
+            if image is not None:
+                self._save(image, self.path_for(url, size))
+        return images
+
+    @staticmethod
+    def _save(image: QImage, path: str):
+        """先写临时文件再替换，避免读到写了一半的缩略图"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.{threading.get_ident()}.tmp'
+            if image.save(tmp, 'PNG'):
+                os.replace(tmp, path)
+        except OSError as e:
+            print(f"[Thumb] 保存缩略图失败: {e}")
+
+    def shutdown(self):
+        """关闭线程池（退出程序时调用）"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# 全局实例
+thumbnail_pipeline = ThumbnailPipeline()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 交易构建
+
+准备一笔合约交易需要 nonce、gas 价格、链 ID 和 gas 预估四次查询，
+逐个请求时高延迟节点上要等好几秒。这里把它们合成一个 JSON-RPC 批量请求，
+一次往返拿到全部结果；节点不支持批量请求时退回逐个查询。
+
+nonce 由 nonce_manager 在本地分配，同一账户的多笔交易可以同时在途；
+sign_and_send 负责签名失败时归还 nonce、nonce 冲突时重新同步并重试。
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CHAIN_GAS_MARGIN
+from services.chain_client import ChainClient
+from services.nonce_manager import nonce_manager, is_nonce_error
+
+
+class TransactionRevertError(ValueError):
+    """预估 gas 时合约执行失败（参数不合法、条件不满足等）"""
+
+
+class TransactionBuilder:
+    """
+    合约交易构建器
+
+    用法：
+        builder = TransactionBuilder(chain_pool.get())
+        tx = builder.build(chain.zetafrog(), 'mintFrog', [name], sender)
+        tx_hash, nonce = builder.sign_and_send(tx, wallet_manager.sign_transaction)
+    """
+
+    def __init__(self, chain: ChainClient):
+        self.chain = chain
+
+    def build(self, contract, fn_name: str, args: Sequence[Any], sender: str,
+              value: int = 0, gas: Optional[int] = None) -> Dict[str, Any]:
+        """
+        构建未签名的交易
+
+        Args:
+            contract: 合约对象（ChainClient.contract / zetafrog）
+            fn_name: 合约函数名，如 'mintFrog'、'startTravel'
+            args: 函数参数
+            sender: 发送方地址
+            value: 附带的原生代币数量（wei）
+            gas: 指定 gas 上限时不再预估
+
+        Raises:
+            TransactionRevertError: 预估 gas 时合约执行失败
+            ValueError: 节点的链 ID 与配置不符
+            requests.RequestException: 所有节点都无法连接
+        """
+        w3 = self.chain.w3
+        sender = w3.to_checksum_address(sender)
+        call = {
+            'from': sender,
+            'to': contract.address,
+            'data': contract.encode_abi(fn_name, args=list(args)),
+            'value': value,
+        }
+
+        fields = self._fetch_fields(call, estimate=gas is None)
+        if fields['chainId'] != self.chain.chain_id:
+            raise ValueError(f"节点链 ID 不符: {fields['chainId']} != {self.chain.chain_id}")
+        if gas is None:
+            gas = int(fields['estimate'] * CHAIN_GAS_MARGIN)
+
+        return {
+            **call,
+            'nonce': nonce_manager.reserve(self.chain.chain_id, sender, fields['nonce']),
+            'gas': gas,
+            'gasPrice': fields['gasPrice'],
+            'chainId': fields['chainId'],
+        }
+
+    def sign_and_send(self, tx: Dict[str, Any],
+                      sign: Callable[[Dict], Tuple[bool, str]]) -> Tuple[str, int]:
+        """
+        签名并广播 build 得到的交易
+
+        Args:
+            sign: 签名函数，如 wallet_manager.sign_transaction，返回 (是否成功, 签名后的交易或错误信息)
+
+        Returns:
+            (交易哈希, 实际使用的 nonce)；上链后调用 nonce_manager.mark_done
+
+        Raises:
+            ValueError: 签名失败
+            其他异常: 广播失败（nonce 已归还）
+        """
+        chain_id, sender = self.chain.chain_id, tx['from']
+        for attempt in range(2):
+            success, result = sign(tx)
+            if not success:
+                nonce_manager.release(chain_id, sender, tx['nonce'])
+                raise ValueError(result)
+            try:
+                tx_hash = self.chain.w3.to_hex(self.chain.w3.eth.send_raw_transaction(result))
+            except Exception as e:
+                if 'already known' in str(e).lower():
+                    # 同一笔交易已在节点的交易池中（例如切换节点后重发）
+                    tx_hash = self.chain.w3.to_hex(self.chain.w3.keccak(hexstr=result))
+                elif is_nonce_error(e) and attempt == 0:
+                    # 本地 nonce 与链上不一致：以链上为准重新分配后重试一次
+                    print(f"[Tx] nonce {tx['nonce']} 冲突，重新同步: {e}")
+                    nonce_manager.resync(chain_id, sender)
+                    chain_nonce = self.chain.w3.eth.get_transaction_count(sender, 'pending')
+                    tx = {**tx, 'nonce': nonce_manager.reserve(chain_id, sender, chain_nonce)}
+                    continue
+                else:
+                    nonce_manager.release(chain_id, sender, tx['nonce'])
+                    raise
+            nonce_manager.mark_sent(chain_id, sender, tx['nonce'])
+            return tx_hash, tx['nonce']
+
+    # ===== 查询 =====
+
+    def _fetch_fields(self, call: Dict[str, Any], estimate: bool) -> Dict[str, int]:
+        try:
+            fields = self._fetch_batched(call, estimate)
+        except TransactionRevertError:
+            raise
+        except (ValueError, TypeError, KeyError, requests.HTTPError) as e:
+            # 节点不接受批量请求（返回非数组、400 等）
+            print(f"[Tx] 批量请求不可用，改为逐个查询: {e}")
+            fields = None
+        if fields is None:
+            fields = self._fetch_sequential(call, estimate)
+        return fields
+
+    def _fetch_batched(self, call: Dict[str, Any], estimate: bool) -> Optional[Dict[str, int]]:
+        rpc_call = {**call, 'value': hex(call['value'])}
+        batch: List[tuple] = [
+            ('eth_getTransactionCount', [call['from'], 'pending']),
+            ('eth_gasPrice', []),
+            ('eth_chainId', []),
+        ]
+        if estimate:
+            batch.append(('eth_estimateGas', [rpc_call]))
+
+        responses = self.chain.provider.make_batch_request(batch)
+        if not isinstance(responses, list) or len(responses) != len(batch):
+            return None
+
+        if estimate and 'error' in responses[3]:
+            # 合约执行失败，换成逐个查询也一样，直接报错
+            raise TransactionRevertError(f"交易预估失败: {responses[3]['error'].get('message')}")
+        if any('error' in r for r in responses):
+            return None
+
+        results = [int(r['result'], 16) for r in responses]
+        fields = {'nonce': results[0], 'gasPrice': results[1], 'chainId': results[2]}
+        if estimate:
+            fields['estimate'] = results[3]
+        return fields
+
+    def _fetch_sequential(self, call: Dict[str, Any], estimate: bool) -> Dict[str, int]:
+        eth = self.chain.w3.eth
+        fields = {
+            'nonce': eth.get_transaction_count(call['from'], 'pending'),
+            'gasPrice': eth.gas_price,
+            'chainId': eth.chain_id,
+        }
+        if estimate:
+            try:
+                fields['estimate'] = eth.estimate_gas(call)
+            except requests.RequestException:
+                raise
+            except Exception as e:
+                raise TransactionRevertError(f"交易预估失败: {e}") from e
+        return fields
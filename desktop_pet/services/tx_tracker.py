@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 交易确认跟踪
+
+提交后的交易交给 tx_tracker.track()，不再由每笔交易占用一个线程阻塞在
+wait_for_transaction_receipt 上。所有在途交易的回执按链合成一个 JSON-RPC
+批量请求，约每个出块间隔查一次（后台线程），没有新确认时逐步放慢。
+
+在途交易保存在 snapshot_store 中，程序重启后 start() 会继续跟踪，
+确认结果通过 tx_confirmed / tx_failed 信号通知（GUI 线程）。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Dict, List, Optional
+
+import requests
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import TX_POLL_MIN, TX_POLL_MAX, TX_POLL_BACKOFF, TX_RECEIPT_BATCH, TX_DROP_TIMEOUT
+from services.snapshot_store import snapshot_store
+from services.nonce_manager import nonce_manager
+
+
+def _fetch_chunk(provider, hashes: List[str]) -> List[Dict]:
+    """一个批量请求查询一组回执；节点不支持批量请求时逐个查询"""
+    batch = [('eth_getTransactionReceipt', [h]) for h in hashes]
+    try:
+        responses = provider.make_batch_request(batch)
+    except (ValueError, TypeError, KeyError, requests.HTTPError) as e:
+        # 节点拒绝批量请求（400、返回非 JSON 等）
+        print(f"[Tx] 批量请求不可用，改为逐个查询: {e}")
+        responses = None
+    if not isinstance(responses, list) or len(responses) != len(hashes):
+        responses = [provider.make_request(method, params) for method, params in batch]
+    return responses
+
+
+def _fetch_receipts(groups: Dict[int, List[str]]) -> Dict[str, Optional[Dict]]:
+    """
+    后台线程：批量查询回执
+
+    Returns:
+        交易哈希 -> 回执（尚未上链为 None）；查询失败的交易不在结果中
+    """
+    # web3 较重，只在真正有交易要查时导入
+    from services.chain_client import chain_pool
+
+    results: Dict[str, Optional[Dict]] = {}
+    for chain_id, hashes in groups.items():
+        try:
+            provider = chain_pool.get(chain_id).provider
+        except ValueError as e:
+            print(f"[Tx] {e}")
+            continue
+        for start in range(0, len(hashes), TX_RECEIPT_BATCH):
+            chunk = hashes[start:start + TX_RECEIPT_BATCH]
+            try:
+                responses = _fetch_chunk(provider, chunk)
+            except Exception as e:
+                print(f"[Tx] 查询回执失败: {e}")
+                continue
+            for tx_hash, response in zip(chunk, responses):
+                if 'error' not in response:
+                    results[tx_hash] = response.get('result')
+    return results
+
+
+class TxTracker(QObject):
+    """
+    在途交易跟踪
+
+    交易记录（dict，可 JSON 序列化）：
+        hash, chain_id, from, nonce, kind（如 'mint'）, meta（调用方附带的信息）,
+        submitted_at；确认或失败时附加 receipt / error
+    """
+
+    # 交易成功上链（交易记录）
+    tx_confirmed = pyqtSignal(object)
+    # 交易执行失败或被丢弃（交易记录）
+    tx_failed = pyqtSignal(object)
+
+    _fetched = pyqtSignal(object)  # 后台线程查询结果
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._interval = TX_POLL_MIN
+        self._polling = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._poll)
+        # 跨线程 emit 走队列连接，结果在 GUI 线程处理
+        self._fetched.connect(self._on_fetched)
+
+    def start(self):
+        """恢复上次退出时尚未确认的交易"""
+        for record in snapshot_store.load('transactions', 'pending', []):
+            self._pending[record['hash']] = record
+        if self._pending:
+            print(f"[Tx] 继续跟踪 {len(self._pending)} 笔未确认的交易")
+            self._timer.start(0)
+
+    def shutdown(self):
+        """停止查询（退出程序时调用），在途交易已经保存"""
+        self._timer.stop()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # ===== 跟踪 =====
+
+    def track(self, tx_hash: str, chain_id: int, sender: str, nonce: int,
+              kind: str = '', meta: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        开始跟踪一笔已广播的交易
+
+        Args:
+            kind: 交易类型，确认后界面据此决定如何处理（如 'mint' 刷新青蛙列表）
+            meta: 附带信息，需可 JSON 序列化
+        """
+        record = {
+            'hash': tx_hash,
+            'chain_id': chain_id,
+            'from': sender,
+            'nonce': nonce,
+            'kind': kind,
+            'meta': meta or {},
+            'submitted_at': time.time(),
+        }
+        self._pending[tx_hash] = record
+        self._save()
+
+        # 新交易：恢复最快的查询
+        self._interval = TX_POLL_MIN
+        if not self._polling:
+            self._timer.start(self._interval)
+        return record
+
+    def is_pending(self, tx_hash: str) -> bool:
+        return tx_hash in self._pending
+
+    @property
+    def pending(self) -> List[Dict[str, Any]]:
+        return list(self._pending.values())
+
+    def _save(self):
+        snapshot_store.save('transactions', 'pending', list(self._pending.values()))
+
+    # ===== 查询 =====
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tx')
+            return self._executor
+
+    def _poll(self):
+        if not self._pending or self._polling:
+            return
+        groups: Dict[int, List[str]] = {}
+        for record in self._pending.values():
+            groups.setdefault(record['chain_id'], []).append(record['hash'])
+
+        def on_done(f: Future):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                print(f"[Tx] 查询回执失败: {error}")
+            self._fetched.emit({} if error else f.result())
+
+        self._polling = True
+        self._get_executor().submit(_fetch_receipts, groups).add_done_callback(on_done)
+
+    def _on_fetched(self, results: Dict[str, Optional[Dict]]):
+        self._polling = False
+        now = time.time()
+        finished = False
+
+        for tx_hash, receipt in results.items():
+            record = self._pending.get(tx_hash)
+            if record is None:
+                continue
+            if receipt is None:
+                if now - record['submitted_at'] > TX_DROP_TIMEOUT:
+                    # 长时间不上链：多半已被节点丢弃，本地 nonce 需要重新同步
+                    del self._pending[tx_hash]
+                    nonce_manager.resync(record['chain_id'], record['from'])
+                    finished = True
+                    self.tx_failed.emit({**record, 'error': '交易长时间未上链，可能已被丢弃'})
+                continue
+
+            del self._pending[tx_hash]
+            nonce_manager.mark_done(record['chain_id'], record['from'], record['nonce'])
+            finished = True
+            record = {**record, 'receipt': receipt}
+            if int(receipt.get('status') or '0x0', 16) == 1:
+                print(f"[Tx] 交易已确认: {tx_hash}")
+                self.tx_confirmed.emit(record)
+            else:
+                self.tx_failed.emit({**record, 'error': '交易执行失败'})
+
+        if finished:
+            self._save()
+            self._interval = TX_POLL_MIN
+        else:
+            self._interval = min(TX_POLL_MAX, int(self._interval * TX_POLL_BACKOFF))
+        if self._pending:
+            self._timer.start(self._interval)
+
+
+# 全局实例
+tx_tracker = TxTracker()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共设置
+
+在 desktop_pet 目录下运行: python -m pytest tests
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """需要 Qt 事件循环或控件的测试使用"""
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+class FakeClock:
+    """替换 time.monotonic，手动推进时间"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def rpc_stub():
+    """
+    创建进程内 JSON-RPC 节点：rpc_stub() / rpc_stub(chain_id=97)
+
+    测试结束时全部关闭。
+    """
+    from tests.rpc_stub import RpcStub
+    stubs = []
+
+    def create(chain_id: int = 7001) -> RpcStub:
+        stub = RpcStub(chain_id)
+        stubs.append(stub)
+        return stub
+
+    yield create
+    for stub in stubs:
+        stub.close()
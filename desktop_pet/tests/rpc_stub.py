@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+进程内 JSON-RPC 节点（测试用）
+
+在本机随机端口上起一个 HTTP 服务，按方法名分发到 handlers，
+可以模拟节点故障（固定状态码）、不支持批量请求（批量请求返回 400）、
+JSON-RPC 错误等情况，不依赖 anvil / eth-tester。
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RpcError(Exception):
+    """handler 抛出时返回 JSON-RPC error 对象"""
+
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+
+class RpcStub:
+    """
+    JSON-RPC 节点
+
+    handlers: 方法名 -> handler(params)，返回 result 或抛出 RpcError
+    status: 不为 200 时所有请求直接返回该 HTTP 状态码（节点故障、限流）
+    batch_status: 不为 None 时批量请求返回该状态码（节点不接受批量请求）
+    calls: 收到的方法名；batches: 收到的批量请求数；posts: 收到的 HTTP 请求数
+    """
+
+    def __init__(self, chain_id: int = 7001):
+        self.chain_id = chain_id
+        self.status = 200
+        self.batch_status: Optional[int] = None
+        self.handlers: Dict[str, Callable[[List[Any]], Any]] = {
+            'eth_chainId': lambda params: hex(self.chain_id),
+            'eth_blockNumber': lambda params: '0x10',
+            'web3_clientVersion': lambda params: 'rpc-stub',
+        }
+        self.calls: List[str] = []
+        self.batches = 0
+        self.posts = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                status, payload = stub._handle(body)
+                data = b'' if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, body):
+        with self._lock:
+            self.posts += 1
+            if self.status != 200:
+                return self.status, None
+            if isinstance(body, list):
+                self.batches += 1
+                if self.batch_status is not None:
+                    return self.batch_status, None
+        if isinstance(body, list):
+            # 故意倒序返回，检查调用方按 id 对应
+            return 200, [self._call(request) for request in reversed(body)]
+        return 200, self._call(body)
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request['method']
+        with self._lock:
+            self.calls.append(method)
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        handler = self.handlers.get(method)
+        if handler is None:
+            response['error'] = {'code': -32601, 'message': f'method not found: {method}'}
+            return response
+        try:
+            response['result'] = handler(request.get('params') or [])
+        except RpcError as e:
+            response['error'] = {'code': e.code, 'message': str(e)}
+        return response
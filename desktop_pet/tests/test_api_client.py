@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""ApiClient 解析结果复用"""
+
+import importlib
+
+import pytest
+
+from models import Frog
+from services.api_client import ApiClient
+from services.snapshot_store import SnapshotStore
+
+
+# services 包导出了同名的全局实例，这里取模块本身
+api_module = importlib.import_module('services.api_client')
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api_module, 'snapshot_store', SnapshotStore(':memory:'))
+    monkeypatch.setattr(api_module, 'API_PARSED_MEMO_SIZE', 3)
+    client = ApiClient(base_url='http://backend')
+    responses = {}
+    monkeypatch.setattr(client, 'get', lambda endpoint, params=None: responses[endpoint])
+    client.responses = responses
+    return client
+
+
+def _frog(client, token_id):
+    endpoint = f'/frogs/{token_id}'
+    if endpoint not in client.responses:
+        client.responses[endpoint] = {'success': True, 'data': {'tokenId': token_id, 'name': f'f{token_id}'}}
+    return client._get_snapshot('frog', token_id, endpoint, model=Frog)
+
+
+def test_same_raw_data_reuses_parsed_model(client):
+    first = _frog(client, 1)
+    assert _frog(client, 1) is first
+    # 数据变化（新的响应对象）时重新解析
+    client.responses['/frogs/1'] = {'success': True, 'data': {'tokenId': 1, 'name': 'renamed'}}
+    assert _frog(client, 1) is not first
+
+
+def test_memo_is_bounded_lru(client):
+    frogs = {token_id: _frog(client, token_id) for token_id in (1, 2, 3)}
+    _frog(client, 1)  # 最近使用，不被淘汰
+    _frog(client, 4)
+    assert list(client._parsed) == [('frog', 3), ('frog', 1), ('frog', 4)]
+    assert _frog(client, 1) is frogs[1]
+    assert _frog(client, 2) is not frogs[2]
+    assert len(client._parsed) == 3
+
+
+def test_clearing_cache_drops_memo(client):
+    _frog(client, 1)
+    client.invalidate_cache()
+    assert not client._parsed
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""FailoverHTTPProvider / ChainClient / ChainPool（本地 JSON-RPC 节点）"""
+
+import socket
+
+import pytest
+import requests
+
+from services import chain_client
+from services.chain_client import ChainClient, ChainPool
+from services.contracts import CHAIN_CONFIG
+
+
+def _closed_url():
+    """一个没有服务监听的地址"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    return f'http://127.0.0.1:{port}'
+
+
+@pytest.fixture
+def clock(monkeypatch, fake_clock):
+    monkeypatch.setattr(chain_client.time, 'monotonic', fake_clock)
+    return fake_clock
+
+
+@pytest.fixture
+def make_client(clock):
+    clients = []
+
+    def create(urls):
+        client = ChainClient(CHAIN_CONFIG, urls)
+        # 延迟测量在测试里手动调用，避免后台线程打乱请求计数
+        client.provider._last_probe = clock.now
+        clients.append(client)
+        return client
+
+    yield create
+    for client in clients:
+        client.close()
+
+
+def test_requests_go_through_the_shared_session(make_client, rpc_stub):
+    node = rpc_stub()
+    chain = make_client([node.url])
+    assert chain.w3.eth.chain_id == 7001
+    assert chain.w3.eth.block_number == 16
+    assert node.calls == ['eth_chainId', 'eth_blockNumber']
+    assert chain.is_connected()
+
+
+@pytest.mark.parametrize('failure', [503, 429, 'down'])
+def test_failover_to_next_endpoint(make_client, rpc_stub, failure):
+    backup = rpc_stub()
+    if failure == 'down':
+        primary_url = _closed_url()
+    else:
+        primary = rpc_stub()
+        primary.status = failure
+        primary_url = primary.url
+    chain = make_client([primary_url, backup.url])
+
+    assert chain.w3.eth.block_number == 16
+    assert chain.provider.endpoint_uri == backup.url
+    stats = {s['url']: s for s in chain.get_stats()}
+    assert stats[primary_url]['errors'] == 1 and not stats[primary_url]['available']
+    assert stats[backup.url]['errors'] == 0 and stats[backup.url]['available']
+
+
+def test_cooldown_skips_failed_endpoint_then_retries(make_client, rpc_stub, clock):
+    primary, backup = rpc_stub(), rpc_stub()
+    primary.status = 503
+    chain = make_client([primary.url, backup.url])
+    provider = chain.provider
+
+    chain.w3.eth.block_number
+    assert primary.posts == 1
+
+    # 冷却期内排在最后，不再先试它
+    primary.status = 200
+    chain.w3.eth.block_number
+    assert primary.posts == 1 and backup.calls.count('eth_blockNumber') == 2
+    assert provider.ranked()[-1].url == primary.url
+
+    # 冷却结束后重新可用；backup 也失败时会回到它
+    clock.advance(chain_client.CHAIN_RPC_COOLDOWN + 1)
+    assert all(s['available'] for s in chain.get_stats())
+    backup.status = 503
+    assert chain.w3.eth.block_number == 16
+    assert provider.endpoint_uri == primary.url
+
+
+def test_consecutive_failures_double_cooldown(make_client, rpc_stub, clock):
+    primary, backup = rpc_stub(), rpc_stub()
+    primary.status = 503
+    chain = make_client([primary.url, backup.url])
+    endpoint = chain.provider.endpoints[0]
+
+    chain.provider.make_request('eth_blockNumber', [])
+    assert endpoint.down_until - clock.now == chain_client.CHAIN_RPC_COOLDOWN
+
+    backup.status = 503
+    clock.advance(chain_client.CHAIN_RPC_COOLDOWN + 1)
+    with pytest.raises(requests.HTTPError):
+        chain.provider.make_request('eth_blockNumber', [])
+    assert endpoint.down_until - clock.now == chain_client.CHAIN_RPC_COOLDOWN * 2
+
+    # 成功一次后清零
+    primary.status = 200
+    clock.advance(chain_client.CHAIN_RPC_COOLDOWN * 2 + 1)
+    chain.provider.make_request('eth_blockNumber', [])
+    assert endpoint.failures == 0 and endpoint.down_until == 0
+
+
+def test_client_errors_do_not_fail_over(make_client, rpc_stub):
+    primary, backup = rpc_stub(), rpc_stub()
+    primary.status = 400
+    chain = make_client([primary.url, backup.url])
+    with pytest.raises(requests.HTTPError):
+        chain.provider.make_request('eth_blockNumber', [])
+    assert backup.posts == 0
+    assert chain.provider.endpoints[0].failures == 0
+
+
+def test_batch_request(make_client, rpc_stub):
+    node = rpc_stub()
+    chain = make_client([node.url])
+    responses = chain.provider.make_batch_request([
+        ('eth_chainId', []),
+        ('eth_blockNumber', []),
+        ('eth_unknown', []),
+    ])
+    assert node.batches == 1 and node.posts == 1
+    # 节点倒序返回，按 id 还原顺序
+    assert [r.get('result') for r in responses] == ['0x1b59', '0x10', None]
+    assert responses[2]['error']['code'] == -32601
+
+
+def test_batch_request_fails_over(make_client, rpc_stub):
+    primary, backup = rpc_stub(), rpc_stub()
+    primary.status = 502
+    chain = make_client([primary.url, backup.url])
+    responses = chain.provider.make_batch_request([('eth_chainId', []), ('eth_blockNumber', [])])
+    assert [r['result'] for r in responses] == ['0x1b59', '0x10']
+    assert backup.batches == 1
+
+
+def test_batch_rejected_by_node_raises(make_client, rpc_stub):
+    node = rpc_stub()
+    node.batch_status = 400
+    chain = make_client([node.url])
+    with pytest.raises(requests.HTTPError):
+        chain.provider.make_batch_request([('eth_chainId', []), ('eth_blockNumber', [])])
+
+
+def test_probe_ranks_by_latency_and_rejects_wrong_chain(make_client, rpc_stub):
+    wrong, right = rpc_stub(chain_id=97), rpc_stub()
+    chain = make_client([wrong.url, right.url])
+    chain.provider.probe()
+    ranked = chain.provider.ranked()
+    assert ranked[0].url == right.url and ranked[0].latency is not None
+    assert ranked[1].url == wrong.url and ranked[1].failures == 1
+
+
+def test_pool_reuses_clients_and_honours_override(monkeypatch, rpc_stub):
+    node = rpc_stub()
+    monkeypatch.setattr(chain_client, 'CHAIN_RPC_OVERRIDE', f' {node.url} ,')
+    pool = ChainPool()
+    try:
+        chain = pool.get()
+        assert pool.get(CHAIN_CONFIG['chain_id']) is chain
+        assert [e.url for e in chain.provider.endpoints] == [node.url]
+        assert chain.w3.eth.chain_id == CHAIN_CONFIG['chain_id']
+        with pytest.raises(ValueError):
+            pool.get(1)
+    finally:
+        pool.close()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""ChainReader（本地 JSON-RPC 节点）"""
+
+import pytest
+
+from services import chain_reader
+from services.chain_client import ChainClient
+from services.chain_reader import ChainReader
+from services.contracts import CHAIN_CONFIG, MULTICALL3_ADDRESS
+from tests.rpc_stub import RpcError
+
+TOTAL_SUPPLY = 10
+CHUNK = 4
+
+
+class _FrogNode:
+    """在 RpcStub 上实现 ZetaFrogNFT 的只读方法和 Multicall3.aggregate3"""
+
+    def __init__(self, stub, chain):
+        self.codec = chain.w3.codec
+        self.frog = chain.zetafrog()
+        self.multicall_deployed = True
+        self.aggregate_calls = 0
+        self._selectors = {
+            self.frog.encode_abi('getFrog', args=[0])[:10]: self._get_frog,
+            self.frog.encode_abi('balanceOf', args=[self.frog.address])[:10]: self._balance_of,
+            self.frog.encode_abi('totalSupply')[:10]: self._total_supply,
+        }
+        stub.handlers['eth_call'] = self._eth_call
+
+    def _eth_call(self, params):
+        call = params[0]
+        to, data = call['to'].lower(), call.get('data') or call.get('input')
+        if to == MULTICALL3_ADDRESS.lower():
+            if not self.multicall_deployed:
+                return '0x'  # 地址上没有代码
+            self.aggregate_calls += 1
+            (calls,) = self.codec.decode(['(address,bool,bytes)[]'], bytes.fromhex(data[10:]))
+            results = []
+            for target, _, call_data in calls:
+                result = self._frog_call('0x' + call_data.hex()) if target.lower() == self.frog.address.lower() else None
+                results.append((result is not None, result or b''))
+            return '0x' + self.codec.encode(['(bool,bytes)[]'], [results]).hex()
+        result = self._frog_call(data) if to == self.frog.address.lower() else None
+        if result is None:
+            raise RpcError('execution reverted', 3)
+        return '0x' + result.hex()
+
+    def _frog_call(self, data):
+        handler = self._selectors.get(data[:10])
+        return handler(bytes.fromhex(data[10:])) if handler else None
+
+    def _get_frog(self, args):
+        (token_id,) = self.codec.decode(['uint256'], args)
+        if not 1 <= token_id <= TOTAL_SUPPLY:
+            return None  # Frog does not exist
+        return self.codec.encode(['string', 'uint64', 'uint32', 'uint8', 'uint256', 'uint256'],
+                                 [f'frog{token_id}', 1700000000, token_id % 7, token_id % 2,
+                                  token_id * 10, 1 + token_id % 5])
+
+    def _balance_of(self, args):
+        (owner,) = self.codec.decode(['address'], args)
+        return self.codec.encode(['uint256'], [int(owner[-1], 16)])
+
+    def _total_supply(self, args):
+        return self.codec.encode(['uint256'], [TOTAL_SUPPLY])
+
+
+@pytest.fixture
+def node(monkeypatch, rpc_stub):
+    # 缩小分组，少量调用即可覆盖多组
+    monkeypatch.setattr(chain_reader, 'CHAIN_MULTICALL_CHUNK', CHUNK)
+    stub = rpc_stub()
+    chain = ChainClient(CHAIN_CONFIG, [stub.url])
+    frog_node = _FrogNode(stub, chain)
+    frog_node.stub, frog_node.chain = stub, chain
+    yield frog_node
+    chain.close()
+
+
+def _reset_counters(stub):
+    stub.calls.clear()
+    stub.batches = stub.posts = 0
+
+
+TOKEN_IDS = list(range(1, TOTAL_SUPPLY + 3))  # 最后两个不存在
+
+
+@pytest.mark.parametrize('mode', chain_reader.MODES)
+def test_modes_return_same_frogs(node, mode):
+    frogs = ChainReader(node.chain, mode).get_frogs(TOKEN_IDS)
+    assert list(frogs) == TOKEN_IDS
+    assert frogs[TOTAL_SUPPLY + 1] is None and frogs[TOTAL_SUPPLY + 2] is None
+    assert frogs[3] == {
+        'tokenId': 3,
+        'name': 'frog3',
+        'birthday': '2023-11-14T22:13:20+00:00',
+        'totalTravels': 3,
+        'status': 'Traveling',
+        'xp': 30,
+        'level': 4,
+    }
+
+
+def test_multicall_chunks_in_one_batch(node):
+    _reset_counters(node.stub)
+    reader = ChainReader(node.chain)
+    frogs = reader.get_frogs(TOKEN_IDS)
+    assert sum(frog is not None for frog in frogs.values()) == TOTAL_SUPPLY
+    # 12 个调用按 4 个一组聚合成 3 个 aggregate3，一次 HTTP 往返
+    assert node.aggregate_calls == 3
+    assert node.stub.posts == 1 and node.stub.batches == 1
+    assert node.stub.calls == ['eth_call'] * 3
+
+
+def test_batch_mode_chunks_requests(node):
+    _reset_counters(node.stub)
+    ChainReader(node.chain, 'batch').get_frogs(TOKEN_IDS)
+    assert node.stub.posts == 3 and node.stub.batches == 3
+    assert node.aggregate_calls == 0
+
+
+def test_sequential_mode_sends_one_request_per_call(node):
+    _reset_counters(node.stub)
+    ChainReader(node.chain, 'sequential').get_frogs(TOKEN_IDS)
+    assert node.stub.posts == len(TOKEN_IDS) and node.stub.batches == 0
+
+
+def test_missing_multicall_falls_back_to_batch(node):
+    node.multicall_deployed = False
+    reader = ChainReader(node.chain)
+    frogs = reader.get_frogs(TOKEN_IDS)
+    assert reader.mode == 'batch'
+    assert frogs[1]['name'] == 'frog1' and frogs[TOTAL_SUPPLY + 1] is None
+
+    # 之后直接用批量 eth_call，不再尝试 Multicall3
+    _reset_counters(node.stub)
+    assert reader.get_total_supply() == TOTAL_SUPPLY
+    assert node.stub.posts == 1 and node.aggregate_calls == 0
+
+
+def test_rejected_batch_falls_back_to_single_requests(node):
+    node.stub.batch_status = 400
+    _reset_counters(node.stub)
+    frogs = ChainReader(node.chain, 'batch').get_frogs(TOKEN_IDS[:CHUNK])
+    assert [frog['name'] for frog in frogs.values()] == ['frog1', 'frog2', 'frog3', 'frog4']
+    assert node.stub.batches == 1 and node.stub.calls == ['eth_call'] * CHUNK
+
+
+def test_balances_and_total_supply(node):
+    reader = ChainReader(node.chain)
+    addresses = ['0x' + '00' * 19 + '0%d' % i for i in range(1, 4)]
+    # 重复地址只查一次
+    assert reader.get_balances(addresses + addresses[:1]) == {a: i for i, a in enumerate(addresses, 1)}
+    assert reader.get_total_supply() == TOTAL_SUPPLY
+
+
+def test_empty_read_makes_no_requests(node):
+    _reset_counters(node.stub)
+    assert ChainReader(node.chain).read([]) == []
+    assert ChainReader(node.chain).get_frogs([]) == {}
+    assert node.stub.posts == 0
+
+
+def test_unknown_mode_is_rejected(node):
+    with pytest.raises(ValueError):
+        ChainReader(node.chain, 'parallel')
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""NonceManager / TransactionBuilder（本地 JSON-RPC 节点）"""
+
+import threading
+
+import pytest
+
+from config import CHAIN_GAS_MARGIN, CHAIN_NONCE_STALE
+from services import nonce_manager as nonce_module
+from services import transaction_builder as builder_module
+from services.nonce_manager import NonceManager, is_nonce_error
+
+CHAIN = 7001
+ADDRESS = '0x00000000000000000000000000000000000000Aa'
+
+
+@pytest.fixture
+def nonces(monkeypatch, fake_clock):
+    monkeypatch.setattr(nonce_module.time, 'monotonic', fake_clock)
+    return NonceManager()
+
+
+# ===== NonceManager =====
+
+def test_reserve_hands_out_consecutive_nonces(nonces):
+    assert [nonces.reserve(CHAIN, ADDRESS, 5) for _ in range(3)] == [5, 6, 7]
+    assert nonces.pending_count(CHAIN, ADDRESS) == 3
+    # 链上 nonce 追上来时以链上为下限
+    assert nonces.reserve(CHAIN, ADDRESS, 10) == 10
+
+
+def test_addresses_and_chains_are_independent(nonces):
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 5
+    assert nonces.reserve(CHAIN, ADDRESS.lower(), 5) == 6
+    assert nonces.reserve(97, ADDRESS, 5) == 5
+    assert nonces.reserve(CHAIN, '0x' + 'bb' * 20, 0) == 0
+
+
+def test_release_reuses_gap_before_new_nonce(nonces):
+    first, second, third = (nonces.reserve(CHAIN, ADDRESS, 5) for _ in range(3))
+    nonces.release(CHAIN, ADDRESS, second)
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == second
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 8
+
+
+def test_release_of_tail_rewinds(nonces):
+    for _ in range(3):
+        nonces.reserve(CHAIN, ADDRESS, 5)
+    nonces.release(CHAIN, ADDRESS, 6)
+    nonces.release(CHAIN, ADDRESS, 7)
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 6
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 7
+
+
+def test_released_nonces_below_chain_nonce_are_dropped(nonces):
+    for _ in range(3):
+        nonces.reserve(CHAIN, ADDRESS, 5)
+    nonces.release(CHAIN, ADDRESS, 5)
+    # 5 已被链上消耗（如在其他设备上发了交易）
+    assert nonces.reserve(CHAIN, ADDRESS, 6) == 8
+
+
+def test_mark_done_and_resync(nonces):
+    nonce = nonces.reserve(CHAIN, ADDRESS, 5)
+    nonces.mark_sent(CHAIN, ADDRESS, nonce)
+    nonces.mark_done(CHAIN, ADDRESS, nonce)
+    assert nonces.pending_count(CHAIN, ADDRESS) == 0
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 6
+
+    nonces.resync(CHAIN, ADDRESS)
+    assert nonces.pending_count(CHAIN, ADDRESS) == 0
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 5
+
+
+def test_stale_in_flight_transactions_resync_to_chain(nonces, fake_clock):
+    for _ in range(3):
+        nonce = nonces.reserve(CHAIN, ADDRESS, 5)
+        nonces.mark_sent(CHAIN, ADDRESS, nonce)
+
+    # 还在等待确认：继续往后分配
+    fake_clock.advance(CHAIN_NONCE_STALE - 1)
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 8
+
+    # 所有在途交易都很久没有进展：视为被丢弃，回到链上 nonce
+    fake_clock.advance(CHAIN_NONCE_STALE + 1)
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 5
+    assert nonces.pending_count(CHAIN, ADDRESS) == 1
+
+
+def test_recent_activity_prevents_stale_resync(nonces, fake_clock):
+    nonces.mark_sent(CHAIN, ADDRESS, nonces.reserve(CHAIN, ADDRESS, 5))
+    nonces.mark_sent(CHAIN, ADDRESS, nonces.reserve(CHAIN, ADDRESS, 5))
+    fake_clock.advance(CHAIN_NONCE_STALE + 1)
+    # 只要还有一笔在途交易有进展就不重新同步
+    nonces.mark_sent(CHAIN, ADDRESS, 6)
+    assert nonces.reserve(CHAIN, ADDRESS, 5) == 7
+
+
+def test_concurrent_reserves_are_unique(nonces):
+    results = []
+    lock = threading.Lock()
+
+    def reserve():
+        for _ in range(50):
+            nonce = nonces.reserve(CHAIN, ADDRESS, 0)
+            with lock:
+                results.append(nonce)
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results) == list(range(400))
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('nonce too low: next nonce 7, tx nonce 5', True),
+    ('Replacement transaction underpriced', True),
+    ('invalid nonce', True),
+    ('insufficient funds for gas * price + value', False),
+])
+def test_is_nonce_error(message, expected):
+    assert is_nonce_error(ValueError(message)) is expected
+
+
+# ===== TransactionBuilder =====
+
+class _Node:
+    """在 RpcStub 上模拟账户 nonce、gas 和交易池"""
+
+    def __init__(self, stub, w3):
+        self.stub = stub
+        self.pending_nonce = 3
+        self.send_errors = []  # 依次作为 eth_sendRawTransaction 的错误
+        self.sent = []
+        stub.handlers.update({
+            'eth_getTransactionCount': lambda params: hex(self.pending_nonce),
+            'eth_gasPrice': lambda params: hex(10 ** 9),
+            'eth_estimateGas': lambda params: hex(100000),
+            'eth_sendRawTransaction': self._send,
+        })
+        self._w3 = w3
+
+    def _send(self, params):
+        from tests.rpc_stub import RpcError
+        if self.send_errors:
+            raise RpcError(self.send_errors.pop(0))
+        self.sent.append(params[0])
+        return self._w3.to_hex(self._w3.keccak(hexstr=params[0]))
+
+
+@pytest.fixture
+def env(monkeypatch, rpc_stub):
+    from services.chain_client import ChainClient
+    from services.contracts import CHAIN_CONFIG
+    from services.wallet_manager import WalletManager
+
+    manager = NonceManager()
+    monkeypatch.setattr(builder_module, 'nonce_manager', manager)
+    stub = rpc_stub()
+    chain = ChainClient(CHAIN_CONFIG, [stub.url])
+    wallet = WalletManager()
+    wallet.connect_with_private_key('0x' + '11' * 32)
+
+    class Env:
+        pass
+
+    env = Env()
+    env.stub, env.chain, env.wallet, env.nonces = stub, chain, wallet, manager
+    env.node = _Node(stub, chain.w3)
+    env.builder = builder_module.TransactionBuilder(chain)
+    env.build = lambda name='frog': env.builder.build(chain.zetafrog(), 'mintFrog', [name], wallet.address)
+    yield env
+    chain.close()
+
+
+def test_build_fetches_fields_in_one_batch(env):
+    tx = env.build()
+    assert env.stub.posts == 1 and env.stub.batches == 1
+    assert (tx['nonce'], tx['gasPrice'], tx['chainId']) == (3, 10 ** 9, 7001)
+    assert tx['gas'] == int(100000 * CHAIN_GAS_MARGIN)
+    assert tx['from'] == env.chain.w3.to_checksum_address(env.wallet.address)
+
+    # 不等上一笔确认，下一笔直接用下一个 nonce
+    assert env.build('second')['nonce'] == 4
+
+
+def test_build_falls_back_when_batch_rejected(env):
+    env.stub.batch_status = 400
+    tx = env.build()
+    assert tx['nonce'] == 3 and tx['gas'] == int(100000 * CHAIN_GAS_MARGIN)
+    # 批量请求被拒后逐个请求
+    assert env.stub.batches == 1 and env.stub.posts >= 5
+    assert 'eth_estimateGas' in env.stub.calls
+
+
+def test_revert_raises_without_reserving_nonce(env):
+    from tests.rpc_stub import RpcError
+
+    def revert(params):
+        raise RpcError('execution reverted: name taken', 3)
+
+    env.stub.handlers['eth_estimateGas'] = revert
+    with pytest.raises(builder_module.TransactionRevertError, match='name taken'):
+        env.build()
+    assert env.nonces.pending_count(7001, env.wallet.address) == 0
+
+
+def test_wrong_chain_id_is_rejected(env):
+    env.stub.chain_id = 97
+    with pytest.raises(ValueError, match='链 ID'):
+        env.build()
+
+
+def test_sign_and_send(env):
+    tx = env.build()
+    tx_hash, nonce = env.builder.sign_and_send(tx, env.wallet.sign_transaction)
+    assert nonce == 3 and len(env.node.sent) == 1
+    assert tx_hash == env.chain.w3.to_hex(env.chain.w3.keccak(hexstr=env.node.sent[0]))
+    assert env.nonces.pending_count(7001, env.wallet.address) == 1
+
+
+def test_nonce_error_resyncs_and_retries_once(env):
+    tx = env.build()
+    # 其他设备已用掉 3、4
+    env.node.pending_nonce = 5
+    env.node.send_errors = ['nonce too low: next nonce 5, tx nonce 3']
+    tx_hash, nonce = env.builder.sign_and_send(tx, env.wallet.sign_transaction)
+    assert nonce == 5 and len(env.node.sent) == 1
+    assert env.build('next')['nonce'] == 6
+
+
+def test_second_nonce_error_is_raised_and_nonce_released(env):
+    tx = env.build()
+    env.node.send_errors = ['nonce too low', 'nonce too low']
+    with pytest.raises(Exception, match='nonce too low'):
+        env.builder.sign_and_send(tx, env.wallet.sign_transaction)
+    assert env.node.sent == []
+    assert env.nonces.pending_count(7001, env.wallet.address) == 0
+    assert env.build()['nonce'] == 3
+
+
+def test_already_known_counts_as_sent(env):
+    tx = env.build()
+    env.node.send_errors = ['already known']
+    tx_hash, nonce = env.builder.sign_and_send(tx, env.wallet.sign_transaction)
+    assert nonce == 3 and tx_hash.startswith('0x') and len(tx_hash) == 66
+
+
+def test_sign_failure_releases_nonce(env):
+    tx = env.build()
+    with pytest.raises(ValueError, match='locked'):
+        env.builder.sign_and_send(tx, lambda tx: (False, 'locked'))
+    assert env.build()['nonce'] == 3
+
+
+def test_send_failure_releases_nonce(env):
+    tx = env.build()
+    env.node.send_errors = ['insufficient funds for gas * price + value']
+    with pytest.raises(Exception, match='insufficient funds'):
+        env.builder.sign_and_send(tx, env.wallet.sign_transaction)
+    assert env.build()['nonce'] == 3
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""ResponseCache / SingleFlight / ApiClient GET 缓存"""
+
+import threading
+import time
+
+import pytest
+
+from services import response_cache
+from services.response_cache import ResponseCache
+from services.single_flight import SingleFlight
+
+
+@pytest.fixture
+def cache(monkeypatch, fake_clock):
+    monkeypatch.setattr(response_cache.time, 'monotonic', fake_clock)
+    return ResponseCache({'/api/frogs': 30, '/api/frogs/search': 5, '/api/travels': 0}, default_ttl=10)
+
+
+# ===== ResponseCache =====
+
+def test_ttl_longest_prefix_wins(cache):
+    assert cache.ttl_for('/api/frogs/3') == 30
+    assert cache.ttl_for('/api/frogs/search?q=a') == 5
+    assert cache.ttl_for('/api/badges') == 10
+
+
+def test_make_key_ignores_param_order():
+    assert ResponseCache.make_key('/a', {'x': 1, 'y': 2}) == ResponseCache.make_key('/a', {'y': '2', 'x': '1'})
+    assert ResponseCache.make_key('/a') == ResponseCache.make_key('/a', {})
+
+
+def test_entry_expires_after_ttl(cache, fake_clock):
+    key = ResponseCache.make_key('/api/frogs/3')
+    cache.put(key, {'success': True})
+    fake_clock.advance(29.9)
+    assert cache.get(key).is_fresh
+    fake_clock.advance(0.2)
+    entry = cache.get(key)
+    assert entry is not None and not entry.is_fresh
+    assert not entry.can_revalidate
+
+
+def test_zero_ttl_only_kept_for_revalidation(cache):
+    plain = ResponseCache.make_key('/api/travels/1')
+    tagged = ResponseCache.make_key('/api/travels/2')
+    cache.put(plain, {'success': True})
+    cache.put(tagged, {'success': True}, etag='"v1"')
+    assert cache.get(plain) is None
+    entry = cache.get(tagged)
+    assert not entry.is_fresh
+    assert entry.conditional_headers() == {'If-None-Match': '"v1"'}
+
+
+def test_invalidate_keeps_validators(cache):
+    frog = ResponseCache.make_key('/api/frogs/3')
+    badge = ResponseCache.make_key('/api/badges/3')
+    cache.put(frog, {'success': True}, etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    cache.put(badge, {'success': True})
+
+    cache.invalidate(['/api/frogs'])
+    entry = cache.get(frog)
+    assert not entry.is_fresh
+    assert entry.conditional_headers() == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert cache.get(badge).is_fresh
+
+
+def test_touch_extends_expiry(cache, fake_clock):
+    key = ResponseCache.make_key('/api/frogs/3')
+    cache.put(key, {'success': True}, etag='"v1"')
+    fake_clock.advance(60)
+    assert not cache.get(key).is_fresh
+    cache.touch(key)
+    assert cache.get(key).is_fresh
+    assert cache.touch(ResponseCache.make_key('/api/unknown')) is None
+
+
+def test_clear(cache):
+    key = ResponseCache.make_key('/api/frogs/3')
+    cache.put(key, {'success': True})
+    cache.clear()
+    assert cache.get(key) is None
+
+
+# ===== SingleFlight =====
+
+def _run_concurrently(flight, key, fn, callers):
+    """同时发起多个调用，返回 (结果列表, 异常列表)"""
+    results, errors = [], []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            value = flight.do(key, fn)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        else:
+            with lock:
+                results.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_result():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'data': [1, 2]}
+
+    threads, results, errors = _run_concurrently(flight, 'k', fetch, 5)
+    assert started.wait(5)
+    # 等所有调用都进入等待再放行
+    deadline = time.monotonic() + 5
+    while flight.coalesced < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert errors == []
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    assert (flight.executed, flight.coalesced, flight.in_flight) == (1, 4, 0)
+
+
+def test_error_propagates_to_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ConnectionError('down')
+
+    threads, results, errors = _run_concurrently(flight, 'k', fetch, 4)
+    deadline = time.monotonic() + 5
+    while flight.coalesced < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == []
+    assert len(errors) == 4 and all(isinstance(e, ConnectionError) for e in errors)
+    # 失败不会留下记录，下一次调用重新执行
+    assert flight.in_flight == 0
+    assert flight.do('k', lambda: 'ok') == 'ok'
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert (flight.executed, flight.coalesced) == (2, 0)
+
+
+# ===== ApiClient =====
+
+class _Response:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+class _Session:
+    """按顺序返回预设响应，记录请求头"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs.get('headers', {})))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def client(monkeypatch, fake_clock):
+    from services.api_client import ApiClient
+    monkeypatch.setattr(response_cache.time, 'monotonic', fake_clock)
+    return ApiClient(base_url='http://backend')
+
+
+def test_invalidate_then_304_reuses_cached_body(client):
+    session = client._local.session = _Session([
+        _Response(200, {'success': True, 'data': {'name': 'Frog'}}, {'ETag': '"v1"'}),
+        _Response(304),
+    ])
+    first = client.get('/frogs/3')
+    assert client.get('/frogs/3') is first
+    assert len(session.requests) == 1
+
+    client.invalidate_cache('/frogs')
+    assert client.get('/frogs/3') is first
+    assert session.requests[1][2]['If-None-Match'] == '"v1"'
+    # 304 之后重新计时，下一次直接命中
+    assert client.get('/frogs/3') is first
+    assert len(session.requests) == 2
+
+    stats = client.get_stats()
+    assert (stats['network'], stats['not_modified'], stats['cache_hits']) == (2, 1, 2)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""disconnect_all"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ui.signal_utils import disconnect_all
+
+
+class _Source(QObject):
+    first = pyqtSignal()
+    second = pyqtSignal()
+
+
+class _Sink(QObject):
+    def on_first(self):
+        pass
+
+    def on_second(self):
+        pass
+
+
+def test_already_disconnected_slot_does_not_skip_the_rest():
+    source, sink = _Source(), _Sink()
+    source.second.connect(sink.on_second)
+
+    # first 从未连接，断开会失败；second 仍要断开
+    disconnect_all((source.first, sink.on_first), (source.second, sink.on_second))
+    assert source.receivers(source.second) == 0
+
+    # 重复调用不报错
+    disconnect_all((source.second, sink.on_second))
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""SouvenirIndex 与画廊列表模型的差量更新"""
+
+import random
+
+import pytest
+
+from models import Souvenir, SouvenirIndex
+
+
+def _souvenir(sid, rarity='Common', chain=7001, day=1):
+    return Souvenir({'id': sid, 'name': f's{sid}', 'rarity': rarity, 'chainId': chain,
+                     'createdAt': f'2024-01-{day:02d}T00:00:00Z'})
+
+
+# ===== SouvenirIndex =====
+
+@pytest.fixture
+def index():
+    return SouvenirIndex([
+        _souvenir(1, 'Common', 7001, 1),
+        _souvenir(2, 'Rare', 97, 2),
+        _souvenir(3, 'Legendary', 7001, 3),
+        _souvenir(4, 'Rare', 7001, 4),
+        _souvenir(5, 'Common', 97, 5),
+    ])
+
+
+def _ids(souvenirs):
+    return [s.id for s in souvenirs]
+
+
+def test_index_sorts(index):
+    assert _ids(index.select()) == [5, 4, 3, 2, 1]
+    assert _ids(index.select(sort='oldest')) == [1, 2, 3, 4, 5]
+    assert _ids(index.select(sort='rarity_desc'))[0] == 3
+    assert _ids(index.select(sort='rarity_asc'))[-1] == 3
+
+
+def test_index_filters_match_brute_force(index):
+    for rarity in ('all', 'Common', 'Rare', 'Legendary', 'Epic'):
+        for chain in ('all', 7001, 97, 42161):
+            for sort in SouvenirIndex.SORT_KEYS:
+                expected = [s for s in index.select(sort=sort)
+                            if rarity in ('all', s.rarity) and chain in ('all', s.chain_id)]
+                assert index.select(rarity, chain, sort) == expected
+                assert index.count(rarity, chain) == len(expected)
+
+
+def test_index_results_are_copies(index):
+    first = index.select('Rare')
+    first.clear()
+    assert _ids(index.select('Rare')) == [4, 2]
+    assert _ids(index.select('Rare', exclude_ids=[4])) == [2]
+
+
+def test_empty_index():
+    index = SouvenirIndex()
+    assert index.select() == [] and index.count() == 0 and index.count('Rare', 97) == 0
+
+
+# ===== SouvenirListModel.apply_diff =====
+
+class _Mirror:
+    """只根据模型发出的信号维护一份 id 列表，用于检查信号与数据一致"""
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = self._current()
+        self.signals = []
+        model.rowsInserted.connect(self._inserted)
+        model.rowsRemoved.connect(self._removed)
+        model.rowsMoved.connect(self._moved)
+        model.layoutChanged.connect(self._relayout)
+        model.modelReset.connect(self._relayout)
+
+    def _current(self):
+        return [s.id for s in self.model._souvenirs]
+
+    def _inserted(self, parent, first, last):
+        self.signals.append('insert')
+        self.ids[first:first] = [s.id for s in self.model._souvenirs[first:last + 1]]
+
+    def _removed(self, parent, first, last):
+        self.signals.append('remove')
+        del self.ids[first:last + 1]
+
+    def _moved(self, parent, start, end, destination, row):
+        self.signals.append('move')
+        block = self.ids[start:end + 1]
+        del self.ids[start:end + 1]
+        if row > end:
+            row -= len(block)
+        self.ids[row:row] = block
+
+    def _relayout(self, *args):
+        self.signals.append('layout')
+        self.ids = self._current()
+
+
+@pytest.fixture
+def model(qapp):
+    from PyQt5.QtTest import QAbstractItemModelTester
+    from ui.nft_gallery import SouvenirListModel
+    model = SouvenirListModel()
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+    yield model
+    del tester
+
+
+def _apply(model, ids, pool):
+    mirror = _Mirror(model)
+    model.apply_diff([pool[i] for i in ids])
+    assert [s.id for s in model._souvenirs] == ids
+    assert mirror.ids == ids
+    assert model._rows == {sid: row for row, sid in enumerate(ids)}
+    return mirror.signals
+
+
+@pytest.fixture
+def pool():
+    return {i: _souvenir(i) for i in range(200)}
+
+
+def test_insert_remove_and_move(model, pool):
+    assert _apply(model, [1, 2, 3, 4, 5], pool) == ['insert']
+    assert _apply(model, [0, 1, 2, 9, 3, 4, 5, 6], pool) == ['insert', 'insert', 'insert']
+    assert set(_apply(model, [0, 2, 4, 6], pool)) == {'remove'}
+    assert _apply(model, [6, 0, 2, 4], pool) == ['move']
+    assert _apply(model, [2, 4, 6, 0], pool) == ['move', 'move']
+    assert _apply(model, [], pool) == ['remove']
+
+
+def test_unchanged_rows_keep_identity_and_changed_objects_update(model, pool):
+    _apply(model, [1, 2, 3], pool)
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, *roles: changed.append(top.row()))
+    replacement = _souvenir(2, 'Epic')
+    model.apply_diff([pool[1], replacement, pool[3]])
+    assert changed == [1]
+    assert model._souvenirs[1] is replacement
+
+
+def test_many_moves_fall_back_to_relayout(model, pool):
+    from ui.nft_gallery import DIFF_MOVE_LIMIT
+    ids = list(range(DIFF_MOVE_LIMIT * 3))
+    _apply(model, ids, pool)
+    signals = _apply(model, list(reversed(ids)), pool)
+    assert signals == ['layout']
+
+    # 需要移动的行刚好等于上限时逐个移动，多一行就整体重排
+    ids = list(range(DIFF_MOVE_LIMIT * 3))
+    _apply(model, ids, pool)
+    rotated = ids[DIFF_MOVE_LIMIT:] + ids[:DIFF_MOVE_LIMIT]
+    assert _apply(model, rotated, pool) == ['move'] * DIFF_MOVE_LIMIT
+    _apply(model, ids, pool)
+    rotated = ids[DIFF_MOVE_LIMIT + 1:] + ids[:DIFF_MOVE_LIMIT + 1]
+    assert _apply(model, rotated, pool) == ['layout']
+
+
+def test_random_sequences(model, pool):
+    rng = random.Random(19)
+    current = []
+    for _ in range(300):
+        ids = list(current)
+        for _ in range(rng.randint(0, 6)):
+            op = rng.choice(('insert', 'remove', 'move'))
+            if op == 'insert' or not ids:
+                new = rng.choice([i for i in pool if i not in ids])
+                ids.insert(rng.randint(0, len(ids)), new)
+            elif op == 'remove':
+                ids.pop(rng.randrange(len(ids)))
+            else:
+                ids.insert(rng.randint(0, len(ids) - 1), ids.pop(rng.randrange(len(ids))))
+        if rng.random() < 0.05:
+            rng.shuffle(ids)
+        _apply(model, ids, pool)
+        current = ids
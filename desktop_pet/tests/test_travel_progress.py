@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""TravelProgressCard：本地模拟与服务端推送"""
+
+import time
+
+import pytest
+
+from ui.components.animation_clock import animation_clock
+
+
+@pytest.fixture
+def card(qapp):
+    from ui.components.travel_progress import TravelProgressCard
+    card = TravelProgressCard()
+    yield card
+    card.reset()
+    card.deleteLater()
+
+
+def test_simulates_stages_until_first_event(card):
+    from ui.components.travel_progress import TravelStage
+    card.start_travel(7, 'Sepolia', 100, started_at=time.time() - 40)
+    assert card.travel_id == 7
+    assert card._current_stage == TravelStage.ARRIVING
+    assert animation_clock.is_subscribed(card._simulate_stages)
+
+    card.apply_event('travel:stageUpdate', {'tokenId': 3, 'stage': 'EXPLORING', 'progress': 72})
+    assert card._current_stage == TravelStage.EXPLORING
+    assert card._target_progress == 72
+    assert not animation_clock.is_subscribed(card._simulate_stages)
+    # 倒计时仍然继续
+    assert animation_clock.is_subscribed(card._on_second)
+
+    # 推送之后不再被模拟覆盖
+    card._start_time = time.time() - 90
+    card._simulate_stages()
+    assert card._current_stage == TravelStage.EXPLORING
+
+
+def test_completed_event_stops_timers(card):
+    completed = []
+    card.travel_completed.connect(lambda: completed.append(True))
+    card.start_travel(7, 'Sepolia', 100)
+    card.apply_event('travel:progress', {'frogId': 3, 'phase': 'crossing', 'percentage': 35,
+                                         'message': {'text': '穿越中'}})
+    assert card.tip_label.text() == '穿越中'
+
+    card.apply_event('travel:completed', {'frogId': 3})
+    assert completed == [True]
+    assert not card.is_traveling
+    assert not animation_clock.is_subscribed(card._on_second)
+    assert not animation_clock.is_subscribed(card._simulate_stages)
+
+
+def test_unrelated_events_are_ignored(card):
+    card.start_travel(7, 'Sepolia', 100)
+    card.apply_event('travel:error', {'frogId': 3})
+    assert animation_clock.is_subscribed(card._simulate_stages)
@@ -162,16 +162,16 @@ class BadgeSetDetailDialog(QDialog):
         badges_layout.addWidget(SubtitleLabel('🏅 需要的徽章'))
         
         badge_codes = self.badge_set.get('badge_codes', [])
-        user_badge_codes = set(b.get('code') for b in self.badges if b.get('unlocked'))
+        badges_by_code = {b.code: b for b in self.badges}
         
         for code in badge_codes:
-            has_badge = code in user_badge_codes
-            badge_info = self._get_badge_by_code(code)
+            badge = badges_by_code.get(code)
+            has_badge = badge is not None and badge.unlocked
             
             row = QHBoxLayout()
             status = '✅' if has_badge else '🔒'
-            icon = badge_info.get('icon', '🏆') if has_badge else '❓'
-            name = badge_info.get('name', code) if has_badge else '???'
+            icon = badge.icon if has_badge else '❓'
+            name = (badge.name or code) if has_badge else '???'
             row.addWidget(BodyLabel(f'{status} {icon} {name}'))
             row.addStretch()
             badges_layout.addLayout(row)
@@ -195,15 +195,9 @@ class BadgeSetDetailDialog(QDialog):
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
     
-    def _get_badge_by_code(self, code):
-        for badge in self.badges:
-            if badge.get('code') == code:
-                return badge
-        return {}
-    
     def _check_completed(self):
         badge_codes = self.badge_set.get('badge_codes', [])
-        user_badge_codes = set(b.get('code') for b in self.badges if b.get('unlocked'))
+        user_badge_codes = set(b.code for b in self.badges if b.unlocked)
         return all(code in user_badge_codes for code in badge_codes)
 
 
@@ -260,8 +254,11 @@ class BadgeSetsDialog(QDialog):
         layout.addWidget(close_btn)
     
     def _load_data(self):
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        self.badges = api_client.get_badges(frog_id)
+        api_client.call_async('get_badges', self.frog.api_id,
+                              on_success=self._on_badges_loaded, owner=self)
+    
+    def _on_badges_loaded(self, badges):
+        self.badges = badges
         self._display_sets()
     
     def _display_sets(self):
@@ -270,7 +267,7 @@ class BadgeSetsDialog(QDialog):
             if item.widget():
                 item.widget().deleteLater()
         
-        user_badge_codes = set(b.get('code') for b in self.badges if b.get('unlocked'))
+        user_badge_codes = set(b.code for b in self.badges if b.unlocked)
         completed_count = 0
         
         for badge_set in BADGE_SETS:
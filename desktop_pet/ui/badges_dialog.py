@@ -35,7 +35,7 @@ BADGE_CATEGORIES = {
 class BadgeCard(CardWidget):
     """徽章卡片组件"""
     
-    clicked = pyqtSignal(dict)
+    clicked = pyqtSignal(object)
     
     RARITY_COLORS = {
         1: ('#3D4450', '#6B7280'),
@@ -52,9 +52,9 @@ class BadgeCard(CardWidget):
         self.badge = badge
         self.setCursor(Qt.PointingHandCursor)
         
-        unlocked = badge.get('unlocked', False)
-        rarity = badge.get('rarity', 1)
-        progress = badge.get('progress', 0)
+        unlocked = badge.unlocked
+        rarity = badge.rarity
+        progress = badge.progress
         bg_color, accent_color = self.RARITY_COLORS.get(rarity, self.RARITY_COLORS[1])
         
         if unlocked:
@@ -87,13 +87,13 @@ class BadgeCard(CardWidget):
         layout.setSpacing(6)
         layout.setContentsMargins(10, 12, 10, 12)
         
-        icon = badge.get('icon', '🏆') if unlocked else '🔒'
+        icon = badge.icon if unlocked else '🔒'
         icon_label = BodyLabel(icon)
         icon_label.setFont(QFont('Segoe UI Emoji', 28))
         icon_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon_label)
         
-        name = badge.get('name', '???') if unlocked else '???'
+        name = (badge.name or '???') if unlocked else '???'
         name_label = CaptionLabel(name)
         name_label.setAlignment(Qt.AlignCenter)
         name_label.setWordWrap(True)
@@ -137,7 +137,7 @@ class BadgeDetailDialog(QDialog):
         super().__init__(parent)
         self.badge = badge
         
-        unlocked = badge.get('unlocked', False)
+        unlocked = badge.unlocked
         self.setWindowTitle('🏆 徽章详情' if unlocked else '🔒 未解锁徽章')
         self.setFixedSize(380, 420)
         self.setStyleSheet("QDialog { background-color: #202020; }")
@@ -149,9 +149,9 @@ class BadgeDetailDialog(QDialog):
         layout.setSpacing(16)
         layout.setContentsMargins(24, 24, 24, 24)
         
-        unlocked = self.badge.get('unlocked', False)
-        rarity = self.badge.get('rarity', 1)
-        progress = self.badge.get('progress', 0)
+        unlocked = self.badge.unlocked
+        rarity = self.badge.rarity
+        progress = self.badge.progress
         
         card = CardWidget(self)
         card_layout = QVBoxLayout(card)
@@ -159,24 +159,24 @@ class BadgeDetailDialog(QDialog):
         card_layout.setSpacing(16)
         card_layout.setAlignment(Qt.AlignCenter)
         
-        icon = self.badge.get('icon', '🏆') if unlocked else '🔒'
+        icon = self.badge.icon if unlocked else '🔒'
         icon_label = BodyLabel(icon)
         icon_label.setFont(QFont('Segoe UI Emoji', 48))
         icon_label.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(icon_label)
         
-        name = self.badge.get('name', '神秘徽章')
+        name = self.badge.name or '神秘徽章'
         name_label = SubtitleLabel(name if unlocked else '???')
         name_label.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(name_label)
         
-        desc = self.badge.get('description', '完成特定条件解锁')
+        desc = self.badge.description or '完成特定条件解锁'
         desc_label = BodyLabel(desc if unlocked else '完成特定条件解锁此徽章')
         desc_label.setAlignment(Qt.AlignCenter)
         desc_label.setWordWrap(True)
         card_layout.addWidget(desc_label)
         
-        requirement = self.badge.get('requirement', '')
+        requirement = self.badge.requirement
         if requirement:
             req_label = CaptionLabel(f'📋 条件: {requirement}')
             req_label.setAlignment(Qt.AlignCenter)
@@ -196,9 +196,9 @@ class BadgeDetailDialog(QDialog):
             card_layout.addWidget(progress_label)
         
         if unlocked:
-            unlock_time = self.badge.get('unlockedAt', '')
+            unlock_time = self.badge.unlocked_at
             if unlock_time:
-                time_label = CaptionLabel(f'🕐 解锁时间: {unlock_time[:10]}')
+                time_label = CaptionLabel(f'🕐 解锁时间: {unlock_time:%Y-%m-%d}')
                 time_label.setAlignment(Qt.AlignCenter)
                 time_label.setStyleSheet('color: #10B981;')
                 card_layout.addWidget(time_label)
@@ -285,26 +285,30 @@ class BadgesDialog(QDialog):
         layout.addWidget(close_btn)
     
     def _load_data(self):
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
+        frog_id = self.frog.api_id
         print(f"[BadgesDialog] Loading badges for frog_id: {frog_id}")
-        self.badges = api_client.get_badges(frog_id)
+        api_client.call_async('get_badges', frog_id,
+                              on_success=self._on_badges_loaded, owner=self)
+    
+    def _on_badges_loaded(self, badges):
+        self.badges = badges
         print(f"[BadgesDialog] Received badges count: {len(self.badges)}")
         if self.badges:
             print(f"[BadgesDialog] First badge sample: {self.badges[0]}")
         
         for badge in self.badges:
-            if not badge.get('unlocked'):
-                code = badge.get('code', '')
+            if not badge.unlocked:
+                code = badge.code
                 if 'TRIP' in code:
-                    total_travels = self.frog.get('totalTravels', 0)
+                    total_travels = self.frog.total_travels
                     if 'FIRST' in code:
-                        badge['progress'] = min(100, total_travels * 100)
-                    elif '5' in badge.get('requirement', ''):
-                        badge['progress'] = min(100, total_travels * 20)
+                        badge.progress = min(100, total_travels * 100)
+                    elif '5' in badge.requirement:
+                        badge.progress = min(100, total_travels * 20)
                     else:
-                        badge['progress'] = min(100, int(total_travels / 15 * 100))
+                        badge.progress = min(100, int(total_travels / 15 * 100))
                 else:
-                    badge['progress'] = 0
+                    badge.progress = 0
         
         self._update_display()
     
@@ -322,14 +326,14 @@ class BadgesDialog(QDialog):
         filtered = self.badges
         
         if self.filter == 'unlocked':
-            filtered = [b for b in filtered if b.get('unlocked')]
+            filtered = [b for b in filtered if b.unlocked]
         elif self.filter == 'locked':
-            filtered = [b for b in filtered if not b.get('unlocked')]
+            filtered = [b for b in filtered if not b.unlocked]
         
         if self.category_filter:
-            filtered = [b for b in filtered if b.get('category') == self.category_filter]
+            filtered = [b for b in filtered if b.category == self.category_filter]
         
-        unlocked_count = len([b for b in self.badges if b.get('unlocked')])
+        unlocked_count = len([b for b in self.badges if b.unlocked])
         total = len(self.badges)
         progress_pct = int(unlocked_count / total * 100) if total > 0 else 0
         
@@ -342,7 +346,7 @@ class BadgesDialog(QDialog):
             card.clicked.connect(self._show_detail)
             self.grid_layout.addWidget(card, i // cols, i % cols)
             card.show()
-            print(f"[BadgesDialog] Added card: {badge.get('name')}")
+            print(f"[BadgesDialog] Added card: {badge.name}")
             
         if not filtered:
             empty_label = CaptionLabel('暂无徽章')
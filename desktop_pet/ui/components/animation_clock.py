@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+动画时钟 - 所有动画组件共用的帧调度器
+
+组件用 subscribe(callback, interval) 注册，时钟用一个单次 QTimer
+按帧率上限（ANIMATION_FPS，随性能配置调整）对齐调度：同一时刻到期的回调合并到同一次唤醒，
+没有订阅者时完全停止，只有低频订阅者时按最近的到期时间休眠。
+锁屏、全屏应用、长时间空闲时可整体挂起（suspend），恢复时不补帧。
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QTimer
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from config import ANIMATION_FPS
+from services.performance_profile import profile_manager
+
+
+class AnimationClock(QObject):
+    """
+    全局帧调度器
+
+    回调不带参数；需要按真实时间推进的组件自行读取 time.monotonic()。
+    回调所属的 Qt 对象被销毁后会自动移除。
+    """
+
+    def __init__(self, fps: int = ANIMATION_FPS):
+        super().__init__()
+        self.frame_interval = 1000.0 / max(1, min(fps, profile_manager.get('animation_fps')))  # ms
+        profile_manager.profile_changed.connect(self._on_profile_changed)
+        # callback -> [请求的间隔(ms), 下次到期(ms)]
+        self._subs: Dict[Callable, List[float]] = {}
+        # 挂起原因（如 'session'），非空时定时器停止
+        self._suspended: Set[str] = set()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+        # 帧统计
+        self._frames = 0
+        self._work_ema = 0.0
+        self._work_max = 0.0
+        self._interval_ema = 0.0
+        self._last_tick: Optional[float] = None
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic() * 1000.0
+
+    # ===== 订阅 =====
+
+    def subscribe(self, callback: Callable, interval: Optional[float] = None):
+        """
+        注册回调（重复注册只更新间隔）
+
+        Args:
+            callback: 每帧调用的函数
+            interval: 调用间隔（ms），默认每帧；不会快于当前帧率上限
+        """
+        interval = interval or 0
+        entry = self._subs.get(callback)
+        if entry is not None:
+            entry[0] = interval
+            return
+        self._subs[callback] = [interval, self._now() + max(self.frame_interval, interval)]
+        self._schedule()
+
+    def unsubscribe(self, callback: Callable):
+        if self._subs.pop(callback, None) is not None and not self._subs:
+            self._stop_timer()
+
+    def is_subscribed(self, callback: Callable) -> bool:
+        return callback in self._subs
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    @property
+    def is_suspended(self) -> bool:
+        return bool(self._suspended)
+
+    def suspend(self, reason: str):
+        """按原因挂起（多个原因都解除后才恢复）"""
+        if reason in self._suspended:
+            return
+        self._suspended.add(reason)
+        self._stop_timer()
+
+    def resume(self, reason: str):
+        if reason not in self._suspended:
+            return
+        self._suspended.discard(reason)
+        if self._suspended:
+            return
+        # 挂起期间错过的帧直接跳过，从现在重新排期
+        now = self._now()
+        for entry in self._subs.values():
+            entry[1] = now + max(self.frame_interval, entry[0])
+        self._schedule()
+    
+    def set_fps(self, fps: int):
+        """调整帧率上限（性能配置切换时），立即生效"""
+        self.frame_interval = 1000.0 / max(1, fps)
+        self._schedule()
+    
+    def _on_profile_changed(self, name, profile):
+        self.set_fps(profile['animation_fps'])
+
+    # ===== 调度 =====
+
+    def _schedule(self):
+        """按最近的到期时间启动单次定时器"""
+        if not self._subs or self._suspended:
+            self._stop_timer()
+            return
+        delay = min(entry[1] for entry in self._subs.values()) - self._now()
+        self._timer.start(max(0, int(delay)))
+
+    def _stop_timer(self):
+        # 退出时控件的 hideEvent 可能晚于时钟的定时器被销毁
+        if not sip.isdeleted(self._timer):
+            self._timer.stop()
+        self._last_tick = None
+
+    def _tick(self):
+        start = self._now()
+        # 半帧以内到期的回调一并执行，保持对齐
+        horizon = start + self.frame_interval / 2
+
+        for callback, entry in list(self._subs.items()):
+            if entry[1] > horizon or callback not in self._subs:
+                continue
+            interval = max(self.frame_interval, entry[0])
+            entry[1] += interval
+            if entry[1] < start:
+                # 落后太多（如系统休眠）时丢弃积压的帧
+                entry[1] = start + interval
+            try:
+                callback()
+            except RuntimeError:
+                # 所属的 Qt 对象已销毁
+                self._subs.pop(callback, None)
+
+        end = self._now()
+        work = end - start
+        self._frames += 1
+        self._work_max = max(self._work_max, work)
+        self._work_ema = work if self._frames == 1 else self._work_ema * 0.9 + work * 0.1
+        if self._last_tick is not None:
+            gap = start - self._last_tick
+            self._interval_ema = gap if not self._interval_ema else self._interval_ema * 0.9 + gap * 0.1
+        self._last_tick = start
+
+        self._schedule()
+
+    # ===== 统计 =====
+
+    def get_stats(self) -> Dict[str, float]:
+        """帧统计：回调耗时与实际唤醒间隔（ms）"""
+        return {
+            'target_fps': round(1000.0 / self.frame_interval, 1),
+            'subscribers': len(self._subs),
+            'running': self.is_running,
+            'suspended': sorted(self._suspended),
+            'frames': self._frames,
+            'avg_frame_ms': round(self._work_ema, 3),
+            'max_frame_ms': round(self._work_max, 3),
+            'avg_interval_ms': round(self._interval_ema, 2),
+        }
+
+
+# 全局实例
+animation_clock = AnimationClock()
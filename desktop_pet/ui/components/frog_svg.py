@@ -4,23 +4,46 @@ FrogSvg 组件 - 直接使用 QSvgRenderer 渲染原始 Frog.svg
 """
 
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QTimer, QRectF, QByteArray
-from PyQt5.QtGui import QPainter, QColor, QTransform
+from PyQt5.QtCore import Qt, QTimer, QRectF, QByteArray, QEvent
+from PyQt5.QtGui import QPainter, QColor, QTransform, QPixmap
 from PyQt5.QtSvg import QSvgRenderer
+from collections import OrderedDict
 import os
+import re
 import sys
 import math
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from config import FrogState, STATE_COLORS
+from ui.components.animation_clock import animation_clock
+
+
+SVG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'frog.svg')
+
+# 原始 SVG 中的配色（身体渐变三色 + 腮红）
+SOURCE_COLORS = ('#4ADE80', '#FCD34D', '#FDBA74', '#FDA4AF')
+_SOURCE_COLOR_RE = re.compile('|'.join(re.escape(c) for c in SOURCE_COLORS))
 
 
 class FrogSvgWidget(QWidget):
     """
     青蛙 SVG 渲染组件
     直接使用 QSvgRenderer 渲染原始 SVG 文件
+    
+    每一帧（状态、朝向、缩放比、呼吸档位、配件）只光栅化一次并缓存，
+    之后的重绘只是贴图；呼吸档位不变时不重绘。
     """
     
+    # 各配色的渲染器在所有实例间共享：SVG 只读一次，每种配色只解析一次
+    _svg_template = None
+    _renderers = {}
+    _prewarm_queue = None
+    
+    BREATH_SPEED = 1.0       # 呼吸相位速度（弧度/秒）
+    BREATH_LEVELS = 12       # 呼吸幅度量化档位（单侧），约 0.25px 一档
+    FRAME_CACHE_LIMIT = 64   # 每个控件最多缓存的帧数
+    
     def __init__(self, parent=None, size=200):
         super().__init__(parent)
         self._size = size
@@ -35,46 +58,60 @@ class FrogSvgWidget(QWidget):
         
         # 动画参数
         self._breath_phase = 0.0
+        self._breath_epoch = time.monotonic()
+        self._breath_level = 0
         self._scale_y = 1.0
         self._offset_y = 0.0
         
-        # 加载原始 SVG
-        svg_path = os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'frog.svg')
-        self._svg_content = None
-        self._svg_renderer = None
+        # 帧缓存：key -> QPixmap
+        self._frames = OrderedDict()
         
-        if os.path.exists(svg_path):
-            with open(svg_path, 'r', encoding='utf-8') as f:
-                self._svg_content = f.read()
-            self._update_svg_renderer()
+        # 当前状态的渲染器（共享缓存）
+        self._svg_renderer = self._renderer_for(self._state)
+        self._schedule_prewarm()
         
-        # 呼吸动画定时器
-        self._breath_timer = QTimer(self)
-        self._breath_timer.timeout.connect(self._update_breath)
-        self._breath_timer.start(50)  # 20 FPS
+        # 呼吸动画（20 FPS，由全局动画时钟驱动；不可见时不订阅）
+        self._watched_window = None
+    
+    @classmethod
+    def _load_template(cls):
+        if cls._svg_template is None:
+            cls._svg_template = ''
+            if os.path.exists(SVG_PATH):
+                with open(SVG_PATH, 'r', encoding='utf-8') as f:
+                    cls._svg_template = f.read()
+        return cls._svg_template
     
-    def _update_svg_renderer(self):
-        """根据当前状态更新 SVG 渲染器"""
-        if not self._svg_content:
+    @classmethod
+    def _renderer_for(cls, state):
+        """取某状态的渲染器，首次使用时按配色替换并解析 SVG"""
+        colors = STATE_COLORS.get(state, STATE_COLORS[FrogState.IDLE])
+        palette = (*colors['body'], colors['cheek'])
+        renderer = cls._renderers.get(palette)
+        if renderer is None:
+            template = cls._load_template()
+            if not template:
+                return None
+            # 一次扫描替换所有颜色
+            mapping = dict(zip(SOURCE_COLORS, palette))
+            svg = _SOURCE_COLOR_RE.sub(lambda m: mapping[m.group(0)], template)
+            renderer = QSvgRenderer(QByteArray(svg.encode('utf-8')))
+            cls._renderers[palette] = renderer
+        return renderer
+    
+    @classmethod
+    def _schedule_prewarm(cls):
+        """空闲时逐个预解析其余状态，每次事件循环只做一个"""
+        if cls._prewarm_queue is not None:
             return
-        
-        # 获取状态颜色
-        colors = STATE_COLORS.get(self._state, STATE_COLORS[FrogState.IDLE])
-        body_colors = colors['body']
-        cheek_color = colors['cheek']
-        
-        # 替换 SVG 中的颜色
-        svg = self._svg_content
-        
-        # 替换渐变颜色
-        svg = svg.replace('#4ADE80', body_colors[0])
-        svg = svg.replace('#FCD34D', body_colors[1])
-        svg = svg.replace('#FDBA74', body_colors[2])
-        svg = svg.replace('#FDA4AF', cheek_color)
-        
-        # 创建渲染器
-        svg_bytes = QByteArray(svg.encode('utf-8'))
-        self._svg_renderer = QSvgRenderer(svg_bytes)
+        cls._prewarm_queue = list(STATE_COLORS)
+        QTimer.singleShot(0, cls._prewarm_next)
+    
+    @classmethod
+    def _prewarm_next(cls):
+        if cls._prewarm_queue:
+            cls._renderer_for(cls._prewarm_queue.pop(0))
+            QTimer.singleShot(0, cls._prewarm_next)
     
     @property
     def state(self):
@@ -84,7 +121,7 @@ class FrogSvgWidget(QWidget):
     def state(self, value):
         if self._state != value:
             self._state = value
-            self._update_svg_renderer()
+            self._svg_renderer = self._renderer_for(value)
             self.update()
     
     @property
@@ -93,32 +130,109 @@ class FrogSvgWidget(QWidget):
     
     @direction.setter
     def direction(self, value):
-        self._direction = value
-        self.update()
+        if self._direction != value:
+            self._direction = value
+            self.update()
     
     def set_traveling(self, traveling: bool):
-        self._show_backpack = traveling
-        self.update()
+        if self._show_backpack != traveling:
+            self._show_backpack = traveling
+            self.update()
     
     def set_souvenir(self, show: bool, emoji: str = '🎁'):
-        self._show_souvenir = show
-        self._souvenir_emoji = emoji
-        self.update()
+        if (self._show_souvenir, self._souvenir_emoji) != (show, emoji):
+            self._show_souvenir = show
+            self._souvenir_emoji = emoji
+            self.update()
+    
+    # ===== 可见性 =====
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 监听所在窗口的最小化
+        window = self.window()
+        if window is not self._watched_window:
+            if self._watched_window is not None:
+                self._watched_window.removeEventFilter(self)
+            if window is not self:
+                window.installEventFilter(self)
+            self._watched_window = window
+        self._update_ticking()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_ticking()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._update_ticking()
+    
+    def eventFilter(self, obj, event):
+        if obj is self._watched_window and event.type() in (
+                QEvent.WindowStateChange, QEvent.Show, QEvent.Hide):
+            self._update_ticking()
+        return super().eventFilter(obj, event)
+    
+    def _update_ticking(self):
+        """可见且未最小化时才驱动呼吸动画"""
+        if self.isVisible() and not self.window().isMinimized():
+            if not animation_clock.is_subscribed(self._update_breath):
+                animation_clock.subscribe(self._update_breath, 50)
+                self._update_breath()
+        else:
+            animation_clock.unsubscribe(self._update_breath)
     
     def _update_breath(self):
-        """更新呼吸动画"""
-        self._breath_phase += 0.05
+        """更新呼吸动画（只有量化档位变化时才重绘）"""
+        # 相位按真实时间计算，暂停后恢复时不会跳变或停在旧相位
+        self._breath_phase = (time.monotonic() - self._breath_epoch) * self.BREATH_SPEED
         # 模拟 CSS: scale(1.03, 0.97) translateY(3px)
-        t = math.sin(self._breath_phase)
+        level = round(math.sin(self._breath_phase) * self.BREATH_LEVELS)
+        if level == self._breath_level:
+            return
+        self._breath_level = level
+        t = level / self.BREATH_LEVELS
         self._scale_y = 1.0 - 0.03 * t
         self._offset_y = 3 * t
         self.update()
     
+    def _frame_key(self, dpr):
+        return (self._state, self._direction, dpr, self._breath_level,
+                self._show_backpack, self._show_souvenir and self._souvenir_emoji)
+    
+    def _frame(self):
+        """取当前帧，未缓存时光栅化一次"""
+        dpr = self.devicePixelRatioF()
+        key = self._frame_key(dpr)
+        pixmap = self._frames.get(key)
+        if pixmap is not None:
+            self._frames.move_to_end(key)
+            return pixmap
+        
+        side = int(math.ceil(self._size * dpr))
+        pixmap = QPixmap(side, side)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        self._render_frame(painter)
+        painter.end()
+        
+        self._frames[key] = pixmap
+        if len(self._frames) > self.FRAME_CACHE_LIMIT:
+            self._frames.popitem(last=False)
+        return pixmap
+    
     def paintEvent(self, event):
         if not self._svg_renderer or not self._svg_renderer.isValid():
             return
         
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._frame())
+        painter.end()
+    
+    def _render_frame(self, painter):
+        """完整绘制一帧（SVG + 状态特效 + 配件）"""
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
         
@@ -143,8 +257,6 @@ class FrogSvgWidget(QWidget):
         
         # 绘制配件
         self._draw_accessories(painter)
-        
-        painter.end()
     
     def _draw_state_effects(self, painter):
         """绘制状态特效"""
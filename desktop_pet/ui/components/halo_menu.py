@@ -1,60 +1,17 @@
 # -*- coding: utf-8 -*-
 from PyQt5.QtWidgets import QWidget, QPushButton, QGraphicsDropShadowEffect
-from PyQt5.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, pyqtSignal, QSize, QTimer
-from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QPainterPath
+from PyQt5.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, pyqtSignal, QSize
+from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont
 from qfluentwidgets import FluentIcon as FIF
 
 import math
-import random
+import time
 
-class Particle:
-    """简单的粒子类"""
-    def __init__(self, x, y, dx, dy, color, life=255, size=4, shape='circle'):
-        self.x = x
-        self.y = y
-        self.dx = dx
-        self.dy = dy
-        self.color = color
-        self.life = life
-        self.max_life = life
-        self.size = size
-        self.shape = shape # 'circle', 'square', 'heart'
-        
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.life -= 5
-        self.size *= 0.95 # 慢慢变小
-        
-    def draw(self, painter):
-        if self.life <= 0: return
-        
-        painter.save()
-        
-        # 设置颜色和透明度
-        c = QColor(self.color)
-        c.setAlpha(min(255, max(0, int(self.life))))
-        painter.setBrush(QBrush(c))
-        painter.setPen(Qt.NoPen)
-        
-        if self.shape == 'circle':
-            painter.drawEllipse(QPoint(int(self.x), int(self.y)), int(self.size), int(self.size))
-        elif self.shape == 'square':
-            painter.translate(self.x, self.y)
-            painter.rotate(random.randint(0, 360)) # 随机旋转增加动感
-            s = int(self.size * 2)
-            painter.drawRect(-s//2, -s//2, s, s)
-        elif self.shape == 'heart':
-            # 简单的爱心绘制
-            painter.translate(self.x, self.y)
-            path = QPainterPath()
-            s = self.size
-            path.moveTo(0, s/3)
-            path.cubicTo(-s, -s/2, -s/2, -s*1.5, 0, -s/2)
-            path.cubicTo(s/2, -s*1.5, s, -s/2, 0, s/3)
-            painter.drawPath(path)
-            
-        painter.restore()
+import numpy as np
+
+from ui.components.particle_engine import ParticleEngine
+from ui.components.animation_clock import animation_clock
+from services.performance_profile import profile_manager
 
 class HaloButton(QPushButton):
     """圆形发光按钮"""
@@ -144,8 +101,9 @@ class HaloMenu(QWidget):
         self.is_expanded = False
         
         # 粒子系统
-        self.particles = []
+        self.particles = ParticleEngine()
         self.is_playing_effect = False
+        self._last_frame = None
         
         # 按钮配置
         self.buttons = []
@@ -198,22 +156,18 @@ class HaloMenu(QWidget):
                     painter.drawLine(center, btn_center)
         
         # 2. 绘制粒子
-        if self.particles:
-            for p in self.particles:
-                p.draw(painter)
+        self.particles.draw(painter)
                 
     def update(self):
-        """主循环：更新粒子和动画"""
+        """主循环：更新粒子和动画（由动画时钟驱动）"""
+        # 按实际经过的时间推进粒子（以 60FPS 为一帧）
+        now = time.monotonic()
+        frames = 1.0 if self._last_frame is None else min(4.0, (now - self._last_frame) * 60)
+        self._last_frame = now
+        
         # 更新粒子
         if self.particles:
-            dead_particles = []
-            for p in self.particles:
-                p.update()
-                if p.life <= 0:
-                    dead_particles.append(p)
-            
-            for dp in dead_particles:
-                self.particles.remove(dp)
+            self.particles.step(frames)
                 
             if not self.particles and self.is_playing_effect:
                 self.is_playing_effect = False
@@ -223,6 +177,19 @@ class HaloMenu(QWidget):
             
         elif self.anim_group.state() == QParallelAnimationGroup.Running:
              super().update()
+        
+        else:
+            # 没有需要动的东西：补画最后一帧后停止订阅
+            super().update()
+            self._stop_ticking()
+    
+    def _start_ticking(self):
+        if not animation_clock.is_subscribed(self.update):
+            self._last_frame = None
+            animation_clock.subscribe(self.update)
+    
+    def _stop_ticking(self):
+        animation_clock.unsubscribe(self.update)
              
     def play_effect(self, effect_type, color='#FFFFFF'):
         """播放指定特效"""
@@ -231,50 +198,59 @@ class HaloMenu(QWidget):
         
         cx, cy = 150, 150  # 中心点
         
+        rng = np.random.default_rng()
+        # 粒子数量随性能配置缩放（省电模式为 0）
+        scale = profile_manager.get('particle_scale')
+        count = lambda base: int(round(base * scale))
+        
         if effect_type == 'PORTAL': # 传送门：螺旋向外
-            for i in range(50):
-                angle = random.uniform(0, 6.28)
-                speed = random.uniform(2, 5)
-                # 蓝色系
-                c = QColor('#3B82F6') if random.random() > 0.5 else QColor('#60A5FA')
-                dx = math.cos(angle) * speed
-                dy = math.sin(angle) * speed
-                self.particles.append(Particle(cx, cy, dx, dy, c, size=random.randint(3, 6)))
+            n = count(50)
+            angle = rng.uniform(0, 6.28, n)
+            speed = rng.uniform(2, 5, n)
+            size = rng.integers(3, 7, n)
+            # 蓝色系
+            blue = rng.random(n) > 0.5
+            for color, mask in (('#3B82F6', blue), ('#60A5FA', ~blue)):
+                self.particles.emit(cx, cy, np.cos(angle[mask]) * speed[mask],
+                                    np.sin(angle[mask]) * speed[mask], color, size=size[mask])
                 
         elif effect_type == 'CONFETTI': # 彩纸：四周炸开
             colors = ['#FFD700', '#FF69B4', '#00BFFF', '#32CD32']
-            for i in range(60):
-                angle = random.uniform(0, 6.28)
-                speed = random.uniform(3, 8)
-                c = QColor(random.choice(colors))
-                dx = math.cos(angle) * speed
-                dy = math.sin(angle) * speed
-                self.particles.append(Particle(cx, cy, dx, dy, c, shape='square', size=random.randint(4, 8)))
+            n = count(60)
+            angle = rng.uniform(0, 6.28, n)
+            speed = rng.uniform(3, 8, n)
+            size = rng.integers(4, 9, n)
+            spin = rng.uniform(-15, 15, n)  # 翻转增加动感
+            which = rng.integers(0, len(colors), n)
+            for i, color in enumerate(colors):
+                mask = which == i
+                self.particles.emit(cx, cy, np.cos(angle[mask]) * speed[mask],
+                                    np.sin(angle[mask]) * speed[mask], color,
+                                    size=size[mask], shape='square', spin=spin[mask])
                 
         elif effect_type == 'HEARTS': # 爱心：向上飘动
-            for i in range(20):
-                x = cx + random.uniform(-40, 40)
-                y = cy + random.uniform(-10, 30)
-                speed = random.uniform(1, 4)
-                c = QColor('#EF4444')
-                self.particles.append(Particle(x, y, 0, -speed, c, shape='heart', size=random.randint(10, 20)))
+            n = count(20)
+            x = cx + rng.uniform(-40, 40, n)
+            y = cy + rng.uniform(-10, 30, n)
+            speed = rng.uniform(1, 4, n)
+            self.particles.emit(x, y, 0, -speed, '#EF4444', shape='heart',
+                                size=rng.integers(10, 21, n))
         
         elif effect_type == 'GOLD_RAIN': # 金币雨/星光
-            for i in range(40):
-                angle = random.uniform(0, 6.28)
-                dist = random.uniform(30, 80)
-                x = cx + math.cos(angle) * dist
-                y = cy + math.sin(angle) * dist
-                c = QColor('#F59E0B')
-                self.particles.append(Particle(x, y, 0, 1, c, size=random.randint(2, 5)))
+            n = count(40)
+            angle = rng.uniform(0, 6.28, n)
+            dist = rng.uniform(30, 80, n)
+            self.particles.emit(cx + np.cos(angle) * dist, cy + np.sin(angle) * dist,
+                                0, 1, '#F59E0B', size=rng.integers(2, 6, n))
 
-        # 确保定时器运行
-        if hasattr(self, 'update_timer') and not self.update_timer.isActive():
-            self.update_timer.start(16)
-        elif not hasattr(self, 'update_timer'):
-             self.update_timer = QTimer(self)
-             self.update_timer.timeout.connect(self.update)
-             self.update_timer.start(16)
+        if not self.particles:
+            # 粒子已关闭：直接视为播放完毕
+            self.is_playing_effect = False
+            self.effect_finished.emit()
+            return
+        
+        # 确保时钟在驱动
+        self._start_ticking()
     
     def expand(self):
         """展开菜单"""
@@ -299,13 +275,9 @@ class HaloMenu(QWidget):
             
             self.anim_group.addAnimation(anim)
             
-        # 这里的动画只负责移动按钮，PaintEvent 会自动跟随（如果需要高频重绘可能需要 Timer）
-        # 为了连线动画流畅，我们添加一个 Timer 触发 update
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update)
-        self.update_timer.start(16) # 60FPS
-        
+        # 这里的动画只负责移动按钮，连线需要跟着重绘
         self.anim_group.start()
+        self._start_ticking()
         
     def collapse(self):
         """收起菜单"""
@@ -324,12 +296,12 @@ class HaloMenu(QWidget):
             
         self.anim_group.finished.connect(self._on_collapse_finished)
         self.anim_group.start()
+        self._start_ticking()
         
     def _on_collapse_finished(self):
         for btn in self.buttons:
             btn.hide()
-        if hasattr(self, 'update_timer'):
-            self.update_timer.stop()
+        self._stop_ticking()
         self.hide() # 隐藏整个窗口
         self.anim_group.finished.disconnect(self._on_collapse_finished)
 
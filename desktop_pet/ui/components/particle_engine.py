@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+粒子引擎 - 结构化数组（NumPy）+ 对象池 + 批量绘制
+
+所有粒子的位置、速度、寿命、尺寸存放在预分配的数组里，
+每帧一次向量运算完成更新和淘汰；绘制时把所有粒子写进一个
+PixmapFragment 数组，用 drawPixmapFragments 一次画完。
+"""
+
+import numpy as np
+
+from PyQt5 import sip
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QPixmap, QColor, QPainterPath
+
+
+# 形状编号
+SHAPE_CIRCLE = 0
+SHAPE_SQUARE = 1
+SHAPE_HEART = 2
+SHAPES = {'circle': SHAPE_CIRCLE, 'square': SHAPE_SQUARE, 'heart': SHAPE_HEART}
+
+# PixmapFragment 的字段顺序（x, y, sourceLeft, sourceTop, width, height,
+# scaleX, scaleY, rotation, opacity），均为 qreal
+_FRAGMENT_FIELDS = 10
+
+
+class ParticleEngine:
+    """
+    粒子系统
+
+    - emit: 批量发射粒子（参数可为标量或数组）
+    - step: 推进一帧（位移、衰减、缩小、旋转，并压缩掉死亡粒子）
+    - draw: 批量绘制
+    """
+
+    SPRITE_SIZE = 32     # 精灵边长（像素），绘制时按粒子尺寸缩放
+    LIFE_DECAY = 5.0     # 每帧寿命衰减（寿命即透明度 0~255）
+    SHRINK = 0.95        # 每帧尺寸缩放
+
+    def __init__(self, capacity: int = 1024):
+        self._count = 0
+        self._alloc(capacity)
+
+        # 精灵图集：每种 (颜色, 形状) 一格
+        self._sprites = {}
+        self._atlas = None
+
+    # ===== 对象池 =====
+
+    def _alloc(self, capacity: int):
+        """分配（或扩容）数组，保留现有粒子"""
+        old = getattr(self, '_pos', None)
+        n = self._count
+
+        pos = np.zeros((capacity, 2))
+        vel = np.zeros((capacity, 2))
+        life = np.zeros(capacity)
+        size = np.zeros(capacity)
+        angle = np.zeros(capacity)
+        spin = np.zeros(capacity)
+        sprite = np.zeros(capacity, dtype=np.int32)
+        if old is not None and n:
+            pos[:n], vel[:n] = self._pos[:n], self._vel[:n]
+            life[:n], size[:n] = self._life[:n], self._size[:n]
+            angle[:n], spin[:n] = self._angle[:n], self._spin[:n]
+            sprite[:n] = self._sprite[:n]
+
+        self._pos, self._vel, self._life, self._size = pos, vel, life, size
+        self._angle, self._spin, self._sprite = angle, spin, sprite
+        self.capacity = capacity
+
+        # 绘制用的 PixmapFragment 数组，直接通过缓冲区写入
+        self._fragments = sip.array(QPainter.PixmapFragment, capacity)
+        view = memoryview(self._fragments)
+        if view.nbytes == capacity * _FRAGMENT_FIELDS * 8:
+            self._frag_view = np.frombuffer(view, dtype=np.float64).reshape(capacity, _FRAGMENT_FIELDS)
+        elif view.nbytes == capacity * _FRAGMENT_FIELDS * 4:
+            # qreal 为 float 的平台（部分 ARM 构建）
+            self._frag_view = np.frombuffer(view, dtype=np.float32).reshape(capacity, _FRAGMENT_FIELDS)
+        else:
+            self._frag_view = None
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def clear(self):
+        self._count = 0
+
+    def emit(self, x, y, dx, dy, color, size=4, shape='circle', life=255, spin=0.0):
+        """
+        发射一批粒子
+
+        Args:
+            x, y, dx, dy, size, life, spin: 标量或等长数组（spin 为每帧旋转角度）
+            color: 颜色（字符串 / QColor），整批相同
+            shape: 'circle' / 'square' / 'heart'
+        """
+        x, y, dx, dy, size, life, spin = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (x, y, dx, dy, size, life, spin)))
+        k = x.size
+        if k == 0:
+            return
+
+        need = self._count + k
+        if need > self.capacity:
+            capacity = self.capacity
+            while capacity < need:
+                capacity *= 2
+            self._alloc(capacity)
+
+        s = slice(self._count, need)
+        self._pos[s, 0] = x.ravel()
+        self._pos[s, 1] = y.ravel()
+        self._vel[s, 0] = dx.ravel()
+        self._vel[s, 1] = dy.ravel()
+        self._size[s] = size.ravel()
+        self._life[s] = life.ravel()
+        self._spin[s] = spin.ravel()
+        self._angle[s] = np.random.uniform(0, 360, k) if spin.any() else 0.0
+        self._sprite[s] = self._sprite_index(QColor(color), SHAPES.get(shape, SHAPE_CIRCLE))
+        self._count = need
+
+    # ===== 更新 =====
+
+    def step(self, frames: float = 1.0):
+        """
+        推进一帧
+
+        Args:
+            frames: 推进的帧数（按 60FPS 计），帧率不同时保持相同的动画速度
+        """
+        n = self._count
+        if not n:
+            return
+
+        self._pos[:n] += self._vel[:n] * frames
+        self._life[:n] -= self.LIFE_DECAY * frames
+        self._size[:n] *= self.SHRINK ** frames
+        self._angle[:n] += self._spin[:n] * frames
+
+        alive = self._life[:n] > 0
+        if alive.all():
+            return
+        # 把存活粒子压缩到数组前部（顺序不变）
+        k = int(np.count_nonzero(alive))
+        for arr in (self._pos, self._vel, self._life, self._size,
+                    self._angle, self._spin, self._sprite):
+            arr[:k] = arr[:n][alive]
+        self._count = k
+
+    # ===== 绘制 =====
+
+    def _sprite_index(self, color: QColor, shape: int) -> int:
+        key = (color.rgba(), shape)
+        index = self._sprites.get(key)
+        if index is None:
+            index = self._sprites[key] = len(self._sprites)
+            self._atlas = None  # 新精灵，下次绘制前重建图集
+        return index
+
+    def _build_atlas(self):
+        """把所有精灵画到一张横向图集上"""
+        s = self.SPRITE_SIZE
+        atlas = QPixmap(s * max(1, len(self._sprites)), s)
+        atlas.fill(Qt.transparent)
+
+        painter = QPainter(atlas)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        for (rgba, shape), index in self._sprites.items():
+            painter.save()
+            painter.translate(index * s + s / 2, s / 2)
+            painter.setBrush(QColor.fromRgba(rgba))
+            r = s / 2 - 1
+            if shape == SHAPE_SQUARE:
+                painter.drawRect(QRectF(-r, -r, 2 * r, 2 * r))
+            elif shape == SHAPE_HEART:
+                # 与原先的爱心路径一致，整体下移使其居中
+                painter.translate(0, r * 0.55)
+                path = QPainterPath()
+                path.moveTo(0, r / 3)
+                path.cubicTo(-r, -r / 2, -r / 2, -r * 1.5, 0, -r / 2)
+                path.cubicTo(r / 2, -r * 1.5, r, -r / 2, 0, r / 3)
+                painter.drawPath(path)
+            else:
+                painter.drawEllipse(QPointF(0, 0), r, r)
+            painter.restore()
+        painter.end()
+        self._atlas = atlas
+
+    def draw(self, painter: QPainter):
+        """一次调用画出全部粒子"""
+        n = self._count
+        if not n:
+            return
+        if self._atlas is None:
+            self._build_atlas()
+
+        s = self.SPRITE_SIZE
+        # 精灵半径 s/2 对应粒子尺寸 size（原实现中圆的半径、方块的半边长）
+        scale = self._size[:n] * 2.0 / s
+        opacity = np.clip(self._life[:n], 0, 255) / 255.0
+
+        frag = self._frag_view
+        if frag is not None:
+            frag[:n, 0:2] = self._pos[:n]
+            frag[:n, 2] = self._sprite[:n] * s
+            frag[:n, 3] = 0
+            frag[:n, 4:6] = s
+            frag[:n, 6] = scale
+            frag[:n, 7] = scale
+            frag[:n, 8] = self._angle[:n]
+            frag[:n, 9] = opacity
+        else:
+            for i in range(n):
+                f = self._fragments[i]
+                f.x, f.y = self._pos[i]
+                f.sourceLeft, f.sourceTop = float(self._sprite[i] * s), 0.0
+                f.width = f.height = float(s)
+                f.scaleX = f.scaleY = float(scale[i])
+                f.rotation = float(self._angle[i])
+                f.opacity = float(opacity[i])
+
+        painter.drawPixmapFragments(self._fragments[0:n], self._atlas)
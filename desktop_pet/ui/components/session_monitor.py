@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+会话状态监测 - 锁屏、全屏应用、长时间无操作时暂停动画
+
+Windows 上通过 SHQueryUserNotificationState 判断锁屏 / 全屏 / 演示模式，
+通过 GetLastInputInfo 判断用户空闲时长；其他平台视为始终活跃。
+"""
+
+import sys
+import os
+import ctypes
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from config import ANIMATION_IDLE_TIMEOUT, SESSION_POLL_INTERVAL
+
+
+# SHQueryUserNotificationState 返回值
+QUNS_NOT_PRESENT = 1             # 锁屏 / 切换用户 / 屏保
+QUNS_BUSY = 2                    # 全屏应用
+QUNS_RUNNING_D3D_FULL_SCREEN = 3  # 全屏 D3D 游戏
+QUNS_PRESENTATION_MODE = 4       # 演示模式
+
+# 这些状态下青蛙不可见或不该打扰
+INACTIVE_STATES = {
+    QUNS_NOT_PRESENT, QUNS_BUSY, QUNS_RUNNING_D3D_FULL_SCREEN, QUNS_PRESENTATION_MODE,
+}
+
+
+class _LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+
+class SessionMonitor(QObject):
+    """
+    定时检查会话是否活跃，变化时发出 active_changed
+
+    reason 为 'locked' / 'fullscreen' / 'idle' / ''（活跃）
+    """
+
+    active_changed = pyqtSignal(bool, str)
+
+    def __init__(self, idle_timeout: int = ANIMATION_IDLE_TIMEOUT,
+                 interval: int = SESSION_POLL_INTERVAL):
+        super().__init__()
+        self.idle_timeout_ms = idle_timeout * 1000
+        self._active = True
+        self._reason = ''
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._poll)
+
+    @property
+    def available(self) -> bool:
+        return sys.platform == 'win32'
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
+
+    def start(self):
+        if self.available:
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    # ===== 平台查询 =====
+
+    @staticmethod
+    def _notification_state() -> int:
+        state = ctypes.c_int(0)
+        try:
+            if ctypes.windll.shell32.SHQueryUserNotificationState(ctypes.byref(state)) != 0:
+                return 0
+        except (AttributeError, OSError):
+            return 0
+        return state.value
+
+    @staticmethod
+    def _idle_ms() -> int:
+        info = _LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        try:
+            if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+                return 0
+            now = ctypes.windll.kernel32.GetTickCount() & 0xFFFFFFFF
+        except (AttributeError, OSError):
+            return 0
+        # GetTickCount 约 49 天回绕一次
+        return (now - info.dwTime) & 0xFFFFFFFF
+
+    def _poll(self):
+        state = self._notification_state()
+        if state == QUNS_NOT_PRESENT:
+            reason = 'locked'
+        elif state in INACTIVE_STATES:
+            reason = 'fullscreen'
+        elif self.idle_timeout_ms and self._idle_ms() >= self.idle_timeout_ms:
+            reason = 'idle'
+        else:
+            reason = ''
+
+        if reason != self._reason:
+            self._reason = reason
+            self._active = not reason
+            print(f"[Session] {'活跃' if self._active else '暂停动画: ' + reason}")
+            self.active_changed.emit(self._active, reason)
+
+
+# 全局实例
+session_monitor = SessionMonitor()
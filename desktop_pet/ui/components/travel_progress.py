@@ -3,8 +3,10 @@
 旅行进度组件 - 显示实时旅行进度
 """
 
+from typing import Optional
+
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 
 from qfluentwidgets import (
@@ -12,6 +14,8 @@ from qfluentwidgets import (
     ProgressBar, FluentIcon
 )
 
+from ui.components.animation_clock import animation_clock
+
 
 class TravelStage:
     """旅行阶段定义"""
@@ -83,9 +87,9 @@ class TravelProgressCard(CardWidget):
         self._travel_id = None
         self._start_time = None
         self._duration = 0
+        self._live = False  # 收到服务端推送后不再本地模拟阶段
         
         self._setup_ui()
-        self._setup_timer()
         
     def _setup_ui(self):
         """设置 UI"""
@@ -135,35 +139,43 @@ class TravelProgressCard(CardWidget):
         
         self.setMinimumHeight(150)
         
-    def _setup_timer(self):
-        """设置动画定时器"""
-        self._anim_timer = QTimer(self)
-        self._anim_timer.timeout.connect(self._animate_progress)
-        self._anim_timer.setInterval(50)  # 50ms 更新一次
+    def _start_progress_animation(self):
+        """进度条动画：50ms 一步，到达目标后自动停止"""
+        animation_clock.subscribe(self._animate_progress, 50)
         
-        self._time_timer = QTimer(self)
-        self._time_timer.timeout.connect(self._update_time_left)
-        self._time_timer.setInterval(1000)  # 1秒更新时间
+    def _on_second(self):
+        """每秒更新剩余时间"""
+        self._update_time_left()
         
-    def start_travel(self, travel_id: int, chain_name: str, duration: int):
-        """开始旅行追踪"""
+    def start_travel(self, travel_id: int, chain_name: str, duration: int,
+                     started_at: Optional[float] = None):
+        """
+        开始旅行追踪
+        
+        Args:
+            started_at: 出发时间（时间戳），打开面板时旅行已在进行中时传入
+        """
         import time
         
+        self.reset()
         self._travel_id = travel_id
         self._duration = duration
-        self._start_time = time.time()
+        self._start_time = started_at or time.time()
         
         self.chain_label.setText(f'🔗 {chain_name}')
         self.set_stage(TravelStage.DEPARTING)
         
-        self._time_timer.start()
+        animation_clock.subscribe(self._on_second, 1000)
+        # 收到服务端推送前按时长模拟阶段
+        animation_clock.subscribe(self._simulate_stages, 1000)
+        self._update_time_left()
         self._simulate_stages()
         
     def _simulate_stages(self):
-        """模拟旅行阶段变化"""
+        """模拟旅行阶段变化（每秒一次，收到服务端推送后停止）"""
         import time
         
-        if self._duration <= 0:
+        if self._duration <= 0 or self._live:
             return
             
         # 根据总时长计算各阶段时间点
@@ -183,9 +195,42 @@ class TravelProgressCard(CardWidget):
                 if stage != self._current_stage:
                     self.set_stage(stage)
                 break
-                
-        if self._current_stage != TravelStage.COMPLETED:
-            QTimer.singleShot(1000, self._simulate_stages)
+        
+    def apply_event(self, event: str, data: dict):
+        """
+        应用服务端推送的旅行事件（realtime_client.event_received）
+        
+        travel:progress 带 phase / percentage，travel:stageUpdate 带 stage / progress，
+        travel:completed 直接完成。
+        """
+        if event == 'travel:completed':
+            self._go_live()
+            if self._current_stage != TravelStage.COMPLETED:
+                self.set_stage(TravelStage.COMPLETED)
+            return
+        if event not in ('travel:progress', 'travel:stageUpdate'):
+            return
+        self._go_live()
+        
+        stage = str(data.get('stage') or data.get('phase') or '').lower()
+        if stage in STAGE_INFO and stage != self._current_stage:
+            self.set_stage(stage)
+        
+        progress = data.get('percentage', data.get('progress'))
+        if isinstance(progress, (int, float)):
+            self._target_progress = max(0, min(100, int(progress)))
+            self._start_progress_animation()
+        
+        message = data.get('message')
+        if isinstance(message, dict):
+            message = message.get('text')
+        if message:
+            self.tip_label.setText(str(message))
+        
+    def _go_live(self):
+        """改由服务端推送驱动，停止本地模拟"""
+        self._live = True
+        animation_clock.unsubscribe(self._simulate_stages)
         
     def set_stage(self, stage: str):
         """设置当前阶段"""
@@ -212,12 +257,12 @@ class TravelProgressCard(CardWidget):
         self.tip_label.setText(tips)
         
         # 启动进度动画
-        if not self._anim_timer.isActive():
-            self._anim_timer.start()
+        self._start_progress_animation()
             
         # 完成时发出信号
         if stage == TravelStage.COMPLETED:
-            self._time_timer.stop()
+            animation_clock.unsubscribe(self._on_second)
+            animation_clock.unsubscribe(self._simulate_stages)
             self.travel_completed.emit()
             
     def _get_stage_tip(self, stage: str) -> str:
@@ -243,7 +288,7 @@ class TravelProgressCard(CardWidget):
             self.progress_bar.setValue(self._current_progress)
             self.progress_text.setText(f'{self._current_progress}%')
         else:
-            self._anim_timer.stop()
+            animation_clock.unsubscribe(self._animate_progress)
             
     def _update_time_left(self):
         """更新剩余时间"""
@@ -273,6 +318,7 @@ class TravelProgressCard(CardWidget):
         self._travel_id = None
         self._start_time = None
         self._duration = 0
+        self._live = False
         
         self.progress_bar.setValue(0)
         self.progress_text.setText('0%')
@@ -281,8 +327,14 @@ class TravelProgressCard(CardWidget):
         self.tip_label.setText('')
         self.stage_label.setText('🏠 待命中')
         
-        self._anim_timer.stop()
-        self._time_timer.stop()
+        animation_clock.unsubscribe(self._animate_progress)
+        animation_clock.unsubscribe(self._on_second)
+        animation_clock.unsubscribe(self._simulate_stages)
+        
+    @property
+    def travel_id(self) -> Optional[int]:
+        """正在追踪的旅行，未开始时为 None"""
+        return self._travel_id
         
     @property
     def is_traveling(self) -> bool:
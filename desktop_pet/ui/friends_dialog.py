@@ -19,6 +19,8 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.api_client import api_client
+from services.entity_store import entity_store
+from ui.signal_utils import disconnect_all
 
 
 # 亲密度等级
@@ -31,6 +33,16 @@ INTIMACY_LEVELS = {
 }
 
 
+# 互动类型 -> 提示文字
+ACTION_NAMES = {
+    'wave': '打了个招呼',
+    'feed': '喂了食物',
+    'gift': '送了礼物',
+    'message': '留了言',
+    'visit': '去拜访',
+}
+
+
 def get_intimacy_level(intimacy):
     """获取亲密度等级信息"""
     result = INTIMACY_LEVELS[0]
@@ -43,15 +55,15 @@ def get_intimacy_level(intimacy):
 class FriendCard(CardWidget):
     """好友卡片组件"""
     
-    clicked = pyqtSignal(dict)
+    clicked = pyqtSignal(object)
     
     def __init__(self, friend, parent=None):
         super().__init__(parent)
         self.friend = friend
         self.setCursor(Qt.PointingHandCursor)
         
-        status = friend.get('status', 'Idle')
-        is_online = friend.get('isOnline', False)
+        status = friend.status
+        is_online = friend.is_online
         
         self.setStyleSheet(f"""
             FriendCard {{
@@ -83,29 +95,25 @@ class FriendCard(CardWidget):
         info_layout.setSpacing(4)
         
         name_layout = QHBoxLayout()
-        name = friend.get('name', '未知')
-        name_label = BodyLabel(f'{online_dot} {name}')
+        name_label = BodyLabel(f'{online_dot} {friend.name}')
         name_label.setStyleSheet('font-weight: bold;')
         name_layout.addWidget(name_label)
         name_layout.addStretch()
         
-        level = friend.get('level', 1)
-        level_label = CaptionLabel(f'Lv.{level}')
+        level_label = CaptionLabel(f'Lv.{friend.level}')
         level_label.setStyleSheet('color: #F59E0B;')
         name_layout.addWidget(level_label)
         
         info_layout.addLayout(name_layout)
         
-        intimacy = friend.get('intimacy', 0)
-        intimacy_info = get_intimacy_level(intimacy)
+        intimacy_info = get_intimacy_level(friend.intimacy)
         intimacy_label = CaptionLabel(f"{intimacy_info['emoji']} {intimacy_info['name']}")
         intimacy_label.setStyleSheet(f"color: {intimacy_info['color']};")
         info_layout.addWidget(intimacy_label)
         
         layout.addLayout(info_layout, 1)
         
-        travels = friend.get('totalTravels', 0)
-        travels_label = CaptionLabel(f'🧳 {travels}')
+        travels_label = CaptionLabel(f'🧳 {friend.total_travels}')
         travels_label.setStyleSheet('color: #8B949E;')
         layout.addWidget(travels_label)
     
@@ -118,14 +126,13 @@ class FriendCard(CardWidget):
 class FriendProfileDialog(QDialog):
     """好友名片弹窗"""
     
-    interaction_sent = pyqtSignal(str, dict)
+    interaction_sent = pyqtSignal(str, object)
     
     def __init__(self, friend, parent=None):
         super().__init__(parent)
         self.friend = friend
         
-        name = friend.get('name', '好友')
-        self.setWindowTitle(f'🐸 {name} 的名片')
+        self.setWindowTitle(f'🐸 {friend.name} 的名片')
         self.setFixedSize(420, 580)
         self.setStyleSheet("QDialog { background-color: #202020; }")
         
@@ -147,13 +154,11 @@ class FriendProfileDialog(QDialog):
         avatar.setAlignment(Qt.AlignCenter)
         avatar_layout.addWidget(avatar)
         
-        name = self.friend.get('name', '未知')
-        name_label = SubtitleLabel(name)
+        name_label = SubtitleLabel(self.friend.name)
         name_label.setAlignment(Qt.AlignCenter)
         avatar_layout.addWidget(name_label)
         
-        is_online = self.friend.get('isOnline', False)
-        status = '🟢 在线' if is_online else '⚫ 离线'
+        status = '🟢 在线' if self.friend.is_online else '⚫ 离线'
         status_label = CaptionLabel(status)
         status_label.setAlignment(Qt.AlignCenter)
         avatar_layout.addWidget(status_label)
@@ -167,14 +172,10 @@ class FriendProfileDialog(QDialog):
         stats_layout.setSpacing(16)
         stats_layout.setContentsMargins(16, 16, 16, 16)
         
-        level = self.friend.get('level', 1)
-        xp = self.friend.get('xp', 0)
-        travels = self.friend.get('totalTravels', 0)
-        
         stats = [
-            ('⭐ 等级', f'Lv.{level}'),
-            ('📊 经验', f'{xp} XP'),
-            ('🧳 旅行次数', str(travels)),
+            ('⭐ 等级', f'Lv.{self.friend.level}'),
+            ('📊 经验', f'{self.friend.xp} XP'),
+            ('🧳 旅行次数', str(self.friend.total_travels)),
         ]
         
         for i, (label, value) in enumerate(stats):
@@ -193,7 +194,7 @@ class FriendProfileDialog(QDialog):
         intimacy_layout = QVBoxLayout(intimacy_card)
         intimacy_layout.setSpacing(8)
         
-        intimacy = self.friend.get('intimacy', 0)
+        intimacy = self.friend.intimacy
         intimacy_info = get_intimacy_level(intimacy)
         
         intimacy_header = QHBoxLayout()
@@ -243,22 +244,7 @@ class FriendProfileDialog(QDialog):
         layout.addWidget(close_btn)
     
     def _on_action(self, action_type):
-        action_names = {
-            'wave': '打了个招呼',
-            'feed': '喂了食物',
-            'gift': '送了礼物',
-            'message': '留了言',
-            'visit': '去拜访',
-        }
-        
-        InfoBar.success(
-            title='互动成功',
-            content=f"你给 {self.friend.get('name')} {action_names.get(action_type, '互动了')}！",
-            parent=self,
-            position=InfoBarPosition.TOP,
-            duration=2000
-        )
-        
+        # 互动结果由好友对话框在请求返回后提示
         self.interaction_sent.emit(action_type, self.friend)
         
         if action_type == 'visit':
@@ -281,6 +267,8 @@ class FriendsDialog(QDialog):
         
         self._setup_content()
         self._load_data()
+        entity_store.collection_changed.connect(self._on_collection_changed)
+        entity_store.entity_changed.connect(self._on_entity_changed)
     
     def _setup_content(self):
         layout = QVBoxLayout(self)
@@ -354,7 +342,7 @@ class FriendsDialog(QDialog):
         layout.addWidget(scroll)
         
         refresh_btn = PushButton(FluentIcon.SYNC, '刷新')
-        refresh_btn.clicked.connect(self._load_friends)
+        refresh_btn.clicked.connect(lambda: self._refresh('/friends/list', self._load_friends))
         layout.addWidget(refresh_btn)
         
         return page
@@ -373,7 +361,7 @@ class FriendsDialog(QDialog):
         btn_layout.addWidget(accept_btn)
         
         refresh_btn = PushButton(FluentIcon.SYNC, '刷新')
-        refresh_btn.clicked.connect(self._load_requests)
+        refresh_btn.clicked.connect(lambda: self._refresh('/friends/requests', self._load_requests))
         btn_layout.addWidget(refresh_btn)
         
         layout.addLayout(btn_layout)
@@ -393,7 +381,7 @@ class FriendsDialog(QDialog):
         btn_layout.addWidget(add_btn)
         
         refresh_btn = PushButton(FluentIcon.SYNC, '刷新')
-        refresh_btn.clicked.connect(self._load_world)
+        refresh_btn.clicked.connect(lambda: self._refresh('/friends/world-online', self._load_world))
         btn_layout.addWidget(refresh_btn)
         
         layout.addLayout(btn_layout)
@@ -404,17 +392,25 @@ class FriendsDialog(QDialog):
         self._load_requests()
         self._load_world()
     
+    def _refresh(self, endpoint, loader):
+        """手动刷新：先使缓存过期再加载"""
+        api_client.invalidate_cache(endpoint)
+        loader()
+    
     def _load_friends(self):
+        api_client.call_async('get_friends', self.frog.api_id,
+                              on_success=self._on_friends_loaded, owner=self)
+    
+    def _on_friends_loaded(self, friends):
         while self.friends_container.count():
             item = self.friends_container.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
         
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        self.friends_data = api_client.get_friends(frog_id)
+        self.friends_data = friends
         
         total = len(self.friends_data)
-        online = len([f for f in self.friends_data if f.get('isOnline')])
+        online = len([f for f in self.friends_data if f.is_online])
         self.stats_label.setText(f'👥 好友: {total}')
         self.online_label.setText(f'🟢 在线: {online}')
         
@@ -428,10 +424,30 @@ class FriendsDialog(QDialog):
             empty_label.setAlignment(Qt.AlignCenter)
             self.friends_container.addWidget(empty_label)
     
+    def done(self, result):
+        """关闭时断开全局数据信号，已关闭的对话框不再随数据变化刷新"""
+        disconnect_all(
+            (entity_store.collection_changed, self._on_collection_changed),
+            (entity_store.entity_changed, self._on_entity_changed),
+        )
+        super().done(result)
+    
+    def _on_collection_changed(self, kind, scope):
+        if kind == 'friend' and scope == self.frog.api_id:
+            self._on_friends_loaded(entity_store.collection('friend', scope))
+    
+    def _on_entity_changed(self, kind, entity):
+        """好友在线状态、亲密度等变化"""
+        if kind == 'friend' and any(entity is f for f in self.friends_data):
+            self._on_friends_loaded(self.friends_data)
+    
     def _load_requests(self):
+        api_client.call_async('get_friend_requests', self.frog.api_id,
+                              on_success=self._on_requests_loaded, owner=self)
+    
+    def _on_requests_loaded(self, requests):
         self.requests_list.clear()
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        self.requests_data = api_client.get_friend_requests(frog_id)
+        self.requests_data = requests
         
         for req in self.requests_data:
             from_name = req.get('fromFrogName', '未知')
@@ -441,14 +457,15 @@ class FriendsDialog(QDialog):
             self.requests_list.addItem('暂无请求')
     
     def _load_world(self):
+        api_client.call_async('get_world_online', self.frog.id,
+                              on_success=self._on_world_loaded, owner=self)
+    
+    def _on_world_loaded(self, world):
         self.world_list.clear()
-        my_frog_id = self.frog.get('id')
-        self.world_data = api_client.get_world_online(my_frog_id)
+        self.world_data = world
         for frog in self.world_data:
-            if frog.get('id') != my_frog_id:
-                name = frog.get('name', '未知')
-                level = frog.get('level', 1)
-                self.world_list.addItem(f'🐸 {name} (Lv.{level})')
+            if frog.id != self.frog.id:
+                self.world_list.addItem(f'🐸 {frog.name} (Lv.{frog.level})')
         
         if self.world_list.count() == 0:
             self.world_list.addItem('暂无其他青蛙在线')
@@ -459,12 +476,21 @@ class FriendsDialog(QDialog):
         dialog.exec_()
     
     def _on_interaction(self, action_type, friend):
-        try:
-            frog_id = self.frog.get('tokenId') or self.frog.get('id')
-            friend_id = friend.get('id')
-            api_client.send_interaction(frog_id, friend_id, action_type)
-        except Exception as e:
-            print(f"Interaction failed: {e}")
+        api_client.call_async('send_interaction', self.frog.api_id, friend.id, action_type,
+                              on_success=lambda result: self._on_interaction_done(result, action_type, friend),
+                              on_error=self._on_interaction_error, owner=self)
+    
+    def _on_interaction_done(self, result, action_type, friend):
+        if result.get('success'):
+            InfoBar.success('互动成功', f"你给 {friend.name} {ACTION_NAMES.get(action_type, '互动了')}！",
+                          parent=self, position=InfoBarPosition.TOP, duration=2000)
+        else:
+            InfoBar.error('互动失败', result.get('error', '未知错误'), parent=self,
+                        position=InfoBarPosition.TOP, duration=3000)
+    
+    def _on_interaction_error(self, error):
+        InfoBar.error('互动失败', str(error), parent=self,
+                    position=InfoBarPosition.TOP, duration=3000)
     
     def _accept_request(self):
         current_row = self.requests_list.currentRow()
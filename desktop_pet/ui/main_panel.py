@@ -20,8 +20,13 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ui.components.frog_svg import FrogSvgWidget
+from ui.components.travel_progress import TravelProgressCard
 from services.api_client import api_client
 from services.wallet_manager import wallet_manager
+from services.entity_store import entity_store
+from services.realtime_client import realtime_client
+from services.performance_profile import profile_manager
+from ui.signal_utils import disconnect_all
 from config import FrogState
 
 
@@ -33,12 +38,14 @@ class MainPanelDialog(QDialog):
         self.frog = frog
         self.wallet_address = wallet_address
         
-        self.setWindowTitle(f'🐸 {frog.get("name", "ZetaFrog")}')
+        self.setWindowTitle(f'🐸 {frog.name}')
         self.setFixedSize(480, 700)
         self.setStyleSheet("QDialog { background-color: #202020; }")
         
         self._setup_content()
         self._start_auto_refresh()
+        entity_store.entity_changed.connect(self._on_entity_changed)
+        realtime_client.event_received.connect(self._on_realtime_event)
     
     def _setup_content(self):
         """设置内容区域"""
@@ -65,26 +72,21 @@ class MainPanelDialog(QDialog):
         info_col.setSpacing(8)
         
         # 名字
-        name = self.frog.get('name', '未命名')
-        name_label = SubtitleLabel(name)
+        name_label = SubtitleLabel(self.frog.name)
         name_label.setFont(QFont('Segoe UI', 18, QFont.Bold))
         info_col.addWidget(name_label)
         
         # 状态标签
-        status = self.frog.get('status', 'Idle')
         self.status_label = CaptionLabel()
-        self._update_status_label(status)
+        self._update_status_label(self.frog.status)
         info_col.addWidget(self.status_label)
         
         # 统计
         stats_layout = QHBoxLayout()
         stats_layout.setSpacing(20)
         
-        travels = self.frog.get('totalTravels', 0)
-        xp = self.frog.get('xp', 0)
-        level = self.frog.get('level', 1)
-        
-        for icon, value, label in [('✈️', travels, '旅行'), ('⭐', f'Lv.{level}', '等级'), ('📊', xp, 'XP')]:
+        frog = self.frog
+        for icon, value, label in [('✈️', frog.total_travels, '旅行'), ('⭐', f'Lv.{frog.level}', '等级'), ('📊', frog.xp, 'XP')]:
             stat_w = QVBoxLayout()
             stat_w.setSpacing(2)
             val_label = BodyLabel(f'{icon} {value}')
@@ -103,11 +105,17 @@ class MainPanelDialog(QDialog):
         
         # 刷新按钮
         refresh_btn = PushButton(FluentIcon.SYNC, '刷新')
-        refresh_btn.clicked.connect(self._refresh_data)
+        refresh_btn.clicked.connect(self._on_refresh_clicked)
         info_layout.addWidget(refresh_btn)
         
         layout.addWidget(info_card)
         
+        # ===== 旅行进度（旅行中时显示，由实时推送驱动） =====
+        self.travel_card = TravelProgressCard(self)
+        self.travel_card.travel_completed.connect(self._refresh_data)
+        self.travel_card.hide()
+        layout.addWidget(self.travel_card)
+        
         # ===== 功能按钮网格 =====
         buttons_card = CardWidget(self)
         buttons_layout = QGridLayout(buttons_card)
@@ -157,8 +165,7 @@ class MainPanelDialog(QDialog):
     
     def _update_frog_state(self):
         """根据状态更新青蛙显示"""
-        status = self.frog.get('status', 'Idle')
-        if status == 'Traveling':
+        if self.frog.is_traveling:
             self.frog_widget.state = FrogState.TRAVELING
             self.frog_widget.set_traveling(True)
         else:
@@ -186,14 +193,16 @@ class MainPanelDialog(QDialog):
     
     def _load_travels(self):
         """加载旅行历史"""
+        api_client.call_async('get_frog_travels', self.frog.api_id,
+                              on_success=self._on_travels_loaded, owner=self)
+    
+    def _on_travels_loaded(self, travels):
+        """旅行历史加载完成"""
         while self.travels_container.count():
             item = self.travels_container.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
         
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        travels = api_client.get_frog_travels(frog_id)
-        
         for travel in travels[:3]:
             travel_item = self._create_travel_item(travel)
             self.travels_container.addWidget(travel_item)
@@ -202,6 +211,20 @@ class MainPanelDialog(QDialog):
             empty_label = CaptionLabel('还没有旅行记录')
             empty_label.setAlignment(Qt.AlignCenter)
             self.travels_container.addWidget(empty_label)
+        
+        active = next((t for t in travels if t.status in ('Active', 'Processing')), None)
+        self._update_travel_progress(active)
+    
+    def _update_travel_progress(self, travel):
+        """进行中的旅行显示进度卡片，没有时隐藏"""
+        if travel is None:
+            self.travel_card.reset()
+            self.travel_card.hide()
+            return
+        if self.travel_card.travel_id != travel.id:
+            started_at = travel.start_time.timestamp() if travel.start_time else None
+            self.travel_card.start_travel(travel.id, travel.chain_name, travel.duration, started_at)
+        self.travel_card.show()
     
     def _create_travel_item(self, travel):
         """创建旅行条目"""
@@ -209,55 +232,104 @@ class MainPanelDialog(QDialog):
         layout = QHBoxLayout(card)
         layout.setContentsMargins(14, 10, 14, 10)
         
-        status = travel.get('status', 'Unknown')
-        status_emoji = {'Completed': '✅', 'Active': '🔄', 'Cancelled': '❌'}.get(status, '❓')
-        chain_id = travel.get('chainId', 0)
-        chain_name = {7001: 'ZetaChain', 97: 'BSC', 11155111: 'Sepolia'}.get(chain_id, f'Chain {chain_id}')
-        start_time = travel.get('startTime', '')[:10]
-        
-        info_label = BodyLabel(f'{status_emoji} {start_time} → {chain_name}')
+        status_emoji = {'Completed': '✅', 'Active': '🔄', 'Cancelled': '❌'}.get(travel.status, '❓')
+        info_label = BodyLabel(f'{status_emoji} {travel.start_date} → {travel.chain_name}')
         layout.addWidget(info_label)
         layout.addStretch()
         
-        souvenir = travel.get('souvenir')
-        if souvenir:
+        if travel.souvenir:
             layout.addWidget(BodyLabel('🎁'))
         
         return card
     
+    def done(self, result):
+        """关闭时停止轮询并断开全局信号，已关闭的面板不再刷新或请求接口"""
+        self.refresh_timer.stop()
+        self.travel_card.reset()
+        disconnect_all(
+            (entity_store.entity_changed, self._on_entity_changed),
+            (realtime_client.event_received, self._on_realtime_event),
+            (realtime_client.connection_changed, self._on_realtime_connection),
+            (profile_manager.profile_changed, self._on_profile_changed),
+        )
+        super().done(result)
+    
+    def _on_entity_changed(self, kind, entity):
+        """当前青蛙被其他界面或刷新更新（如出发旅行）"""
+        if kind == 'frog' and entity is self.frog:
+            self._update_frog_state()
+            self._update_status_label(self.frog.status)
+    
+    def _on_refresh_clicked(self):
+        """手动刷新：跳过缓存有效期"""
+        api_client.invalidate_cache('/frogs', '/travels')
+        self._refresh_data()
+    
     def _refresh_data(self):
         """刷新数据"""
         if self.wallet_address:
-            new_frog = api_client.get_frog_detail(self.frog.get('tokenId'), self.wallet_address)
-            if new_frog:
-                self.frog = new_frog
-                self._update_frog_state()
-                self._update_status_label(self.frog.get('status', 'Idle'))
-                self._load_travels()
+            api_client.call_async('get_frog_detail', self.frog.token_id, self.wallet_address,
+                                  on_success=self._on_frog_refreshed, owner=self)
+    
+    def _on_frog_refreshed(self, new_frog):
+        """青蛙详情刷新完成"""
+        if new_frog:
+            self.frog = new_frog
+            self._update_frog_state()
+            self._update_status_label(self.frog.status)
+            self._load_travels()
+    
+    def _on_realtime_event(self, event, data):
+        """服务端推送：旅行进度交给进度卡片，出发 / 完成时刷新旅行历史（青蛙状态已由 entity_store 更新）"""
+        if not event.startswith('travel:'):
+            return
+        frog_id = data.get('frogId', data.get('tokenId'))
+        if frog_id is None or str(frog_id) != str(self.frog.token_id):
+            return
+        if self.travel_card.travel_id is not None:
+            self.travel_card.apply_event(event, data)
+        if event in ('travel:started', 'travel:completed'):
+            self._load_travels()
     
     def _start_auto_refresh(self):
-        """启动自动刷新"""
+        """启动自动刷新：实时推送在线时不轮询，断线时回退到定时刷新"""
         self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(profile_manager.get('poll_interval'))
         self.refresh_timer.timeout.connect(self._refresh_data)
-        self.refresh_timer.start(30000)
+        profile_manager.profile_changed.connect(self._on_profile_changed)
+        realtime_client.connection_changed.connect(self._on_realtime_connection)
+        self._on_realtime_connection(realtime_client.is_connected)
+    
+    def _on_profile_changed(self, name, profile):
+        self.refresh_timer.setInterval(profile['poll_interval'])
+    
+    def _on_realtime_connection(self, connected):
+        if connected:
+            self.refresh_timer.stop()
+        elif not self.refresh_timer.isActive():
+            self.refresh_timer.start()
     
     def _show_travel(self):
         from ui.travel_dialog import TravelDialog
         dialog = TravelDialog(self.frog, self.wallet_address, self)
         dialog.exec_()
+        dialog.deleteLater()
         self._refresh_data()
     
     def _show_friends(self):
         from ui.friends_dialog import FriendsDialog
         dialog = FriendsDialog(self.frog, self)
         dialog.exec_()
+        dialog.deleteLater()
     
     def _show_badges(self):
         from ui.badges_dialog import BadgesDialog
         dialog = BadgesDialog(self.frog, self.wallet_address, self)
         dialog.exec_()
+        dialog.deleteLater()
     
     def _show_nft(self):
         from ui.nft_gallery import NFTGalleryDialog
         dialog = NFTGalleryDialog(self.frog, self.wallet_address, self)
         dialog.exec_()
+        dialog.deleteLater()
@@ -3,9 +3,10 @@
 铸造青蛙对话框 - PyQt-Fluent-Widgets 现代UI
 """
 
-from PyQt5.QtWidgets import QDialog, QVBoxLayout
+from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
+from PyQt5 import sip
 
 from qfluentwidgets import (
     SubtitleLabel, BodyLabel, CaptionLabel,
@@ -18,22 +19,39 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.wallet_manager import wallet_manager
 from services.api_client import api_client
+from services.tx_tracker import tx_tracker
+from ui.signal_utils import disconnect_all
+
+
+def minted_token_id(receipt: dict) -> int:
+    """从铸造交易回执的 Transfer 事件中取出 tokenId"""
+    for log in receipt.get('logs', []):
+        if len(log['topics']) >= 4:
+            return int(log['topics'][3], 16)
+    return 1
+
+
+def _track_mint(tx: dict, name: str):
+    """交给 tx_tracker 跟踪，关闭对话框或退出程序后仍会继续，确认后由主窗口刷新青蛙列表"""
+    tx_tracker.track(tx['hash'], tx['chain_id'], tx['from'], tx['nonce'],
+                     kind='mint', meta={'name': name})
 
 
 class MintWorker(QThread):
-    """铸造工作线程"""
-    success = pyqtSignal(str, int)
+    """铸造工作线程：只负责准备、签名并广播交易，确认由 tx_tracker 跟踪"""
+    submitted = pyqtSignal(object)  # {'hash', 'chain_id', 'from', 'nonce'}
     error = pyqtSignal(str)
     status = pyqtSignal(str)
     
-    def __init__(self, name: str):
-        super().__init__()
+    def __init__(self, name: str, parent=None):
+        super().__init__(parent)
         self.name = name
     
     def run(self):
         try:
-            from web3 import Web3
-            import time
+            import requests
+            from services.chain_client import chain_pool
+            from services.transaction_builder import TransactionBuilder
             
             self.status.emit('正在连接到区块链...')
             
@@ -41,66 +59,28 @@ class MintWorker(QThread):
                 self.error.emit('需要可签名的钱包才能铸造')
                 return
             
-            rpc_url = 'https://zetachain-athens-evm.blockpi.network/v1/rpc/public'
-            w3 = Web3(Web3.HTTPProvider(rpc_url))
-            
-            if not w3.is_connected():
-                self.error.emit('无法连接到区块链')
-                return
+            chain = chain_pool.get()
             
             self.status.emit('正在准备交易...')
             
-            contract_address = '0x76e7baA23fce77DA7Edbea58D8B888128D47A1Ff'
-            mint_abi = [{
-                "inputs": [{"internalType": "string", "name": "name", "type": "string"}],
-                "name": "mintFrog",
-                "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }]
-            
-            contract = w3.eth.contract(
-                address=Web3.to_checksum_address(contract_address),
-                abi=mint_abi
-            )
-            
-            address = Web3.to_checksum_address(wallet_manager.address)
-            nonce = w3.eth.get_transaction_count(address)
+            # nonce、gas 价格、链 ID、gas 预估一次批量请求拿到；nonce 在本地分配，
+            # 连续铸造时不必等上一笔确认
+            builder = TransactionBuilder(chain)
+            try:
+                tx = builder.build(chain.zetafrog(), 'mintFrog', [self.name], wallet_manager.address)
+            except requests.RequestException:
+                self.error.emit('无法连接到区块链')
+                return
             
-            tx = contract.functions.mintFrog(self.name).build_transaction({
-                'from': address,
+            self.status.emit('正在签名并发送交易...')
+            tx_hash, nonce = builder.sign_and_send(tx, wallet_manager.sign_transaction)
+            self.submitted.emit({
+                'hash': tx_hash,
+                'chain_id': chain.chain_id,
+                'from': tx['from'],
                 'nonce': nonce,
-                'gas': 300000,
-                'gasPrice': w3.eth.gas_price,
-                'chainId': 7001
             })
             
-            self.status.emit('正在签名交易...')
-            success, result = wallet_manager.sign_transaction(tx)
-            
-            if not success:
-                self.error.emit(result)
-                return
-            
-            signed_tx_hex = result
-            
-            self.status.emit('正在发送交易...')
-            tx_hash = w3.eth.send_raw_transaction(signed_tx_hex)
-            tx_hash_hex = tx_hash.hex()
-            
-            self.status.emit('等待区块确认...')
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
-            if receipt.status == 1:
-                token_id = 1
-                for log in receipt.logs:
-                    if len(log['topics']) >= 4:
-                        token_id = int(log['topics'][3].hex(), 16)
-                        break
-                self.success.emit(tx_hash_hex, token_id)
-            else:
-                self.error.emit('交易失败')
-                
         except Exception as e:
             self.error.emit(str(e))
 
@@ -116,7 +96,27 @@ class MintDialog(QDialog):
         self.setStyleSheet("QDialog { background-color: #202020; }")
         
         self._minted_token_id = None
+        self._tx_hash = None
+        self.worker = None
         self._setup_content()
+        
+        tx_tracker.tx_confirmed.connect(self._on_tx_confirmed)
+        tx_tracker.tx_failed.connect(self._on_tx_failed)
+    
+    def done(self, result):
+        """关闭时断开交易跟踪和工作线程的信号，已关闭的对话框不再更新"""
+        connections = [
+            (tx_tracker.tx_confirmed, self._on_tx_confirmed),
+            (tx_tracker.tx_failed, self._on_tx_failed),
+        ]
+        if self.worker is not None and not sip.isdeleted(self.worker):
+            connections += [
+                (self.worker.status, self._on_status),
+                (self.worker.submitted, self._on_submitted),
+                (self.worker.error, self._on_error),
+            ]
+        disconnect_all(*connections)
+        super().done(result)
     
     def _setup_content(self):
         layout = QVBoxLayout(self)
@@ -184,15 +184,30 @@ class MintDialog(QDialog):
         self.mint_btn.setEnabled(False)
         self.progress.show()
         
-        self.worker = MintWorker(name)
+        # 关闭对话框时交易可能还在发送：线程挂在 QApplication 下，结束后自行释放
+        self.worker = MintWorker(name, QApplication.instance())
+        self.worker.finished.connect(self.worker.deleteLater)
         self.worker.status.connect(self._on_status)
-        self.worker.success.connect(self._on_success)
+        self.worker.submitted.connect(lambda tx: _track_mint(tx, name))
+        self.worker.submitted.connect(self._on_submitted)
         self.worker.error.connect(self._on_error)
         self.worker.start()
     
     def _on_status(self, status):
         self.status_label.setText(status)
     
+    def _on_submitted(self, tx):
+        self._tx_hash = tx['hash']
+        self.status_label.setText('等待区块确认...')
+    
+    def _on_tx_confirmed(self, record):
+        if record['hash'] == self._tx_hash:
+            self._on_success(record['hash'], minted_token_id(record['receipt']))
+    
+    def _on_tx_failed(self, record):
+        if record['hash'] == self._tx_hash:
+            self._on_error(record['error'])
+    
     def _on_success(self, tx_hash, token_id):
         self.progress.hide()
         self._minted_token_id = token_id
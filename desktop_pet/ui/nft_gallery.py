@@ -5,11 +5,12 @@ NFT 纪念品画廊 - PyQt-Fluent-Widgets 现代UI
 """
 
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QWidget, QGridLayout, QScrollArea
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QStyledItemDelegate, QStyle, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
-from PyQt5.QtGui import QFont, QPixmap
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import (
+    Qt, QSize, QRectF, QTimer, pyqtSignal, QAbstractListModel, QModelIndex
+)
+from PyQt5.QtGui import QFont, QPainter, QColor, QPen
 
 from qfluentwidgets import (
     SubtitleLabel, BodyLabel, CaptionLabel,
@@ -19,8 +20,13 @@ from qfluentwidgets import (
 
 import sys
 import os
+from bisect import bisect_left
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.api_client import api_client
+from services.entity_store import entity_store
+from services.image_loader import image_loader
+from ui.signal_utils import disconnect_all
+from models import SouvenirIndex
 
 
 # 稀有度配置
@@ -32,113 +38,334 @@ RARITY_CONFIG = {
     'Legendary': {'bg': '#3D2E1F', 'accent': '#F59E0B', 'name': '传说', 'emoji': '🟡'},
 }
 
-CHAIN_NAMES = {
-    7001: 'ZetaChain',
-    97: 'BSC',
-    11155111: 'Ethereum',
-    42161: 'Arbitrum',
-}
+# 列表模型中存放纪念品对象的角色
+SouvenirRole = Qt.UserRole + 1
 
+CARD_SIZE = QSize(155, 195)
+THUMB_SIZE = 70
+DETAIL_IMAGE_SIZE = 120
 
-class NFTCard(CardWidget):
-    """NFT 卡片组件"""
-    
-    clicked = pyqtSignal(dict)
+# 差量更新时逐个移动的上限，超过后整体重排（layoutChanged）
+DIFF_MOVE_LIMIT = 32
+
+
+def _longest_increasing(values):
+    """最长递增子序列的下标集合（O(n log n)）"""
+    tails, tail_idx = [], []
+    prev = [-1] * len(values)
+    for i, v in enumerate(values):
+        k = bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tail_idx.append(i)
+        else:
+            tails[k] = v
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else -1
+    result = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        result.add(i)
+        i = prev[i]
+    return result
+
+
+class SouvenirListModel(QAbstractListModel):
+    """
+    纪念品列表模型
+
+    每次数据加载构建一个 SouvenirIndex，筛选和排序都是从索引中取结果；
+    新结果与当前列表按 id 做差量（apply_diff），只发出增删移动的行，
+    滚动位置和已加载的缩略图保持不变。
+    图片在单元格第一次被绘制（data 请求 DecorationRole）时才向 image_loader
+    请求（缩放后的图片由 image_loader 缓存），下载完成后只刷新对应的行；
+    视图可用 request_rows 加载 / 预取指定的行，用 cancel_thumbnails 取消滚出视野的行；
+    快速滚动时视图设置 paused，绘制不再触发下载，停下后再按可见区域加载。
+    """
     
-    def __init__(self, souvenir, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.souvenir = souvenir
-        self.network_manager = QNetworkAccessManager(self)
-        self.setCursor(Qt.PointingHandCursor)
-        
-        rarity = souvenir.get('rarity', 'Common')
-        config = RARITY_CONFIG.get(rarity, RARITY_CONFIG['Common'])
-        
-        self.setStyleSheet(f"""
-            NFTCard {{
-                background: {config['bg']};
-                border: 2px solid {config['accent']};
-                border-radius: 16px;
-            }}
-            NFTCard:hover {{
-                background: {config['bg']}DD;
-            }}
-        """)
-        
-        self.setFixedSize(155, 195)
-        
-        layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignCenter)
-        layout.setSpacing(6)
-        layout.setContentsMargins(10, 12, 10, 12)
-        
-        self.image_label = BodyLabel('🎁')
-        self.image_label.setFont(QFont('Segoe UI Emoji', 36))
-        self.image_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(self.image_label)
-        
-        name = souvenir.get('name', '纪念品')[:12]
-        name_label = CaptionLabel(name)
-        name_label.setAlignment(Qt.AlignCenter)
-        name_label.setStyleSheet('font-weight: bold;')
-        layout.addWidget(name_label)
-        
-        rarity_label = CaptionLabel(f"{config['emoji']} {config['name']}")
-        rarity_label.setStyleSheet(f'color: {config["accent"]};')
-        rarity_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(rarity_label)
-        
-        chain_id = souvenir.get('chainId', 7001)
-        chain_name = CHAIN_NAMES.get(chain_id, 'Unknown')
-        chain_label = CaptionLabel(f'🔗 {chain_name}')
-        chain_label.setStyleSheet('color: #8B949E; font-size: 10px;')
-        chain_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(chain_label)
-        
-        # 优先从 images 数组获取图片
-        images = souvenir.get('images', [])
-        image_url = None
-        if images and isinstance(images, list) and len(images) > 0:
-            # 优先找状态为 COMPLETED 的图片
-            completed_images = [img for img in images if img.get('status') == 'COMPLETED']
-            if completed_images:
-                image_url = completed_images[0].get('imageUrl') or completed_images[0].get('gatewayUrl')
+        self.collection = SouvenirIndex()
+        self._rarity = 'all'
+        self._chain = 'all'
+        self._sort = 'newest'
+        self._souvenirs = []  # 当前显示的（已筛选、排序）
+        self._rows = {}       # souvenir.id -> row
+        self._url_rows = {}   # image_url -> [row, ...]
+        self._loading = {}    # image_url -> image_loader 请求编号
+        self.paused = False
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._souvenirs)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        souvenir = self._souvenirs[index.row()]
+        if role == SouvenirRole:
+            return souvenir
+        if role == Qt.DisplayRole:
+            return souvenir.name
+        if role == Qt.DecorationRole:
+            return self._thumbnail(souvenir)
+        return None
+    
+    def set_souvenirs(self, souvenirs):
+        """新数据：重建索引"""
+        self.collection = SouvenirIndex(souvenirs)
+        self._select()
+    
+    def set_filters(self, rarity='all', chain='all'):
+        self._rarity, self._chain = rarity, chain
+        self._select()
+    
+    def _select(self):
+        self.apply_diff(self.collection.select(self._rarity, self._chain, self._sort))
+    
+    def set_sort(self, sort_by):
+        """重新排序（保持已有的持久索引有效）"""
+        self._sort = sort_by if sort_by in SouvenirIndex.SORT_KEYS else 'newest'
+        self._relayout(self.collection.select(self._rarity, self._chain, self._sort))
+    
+    def _relayout(self, souvenirs):
+        """同一批纪念品换顺序"""
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_ids = [self._souvenirs[i.row()].id for i in old_persistent]
+        
+        self._souvenirs = souvenirs
+        self._reindex()
+        
+        self.changePersistentIndexList(
+            old_persistent, [self.index(self._rows[sid]) for sid in old_ids])
+        self.layoutChanged.emit()
+    
+    # ===== 差量更新 =====
+    
+    def apply_diff(self, souvenirs):
+        """
+        把当前列表更新为 souvenirs（按 id 对比）
+        
+        依次处理删除、移动、插入，连续的行合并为一次 begin/end；
+        id 相同但对象不同的行发出 dataChanged。
+        """
+        new_ids = [s.id for s in souvenirs]
+        target = {sid: i for i, sid in enumerate(new_ids)}
+        
+        # 删除（从后往前，连续区间一次删除）
+        row = len(self._souvenirs) - 1
+        while row >= 0:
+            if self._souvenirs[row].id in target:
+                row -= 1
+                continue
+            last = row
+            while row > 0 and self._souvenirs[row - 1].id not in target:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row, last)
+            del self._souvenirs[row:last + 1]
+            self.endRemoveRows()
+            row -= 1
+        
+        # 移动：最长递增子序列之外的才需要移动
+        ranks = [target[s.id] for s in self._souvenirs]
+        in_order = all(a < b for a, b in zip(ranks, ranks[1:]))
+        stable = _longest_increasing(ranks) if not in_order else None
+        if stable is not None and len(stable) < len(ranks):
+            moved = sorted((ranks[i] for i in range(len(ranks)) if i not in stable))
+            if len(moved) > DIFF_MOVE_LIMIT:
+                self._relayout(sorted(self._souvenirs, key=lambda s: target[s.id]))
             else:
-                image_url = images[0].get('imageUrl') or images[0].get('gatewayUrl')
-        
-        # 降级尝试直接获取字段
-        if not image_url:
-            image_url = souvenir.get('imageUrl') or souvenir.get('metadataUri')
+                for rank in moved:
+                    self._move_after_predecessor(new_ids[rank], target)
+        
+        # 插入（连续的新行一次插入）
+        present = {s.id for s in self._souvenirs}
+        row = 0
+        while row < len(souvenirs):
+            if souvenirs[row].id in present:
+                if self._souvenirs[row] is not souvenirs[row]:
+                    self._souvenirs[row] = souvenirs[row]
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+                row += 1
+                continue
+            end = row
+            while end < len(souvenirs) and souvenirs[end].id not in present:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._souvenirs[row:row] = souvenirs[row:end]
+            self.endInsertRows()
+            row = end
+        
+        self._reindex()
+        # 已不在列表中的图片不再下载
+        self.cancel_thumbnails(lambda row: True)
+    
+    def _move_after_predecessor(self, sid, target):
+        """把 sid 移到它在目标顺序中的前一项之后"""
+        ids = [s.id for s in self._souvenirs]
+        src = ids.index(sid)
+        rank = target[sid]
+        # 目标顺序中排在它前面、且已在列表中的最近一项
+        pred = -1
+        for i, other in enumerate(ids):
+            if other != sid and target[other] < rank and (pred < 0 or target[ids[pred]] < target[other]):
+                pred = i
+        dest = pred + 1
+        if dest in (src, src + 1):
+            return
+        self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), dest)
+        item = self._souvenirs.pop(src)
+        self._souvenirs.insert(dest if dest < src else dest - 1, item)
+        self.endMoveRows()
+    
+    def _reindex(self):
+        self._rows = {}
+        self._url_rows = {}
+        for row, s in enumerate(self._souvenirs):
+            self._rows[s.id] = row
+            if s.image_url:
+                self._url_rows.setdefault(s.image_url, []).append(row)
+    
+    def refresh(self, souvenir):
+        """某件纪念品被原地更新（如图片生成完成）"""
+        row = self._rows.get(souvenir.id)
+        if row is not None:
+            # 图片地址可能刚出现或变化
+            for rows in self._url_rows.values():
+                if row in rows:
+                    rows.remove(row)
+            if souvenir.image_url:
+                self._url_rows.setdefault(souvenir.image_url, []).append(row)
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+    
+    def _thumbnail(self, souvenir):
+        url = souvenir.image_url
+        if not url:
+            return None
+        pixmap = image_loader.cached(url, QSize(THUMB_SIZE, THUMB_SIZE))
+        if pixmap is None:
+            if url in self._loading:
+                # 之前是预取的，现在已经可见
+                image_loader.promote(self._loading[url])
+            elif not self.paused:
+                self._request(url)
+        return pixmap
+    
+    def _request(self, url, prefetch=False):
+        size = QSize(THUMB_SIZE, THUMB_SIZE)
+        ticket = image_loader.load(url, lambda pixmap, url=url: self._on_image_loaded(url, pixmap),
+                                   owner=self, size=size, prefetch=prefetch)
+        if ticket is not None:
+            self._loading[url] = ticket
+    
+    def request_rows(self, rows, prefetch=False):
+        """
+        加载这些行的缩略图
+        
+        Args:
+            prefetch: 预取（排在可见单元格之后）
+        """
+        size = QSize(THUMB_SIZE, THUMB_SIZE)
+        for row in rows:
+            url = self._souvenirs[row].image_url
+            if not url or image_loader.cached(url, size) is not None:
+                continue
+            if url not in self._loading:
+                self._request(url, prefetch)
+            elif not prefetch:
+                image_loader.promote(self._loading[url])
+    
+    def _on_image_loaded(self, url, pixmap):
+        self._loading.pop(url, None)
+        if pixmap is None:
+            return
+        for row in self._url_rows.get(url, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+    
+    def cancel_thumbnails(self, keep):
+        """
+        取消正在下载的缩略图
+        
+        Args:
+            keep: keep(row) 为 True 的行（如仍可见的）继续下载
+        """
+        for url, ticket in list(self._loading.items()):
+            if not any(keep(row) for row in self._url_rows.get(url, ())):
+                del self._loading[url]
+                image_loader.cancel(ticket)
+
 
-        if image_url and image_url.startswith('http'):
-            self._load_image(image_url)
-    
-    def _load_image(self, url):
-        from PyQt5.QtCore import QUrl
-        request = QNetworkRequest(QUrl(url))
-        reply = self.network_manager.get(request)
-        reply.finished.connect(lambda: self._on_image_loaded(reply))
-    
-    def _on_image_loaded(self, reply):
-        if reply.error() == QNetworkReply.NoError:
-            data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            if not pixmap.isNull():
-                self.image_label.setPixmap(pixmap.scaled(
-                    QSize(70, 70), Qt.KeepAspectRatio, Qt.SmoothTransformation
-                ))
-    
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit(self.souvenir)
-        super().mousePressEvent(event)
+class SouvenirDelegate(QStyledItemDelegate):
+    """纪念品卡片绘制（替代每件纪念品一个 CardWidget）"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._emoji_font = QFont('Segoe UI Emoji', 36)
+        self._name_font = QFont()
+        self._name_font.setBold(True)
+        self._caption_font = QFont()
+        self._small_font = QFont()
+        self._small_font.setPixelSize(10)
+    
+    def sizeHint(self, option, index):
+        return CARD_SIZE
+    
+    def paint(self, painter, option, index):
+        souvenir = index.data(SouvenirRole)
+        if souvenir is None:
+            return
+        config = RARITY_CONFIG.get(souvenir.rarity, RARITY_CONFIG['Common'])
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        rect = QRectF(option.rect).adjusted(1, 1, -1, -1)
+        bg = QColor(config['bg'])
+        if option.state & QStyle.State_MouseOver:
+            bg = bg.lighter(120)
+        painter.setPen(QPen(QColor(config['accent']), 2))
+        painter.setBrush(bg)
+        painter.drawRoundedRect(rect, 16, 16)
+        
+        inner = rect.adjusted(10, 12, -10, -12)
+        
+        # 图片（未加载时显示占位表情）
+        image_rect = QRectF(inner.left(), inner.top(), inner.width(), 90)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            x = image_rect.center().x() - pixmap.width() / 2
+            y = image_rect.center().y() - pixmap.height() / 2
+            painter.drawPixmap(int(x), int(y), pixmap)
+        else:
+            painter.setFont(self._emoji_font)
+            painter.setPen(QColor('#FFFFFF'))
+            painter.drawText(image_rect, Qt.AlignCenter, '🎁')
+        
+        y = image_rect.bottom() + 6
+        painter.setFont(self._name_font)
+        painter.setPen(QColor('#FFFFFF'))
+        painter.drawText(QRectF(inner.left(), y, inner.width(), 20), Qt.AlignCenter, souvenir.name[:12])
+        
+        painter.setFont(self._caption_font)
+        painter.setPen(QColor(config['accent']))
+        painter.drawText(QRectF(inner.left(), y + 22, inner.width(), 18), Qt.AlignCenter,
+                         f"{config['emoji']} {config['name']}")
+        
+        painter.setFont(self._small_font)
+        painter.setPen(QColor('#8B949E'))
+        painter.drawText(QRectF(inner.left(), y + 42, inner.width(), 16), Qt.AlignCenter,
+                         f'🔗 {souvenir.chain_name}')
+        
+        painter.restore()
 
 
 class NFTDetailDialog(QDialog):
     """NFT 详情弹窗"""
     
-    gift_requested = pyqtSignal(dict)
+    gift_requested = pyqtSignal(dict)  # {'souvenir': Souvenir, 'to_friend': Friend}
     
     def __init__(self, souvenir, friends=None, parent=None):
         super().__init__(parent)
@@ -156,8 +383,7 @@ class NFTDetailDialog(QDialog):
         layout.setSpacing(16)
         layout.setContentsMargins(24, 24, 24, 24)
         
-        rarity = self.souvenir.get('rarity', 'Common')
-        config = RARITY_CONFIG.get(rarity, RARITY_CONFIG['Common'])
+        config = RARITY_CONFIG.get(self.souvenir.rarity, RARITY_CONFIG['Common'])
         
         card = CardWidget(self)
         card_layout = QVBoxLayout(card)
@@ -171,27 +397,12 @@ class NFTDetailDialog(QDialog):
         card_layout.addWidget(self.image_label)
         
         # 尝试加载图片
-        images = self.souvenir.get('images', [])
-        image_url = None
-        if images and isinstance(images, list) and len(images) > 0:
-            completed_images = [img for img in images if img.get('status') == 'COMPLETED']
-            if completed_images:
-                image_url = completed_images[0].get('imageUrl') or completed_images[0].get('gatewayUrl')
-            else:
-                image_url = images[0].get('imageUrl') or images[0].get('gatewayUrl')
+        image_url = self.souvenir.image_url
+        if image_url:
+            image_loader.load(image_url, self._on_image_loaded, owner=self,
+                              size=QSize(DETAIL_IMAGE_SIZE, DETAIL_IMAGE_SIZE))
         
-        if not image_url:
-            image_url = self.souvenir.get('imageUrl') or self.souvenir.get('metadataUri')
-
-        if image_url and image_url.startswith('http'):
-            self.network_manager = QNetworkAccessManager(self)
-            from PyQt5.QtCore import QUrl
-            request = QNetworkRequest(QUrl(image_url))
-            reply = self.network_manager.get(request)
-            reply.finished.connect(lambda: self._on_image_loaded(reply))
-        
-        name = self.souvenir.get('name', '纪念品')
-        name_label = SubtitleLabel(name)
+        name_label = SubtitleLabel(self.souvenir.name)
         name_label.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(name_label)
         
@@ -205,16 +416,14 @@ class NFTDetailDialog(QDialog):
         info_layout = QVBoxLayout(info_card)
         info_layout.setSpacing(8)
         
-        token_id = self.souvenir.get('tokenId', 'N/A')
+        token_id = self.souvenir.token_id if self.souvenir.token_id is not None else 'N/A'
         info_layout.addWidget(CaptionLabel(f'🔢 Token ID: #{token_id}'))
         
-        chain_id = self.souvenir.get('chainId', 7001)
-        chain_name = CHAIN_NAMES.get(chain_id, 'Unknown')
-        info_layout.addWidget(CaptionLabel(f'🔗 来源链: {chain_name}'))
+        info_layout.addWidget(CaptionLabel(f'🔗 来源链: {self.souvenir.chain_name}'))
         
-        created_at = self.souvenir.get('createdAt', '')
+        created_at = self.souvenir.created_at
         if created_at:
-            info_layout.addWidget(CaptionLabel(f'📅 获取时间: {created_at[:10]}'))
+            info_layout.addWidget(CaptionLabel(f'📅 获取时间: {created_at:%Y-%m-%d}'))
         
         card_layout.addWidget(info_card)
         
@@ -229,7 +438,7 @@ class NFTDetailDialog(QDialog):
             
             self.friend_combo = ComboBox()
             for friend in self.friends:
-                self.friend_combo.addItem(f"🐸 {friend.get('name', '未知')}")
+                self.friend_combo.addItem(f"🐸 {friend.name}")
             gift_layout.addWidget(self.friend_combo)
             
             gift_btn = PrimaryPushButton(FluentIcon.SEND, '赠送')
@@ -242,31 +451,15 @@ class NFTDetailDialog(QDialog):
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
     
-    def _on_image_loaded(self, reply):
-        from PyQt5.QtGui import QPixmap
-        from PyQt5.QtCore import QSize
-        from PyQt5.QtNetwork import QNetworkReply
-
-        if reply.error() == QNetworkReply.NoError:
-            data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            if not pixmap.isNull():
-                self.image_label.setPixmap(pixmap.scaled(
-                    QSize(120, 120), Qt.KeepAspectRatio, Qt.SmoothTransformation
-                ))
+    def _on_image_loaded(self, pixmap):
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
 
     def _on_gift(self):
         if self.friends and self.friend_combo.currentIndex() >= 0:
             friend = self.friends[self.friend_combo.currentIndex()]
+            # 赠送结果由画廊在请求返回后提示
             self.gift_requested.emit({'souvenir': self.souvenir, 'to_friend': friend})
-            InfoBar.success(
-                title='赠送成功',
-                content=f'已将纪念品赠送给 {friend.get("name")}！',
-                parent=self,
-                position=InfoBarPosition.TOP,
-                duration=2000
-            )
             self.close()
 
 
@@ -289,6 +482,8 @@ class NFTGalleryDialog(QDialog):
         
         self._setup_content()
         self._load_data()
+        entity_store.collection_changed.connect(self._on_collection_changed)
+        entity_store.entity_changed.connect(self._on_entity_changed)
     
     def _setup_content(self):
         layout = QVBoxLayout(self)
@@ -344,23 +539,47 @@ class NFTGalleryDialog(QDialog):
         filter_layout.addStretch()
         layout.addLayout(filter_layout)
         
-        # NFT 网格
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        
-        self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout(self.grid_widget)
-        self.grid_layout.setSpacing(12)
-        
-        scroll.setWidget(self.grid_widget)
-        layout.addWidget(scroll)
+        # NFT 网格（模型/视图，只绘制可见的单元格）
+        self.model = SouvenirListModel(self)
+        
+        self.grid_view = QListView()
+        self.grid_view.setViewMode(QListView.IconMode)
+        self.grid_view.setResizeMode(QListView.Adjust)
+        self.grid_view.setMovement(QListView.Static)
+        self.grid_view.setUniformItemSizes(True)
+        self.grid_view.setSpacing(6)
+        self.grid_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.grid_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.grid_view.setMouseTracking(True)
+        self.grid_view.setCursor(Qt.PointingHandCursor)
+        self.grid_view.setStyleSheet("QListView { border: none; background: transparent; }")
+        self.grid_view.setItemDelegate(SouvenirDelegate(self.grid_view))
+        self.grid_view.setModel(self.model)
+        self.grid_view.clicked.connect(lambda index: self._show_detail(index.data(SouvenirRole)))
+        layout.addWidget(self.grid_view)
+        
+        # 图片只加载可见区域，并沿滚动方向预取一屏；滚动停下后再调整
+        self._scroll_direction = 1
+        self._scroll_value = 0
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(120)
+        self._viewport_timer.timeout.connect(self._update_viewport_images)
+        self.grid_view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        for signal in (self.model.modelReset, self.model.layoutChanged,
+                       self.model.rowsInserted, self.model.rowsRemoved):
+            signal.connect(self._viewport_timer.start)
+        
+        self.empty_label = CaptionLabel('暂无纪念品')
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.hide()
+        layout.addWidget(self.empty_label)
         
         # 底部按钮
         btn_layout = QHBoxLayout()
         
         refresh_btn = PushButton(FluentIcon.SYNC, '刷新')
-        refresh_btn.clicked.connect(self._load_data)
+        refresh_btn.clicked.connect(self._on_refresh)
         btn_layout.addWidget(refresh_btn)
         
         btn_layout.addStretch()
@@ -372,78 +591,140 @@ class NFTGalleryDialog(QDialog):
         layout.addLayout(btn_layout)
     
     def _load_data(self):
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
+        frog_id = self.frog.api_id
         print(f"[NFTGallery] Loading data for frog_id: {frog_id}")
-        self.souvenirs = api_client.get_souvenirs(frog_id)
+        api_client.call_async('get_souvenirs', frog_id,
+                              on_success=self._on_souvenirs_loaded, owner=self)
+        api_client.call_async('get_friends', frog_id,
+                              on_success=self._on_friends_loaded, owner=self)
+    
+    def _on_refresh(self):
+        api_client.invalidate_cache('/souvenirs', '/friends/list')
+        self._load_data()
+    
+    def _on_souvenirs_loaded(self, souvenirs):
+        self.souvenirs = souvenirs
         print(f"[NFTGallery] Souvenirs count: {len(self.souvenirs)}")
-        self.friends = api_client.get_friends(frog_id)
-        self._update_display()
+        self.model.set_souvenirs(souvenirs)
+        self._update_stats()
+    
+    def _on_friends_loaded(self, friends):
+        self.friends = friends
+    
+    def done(self, result):
+        """关闭时断开全局数据信号，已关闭的对话框不再随数据变化刷新"""
+        disconnect_all(
+            (entity_store.collection_changed, self._on_collection_changed),
+            (entity_store.entity_changed, self._on_entity_changed),
+        )
+        super().done(result)
+    
+    def _on_collection_changed(self, kind, scope):
+        if scope != self.frog.api_id:
+            return
+        if kind == 'souvenir':
+            self._on_souvenirs_loaded(entity_store.collection('souvenir', scope))
+        elif kind == 'friend':
+            self.friends = entity_store.collection('friend', scope)
+    
+    def _on_entity_changed(self, kind, souvenir):
+        """单件纪念品更新：只刷新对应单元格"""
+        if kind == 'souvenir':
+            self.model.refresh(souvenir)
     
     def _on_rarity_filter(self, text):
         rarity_map = {'全部': 'all', '普通': 'Common', '罕见': 'Uncommon', 
                       '稀有': 'Rare', '史诗': 'Epic', '传说': 'Legendary'}
         self.rarity_filter = rarity_map.get(text, 'all')
-        self._update_display()
+        self._apply_filters()
     
     def _on_chain_filter(self, text):
         chain_map = {'全部': 'all', 'ZetaChain': 7001, 'BSC': 97, 'Ethereum': 11155111}
         self.chain_filter = chain_map.get(text, 'all')
-        self._update_display()
+        self._apply_filters()
     
     def _on_sort(self, text):
         sort_map = {'最新获取': 'newest', '最早获取': 'oldest', 
                     '稀有度高': 'rarity_desc', '稀有度低': 'rarity_asc'}
         self.sort_by = sort_map.get(text, 'newest')
-        self._update_display()
+        self.model.set_sort(self.sort_by)
     
-    def _update_display(self):
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        filtered = self.souvenirs[:]
-        
-        if self.rarity_filter != 'all':
-            filtered = [s for s in filtered if s.get('rarity') == self.rarity_filter]
-        
-        if self.chain_filter != 'all':
-            filtered = [s for s in filtered if s.get('chainId') == self.chain_filter]
-        
-        rarity_order = {'Common': 1, 'Uncommon': 2, 'Rare': 3, 'Epic': 4, 'Legendary': 5}
-        
-        if self.sort_by == 'newest':
-            filtered.sort(key=lambda x: x.get('createdAt', ''), reverse=True)
-        elif self.sort_by == 'oldest':
-            filtered.sort(key=lambda x: x.get('createdAt', ''))
-        elif self.sort_by == 'rarity_desc':
-            filtered.sort(key=lambda x: rarity_order.get(x.get('rarity', 'Common'), 1), reverse=True)
-        elif self.sort_by == 'rarity_asc':
-            filtered.sort(key=lambda x: rarity_order.get(x.get('rarity', 'Common'), 1))
-        
-        total = len(self.souvenirs)
-        filtered_count = len(filtered)
+    def _apply_filters(self):
+        self.model.set_filters(self.rarity_filter, self.chain_filter)
+        self._update_stats()
+    
+    def _update_stats(self):
+        collection = self.model.collection
+        total = len(collection)
+        filtered_count = collection.count(self.rarity_filter, self.chain_filter)
         self.stats_label.setText(f'🎁 收藏: {total} 件' + (f' (显示 {filtered_count})' if filtered_count != total else ''))
-        
-        rarity_counts = {}
-        for s in self.souvenirs:
-            r = s.get('rarity', 'Common')
-            rarity_counts[r] = rarity_counts.get(r, 0) + 1
+        self.empty_label.setVisible(filtered_count == 0)
         
         rarity_text = ' | '.join([f"{RARITY_CONFIG.get(r, {}).get('emoji', '⚪')}{c}" 
-                                   for r, c in rarity_counts.items()])
+                                   for r, c in collection.rarity_counts.items()])
         self.rarity_stats.setText(rarity_text)
-        
-        cols = 4
-        for i, souvenir in enumerate(filtered):
-            card = NFTCard(souvenir)
-            card.clicked.connect(self._show_detail)
-            self.grid_layout.addWidget(card, i // cols, i % cols)
-        
-        if not filtered:
-            empty_label = CaptionLabel('暂无纪念品')
-            empty_label.setAlignment(Qt.AlignCenter)
-            self.grid_layout.addWidget(empty_label, 0, 0, 1, cols)
+    
+    def _on_scrolled(self, value):
+        delta = value - self._scroll_value
+        if delta:
+            self._scroll_direction = 1 if delta > 0 else -1
+            self._scroll_value = value
+        # 快速滚动（拖动滚动条、甩动）时掠过的单元格不下载
+        if abs(delta) >= self.grid_view.viewport().height() // 2:
+            self.model.paused = True
+        self._viewport_timer.start()
+    
+    def _visible_rows(self):
+        """可见的行范围 (first, last)，没有时返回 None"""
+        count = self.model.rowCount()
+        if not count:
+            return None
+        height = self.grid_view.viewport().height()
+        rect = lambda row: self.grid_view.visualRect(self.model.index(row))
+        
+        # 网格按行优先排列，行号越大 y 越大，二分查找首尾
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rect(mid).bottom() < 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        lo, hi = first, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rect(mid).top() < height:
+                lo = mid + 1
+            else:
+                hi = mid
+        last = lo - 1
+        return (first, last) if first <= last else None
+    
+    def _update_viewport_images(self):
+        """取消离开视野的下载，加载可见区域并沿滚动方向预取下一屏"""
+        self.model.paused = False
+        visible = self._visible_rows()
+        if visible is None:
+            self.model.cancel_thumbnails(lambda row: False)
+            return
+        first, last = visible
+        screen = last - first + 1
+        if self._scroll_direction > 0:
+            ahead = range(last + 1, min(self.model.rowCount(), last + 1 + screen))
+        else:
+            ahead = range(first - 1, max(-1, first - 1 - screen), -1)
+        lo, hi = first, last
+        if ahead:
+            lo, hi = min(lo, ahead[-1]), max(hi, ahead[-1])
+        
+        self.model.cancel_thumbnails(lambda row: lo <= row <= hi)
+        self.model.request_rows(range(first, last + 1))
+        self.model.request_rows(ahead, prefetch=True)
+    
+    def hideEvent(self, event):
+        self.model.cancel_thumbnails(lambda row: False)
+        super().hideEvent(event)
     
     def _show_detail(self, souvenir):
         dialog = NFTDetailDialog(souvenir, self.friends, self)
@@ -453,9 +734,19 @@ class NFTGalleryDialog(QDialog):
     def _on_gift_souvenir(self, data):
         souvenir = data.get('souvenir')
         friend = data.get('to_friend')
-        try:
-            result = api_client.gift_souvenir(souvenir.get('id'), friend.get('id'))
-            if result.get('success'):
-                self._load_data()
-        except Exception as e:
-            print(f"Gift failed: {e}")
+        # 成功后 entity_store 会移除该纪念品并通知刷新，无需重新拉取
+        api_client.call_async('gift_souvenir', souvenir.id, friend.id,
+                              on_success=lambda result: self._on_gift_done(result, friend),
+                              on_error=self._on_gift_error, owner=self)
+    
+    def _on_gift_done(self, result, friend):
+        if result.get('success'):
+            InfoBar.success('赠送成功', f'已将纪念品赠送给 {friend.name}！', parent=self,
+                          position=InfoBarPosition.TOP, duration=2000)
+        else:
+            InfoBar.error('赠送失败', result.get('error', '未知错误'), parent=self,
+                        position=InfoBarPosition.TOP, duration=3000)
+    
+    def _on_gift_error(self, error):
+        InfoBar.error('赠送失败', str(error), parent=self,
+                    position=InfoBarPosition.TOP, duration=3000)
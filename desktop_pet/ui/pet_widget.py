@@ -5,7 +5,7 @@ ZetaFrog Desktop Pet - 主窗口
 """
 
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QApplication, QMenu, QAction,
+    QWidget, QVBoxLayout, QApplication, QMenu, QAction, QActionGroup,
     QSystemTrayIcon, QMessageBox, QInputDialog, QLabel
 )
 from PyQt5.QtCore import Qt, QPoint, QTimer
@@ -15,8 +15,14 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import FrogState, WINDOW_SIZE
+from config import FrogState, WINDOW_SIZE, PERFORMANCE_PROFILES
 from ui.components.frog_svg import FrogSvgWidget
+from services.snapshot_store import snapshot_store
+from services.entity_store import entity_store
+from services.realtime_client import realtime_client
+from services.tx_tracker import tx_tracker
+from services.performance_profile import profile_manager, AUTO
+from models import Frog
 
 
 class PetWidget(QWidget):
@@ -49,6 +55,16 @@ class PetWidget(QWidget):
         
         # 初始位置：屏幕右下角
         self._move_to_corner()
+        
+        # 青蛙数据变化（旅行出发、刷新等）时局部更新，不再整体重新拉取
+        entity_store.entity_changed.connect(self._on_entity_changed)
+        entity_store.collection_changed.connect(self._on_collection_changed)
+        
+        # 链上交易确认（包括上次退出前未确认的）
+        tx_tracker.tx_confirmed.connect(self._on_tx_confirmed)
+        
+        # 先用本地快照恢复上次的钱包和青蛙，再后台同步
+        self._restore_session()
     
     def _setup_ui(self):
         """设置 UI"""
@@ -173,6 +189,21 @@ class PetWidget(QWidget):
         
         tray_menu.addSeparator()
         
+        # 性能模式（即时生效）
+        profile_menu = tray_menu.addMenu('⚡ 性能模式')
+        profile_group = QActionGroup(self)
+        self._profile_actions = {}
+        for mode in [AUTO] + list(PERFORMANCE_PROFILES):
+            action = QAction(self._profile_action_text(mode), self, checkable=True)
+            action.setChecked(mode == profile_manager.mode)
+            action.triggered.connect(lambda checked, m=mode: profile_manager.set_mode(m))
+            profile_group.addAction(action)
+            profile_menu.addAction(action)
+            self._profile_actions[mode] = action
+        profile_manager.profile_changed.connect(self._on_profile_changed)
+        
+        tray_menu.addSeparator()
+        
         # 退出
         quit_action = QAction('❌ 退出', self)
         quit_action.triggered.connect(QApplication.quit)
@@ -215,6 +246,18 @@ class PetWidget(QWidget):
         y = screen.height() - self.height() - 100
         self.move(x, y)
     
+    @staticmethod
+    def _profile_action_text(mode):
+        if mode == AUTO:
+            current = PERFORMANCE_PROFILES[profile_manager.profile]['name']
+            return f'🔄 自动（当前: {current}）'
+        return PERFORMANCE_PROFILES[mode]['name']
+    
+    def _on_profile_changed(self, name, profile):
+        """生效的配置变化（手动切换或电源状态变化）"""
+        self._profile_actions[AUTO].setText(self._profile_action_text(AUTO))
+        self._profile_actions[profile_manager.mode].setChecked(True)
+    
     def _on_tray_activated(self, reason):
         """托盘图标被点击"""
         if reason == QSystemTrayIcon.Trigger:
@@ -236,6 +279,8 @@ class PetWidget(QWidget):
         if dialog.exec_():
             # 连接成功
             self._wallet_address = wallet_manager.address
+            snapshot_store.save('session', 'wallet', self._wallet_address)
+            realtime_client.set_wallet(self._wallet_address)
             self._load_frogs()
             
             # 显示签名能力信息
@@ -254,68 +299,131 @@ class PetWidget(QWidget):
                     2000
                 )
     
+    def _restore_session(self):
+        """冷启动：从快照恢复上次的钱包（只读）和青蛙列表"""
+        address = snapshot_store.load('session', 'wallet')
+        if not address:
+            return
+        
+        from services.wallet_manager import wallet_manager
+        if not wallet_manager.connect_readonly(address):
+            return
+        self._wallet_address = wallet_manager.address
+        realtime_client.set_wallet(self._wallet_address)
+        
+        frogs = [Frog(f) for f in snapshot_store.load('frogs', self._wallet_address, [])]
+        frogs = entity_store.merge('frog', frogs, scope=self._wallet_address)
+        if frogs:
+            self._frogs = frogs
+            realtime_client.set_frogs(f.token_id for f in frogs)
+            self._current_frog = self._pick_frog(frogs, snapshot_store.load('session', 'frog'))
+            self._update_frog_info()
+            self._update_switch_menu()
+        
+        # 后台与服务端对账，不弹欢迎消息；变化通过 entity_store 通知
+        from services.api_client import api_client
+        api_client.call_async('get_frogs_by_owner', self._wallet_address, owner=self)
+    
+    @staticmethod
+    def _pick_frog(frogs, token_id):
+        """按 tokenId 找回之前选中的青蛙，找不到时取第一只"""
+        if token_id is not None:
+            for frog in frogs:
+                if str(frog.token_id) == str(token_id):
+                    return frog
+        return frogs[0] if frogs else None
+    
+    def _apply_frogs(self, frogs):
+        """更新青蛙列表，尽量保留当前选中的青蛙"""
+        self._frogs = frogs
+        realtime_client.set_frogs(f.token_id for f in frogs)
+        if not frogs:
+            return
+        current_id = self._current_frog.token_id if self._current_frog else None
+        self._current_frog = self._pick_frog(frogs, current_id)
+        self._update_frog_info()
+        self._update_switch_menu()
+    
+    def _on_entity_changed(self, kind, entity):
+        """某只青蛙的数据被原地更新"""
+        if kind != 'frog' or not any(entity is f for f in self._frogs):
+            return
+        if entity is self._current_frog:
+            self._update_frog_info()
+        self._update_switch_menu()
+    
+    def _on_collection_changed(self, kind, scope):
+        """钱包下的青蛙列表发生变化"""
+        if kind == 'frog' and self._wallet_address and scope == self._wallet_address.lower():
+            self._apply_frogs(entity_store.collection('frog', scope))
+    
     def _load_frogs(self):
-        """加载用户的青蛙"""
+        """加载用户的青蛙（后台请求，不阻塞动画）"""
         if not self._wallet_address:
             return
         
         from services.api_client import api_client
         
-        try:
-            frogs = api_client.get_frogs_by_owner(self._wallet_address)
-            self._frogs = frogs
+        api_client.call_async(
+            'get_frogs_by_owner', self._wallet_address,
+            on_success=self._on_frogs_loaded,
+            on_error=self._on_frogs_load_failed,
+            owner=self
+        )
+    
+    def _on_frogs_loaded(self, frogs):
+        """青蛙列表加载完成"""
+        self._apply_frogs(frogs)
+        
+        if frogs:
+            self.tray_icon.showMessage(
+                'ZetaFrog',
+                f'欢迎回来！找到 {len(frogs)} 只青蛙',
+                QSystemTrayIcon.Information,
+                2000
+            )
+        else:
+            # 没有青蛙，询问是否铸造
+            from services.wallet_manager import wallet_manager
             
-            if frogs:
-                self._current_frog = frogs[0]
-                self._update_frog_info()
-                self._update_switch_menu()
-                
+            if wallet_manager.can_sign:
+                # 可以签名，询问是否铸造
+                reply = QMessageBox.question(
+                    self,
+                    '🐸 欢迎！',
+                    '您还没有 ZetaFrog\n\n是否现在铸造一只？',
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.Yes
+                )
+                if reply == QMessageBox.Yes:
+                    self._show_mint()
+            else:
                 self.tray_icon.showMessage(
                     'ZetaFrog',
-                    f'欢迎回来！找到 {len(frogs)} 只青蛙',
-                    QSystemTrayIcon.Information,
-                    2000
+                    '未找到青蛙\n\n请使用私钥/助记词连接后铸造',
+                    QSystemTrayIcon.Warning,
+                    3000
                 )
-            else:
-                # 没有青蛙，询问是否铸造
-                from services.wallet_manager import wallet_manager
-                
-                if wallet_manager.can_sign:
-                    # 可以签名，询问是否铸造
-                    reply = QMessageBox.question(
-                        self,
-                        '🐸 欢迎！',
-                        '您还没有 ZetaFrog\n\n是否现在铸造一只？',
-                        QMessageBox.Yes | QMessageBox.No,
-                        QMessageBox.Yes
-                    )
-                    if reply == QMessageBox.Yes:
-                        self._show_mint()
-                else:
-                    self.tray_icon.showMessage(
-                        'ZetaFrog',
-                        '未找到青蛙\n\n请使用私钥/助记词连接后铸造',
-                        QSystemTrayIcon.Warning,
-                        3000
-                    )
-        except Exception as e:
-            self.tray_icon.showMessage(
-                'ZetaFrog',
-                f'加载失败: {str(e)}',
-                QSystemTrayIcon.Critical,
-                3000
-            )
+    
+    def _on_frogs_load_failed(self, error):
+        """青蛙列表加载失败"""
+        self.tray_icon.showMessage(
+            'ZetaFrog',
+            f'加载失败: {str(error)}',
+            QSystemTrayIcon.Critical,
+            3000
+        )
     
     def _update_frog_info(self):
         """更新青蛙信息显示"""
         if self._current_frog:
-            name = self._current_frog.get('name', '未命名')
-            status = self._current_frog.get('status', 'Idle')
+            name = self._current_frog.name
+            status = self._current_frog.status
             status_text = {'Idle': '空闲', 'Traveling': '旅行中', 'Returning': '返回中'}.get(status, status)
             self.frog_info_action.setText(f'🐸 {name} - {status_text}')
             
             # 更新状态
-            if status == 'Traveling':
+            if self._current_frog.is_traveling:
                 self.frog_widget.state = FrogState.TRAVELING
                 self.frog_widget.set_traveling(True)
             else:
@@ -327,20 +435,19 @@ class PetWidget(QWidget):
         self.switch_frog_menu.clear()
         
         for frog in self._frogs:
-            name = frog.get('name', '未命名')
-            token_id = frog.get('tokenId', '?')
-            action = QAction(f'🐸 {name} (#{token_id})', self)
+            action = QAction(f'🐸 {frog.name} (#{frog.token_id})', self)
             action.triggered.connect(lambda checked, f=frog: self._switch_frog(f))
             self.switch_frog_menu.addAction(action)
     
     def _switch_frog(self, frog):
         """切换当前青蛙"""
         self._current_frog = frog
+        snapshot_store.save('session', 'frog', frog.token_id)
         self._update_frog_info()
         
         self.tray_icon.showMessage(
             'ZetaFrog',
-            f'已切换到 {frog.get("name", "未命名")}',
+            f'已切换到 {frog.name}',
             QSystemTrayIcon.Information,
             1500
         )
@@ -353,7 +460,7 @@ class PetWidget(QWidget):
         from ui.travel_dialog import TravelDialog
         dialog = TravelDialog(self._current_frog, self._wallet_address, self)
         dialog.exec_()
-        self._load_frogs()  # 刷新状态
+        dialog.deleteLater()
     
     def _show_friends(self):
         """显示好友对话框"""
@@ -363,6 +470,7 @@ class PetWidget(QWidget):
         from ui.friends_dialog import FriendsDialog
         dialog = FriendsDialog(self._current_frog, self)
         dialog.exec_()
+        dialog.deleteLater()
         
         # 恢复状态
         if hasattr(self, '_last_state'):
@@ -376,6 +484,7 @@ class PetWidget(QWidget):
         from ui.badges_dialog import BadgesDialog
         dialog = BadgesDialog(self._current_frog, self._wallet_address, self)
         dialog.exec_()
+        dialog.deleteLater()
         
         # 恢复状态
         if hasattr(self, '_last_state'):
@@ -389,6 +498,7 @@ class PetWidget(QWidget):
         from ui.nft_gallery import NFTGalleryDialog
         dialog = NFTGalleryDialog(self._current_frog, self._wallet_address, self)
         dialog.exec_()
+        dialog.deleteLater()
         
         # 恢复动作
         self.frog_widget.set_souvenir(False)
@@ -401,7 +511,7 @@ class PetWidget(QWidget):
         from ui.team_travel_dialog import TeamTravelDialog
         dialog = TeamTravelDialog(self._current_frog, self._wallet_address, self)
         dialog.exec_()
-        self._load_frogs()  # 刷新状态
+        dialog.deleteLater()
     
     def _show_synthesis(self):
         """显示纪念品合成对话框"""
@@ -411,6 +521,7 @@ class PetWidget(QWidget):
         from ui.synthesis_dialog import SynthesisDialog
         dialog = SynthesisDialog(self._current_frog, self)
         dialog.exec_()
+        dialog.deleteLater()
     
     def _show_badge_sets(self):
         """显示徽章套装对话框"""
@@ -420,6 +531,7 @@ class PetWidget(QWidget):
         from ui.badge_sets_dialog import BadgeSetsDialog
         dialog = BadgeSetsDialog(self._current_frog, self)
         dialog.exec_()
+        dialog.deleteLater()
     
     def _show_mint(self):
         """显示铸造对话框"""
@@ -440,15 +552,23 @@ class PetWidget(QWidget):
         
         from ui.mint_dialog import MintDialog
         dialog = MintDialog(self)
-        if dialog.exec_():
-            # 铸造成功，刷新青蛙列表
-            self._load_frogs()
-            self.tray_icon.showMessage(
-                'ZetaFrog',
-                '🎉 铸造成功！新青蛙已添加',
-                QSystemTrayIcon.Information,
-                3000
-            )
+        # 铸造确认后由 _on_tx_confirmed 刷新青蛙列表（关闭对话框后也会继续跟踪）
+        dialog.exec_()
+        dialog.deleteLater()
+    
+    def _on_tx_confirmed(self, record):
+        """铸造交易上链：刷新青蛙列表"""
+        if record['kind'] != 'mint':
+            return
+        from services.api_client import api_client
+        api_client.invalidate_cache('/frogs/owner')
+        self._load_frogs()
+        self.tray_icon.showMessage(
+            'ZetaFrog',
+            '🎉 铸造成功！新青蛙已添加',
+            QSystemTrayIcon.Information,
+            3000
+        )
     
     # ===== 交互特效槽函数 =====
     
@@ -547,7 +667,7 @@ class PetWidget(QWidget):
         from ui.main_panel import MainPanelDialog
         dialog = MainPanelDialog(self._current_frog, self._wallet_address, self)
         dialog.exec_()
-        self._load_frogs()  # 刷新状态
+        dialog.deleteLater()
     
     def contextMenuEvent(self, event):
         """右键菜单"""
@@ -555,8 +675,7 @@ class PetWidget(QWidget):
         
         # 状态信息
         if self._current_frog:
-            name = self._current_frog.get('name', '未命名')
-            info_action = menu.addAction(f'🐸 {name}')
+            info_action = menu.addAction(f'🐸 {self._current_frog.name}')
             info_action.setEnabled(False)
         else:
             menu.addAction('🐸 未登录').setEnabled(False)
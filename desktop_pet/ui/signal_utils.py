@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+ZetaFrog Desktop Pet - 信号连接工具
+
+对话框关闭时需要断开与全局单例（entity_store、realtime_client 等）的连接，
+否则单例持有槽函数的引用，已关闭的对话框既不会被释放，也会继续响应事件。
+"""
+
+
+def disconnect_all(*connections):
+    """
+    逐个断开 (信号, 槽) 连接
+
+    某个连接已经断开（或发送方已销毁）时跳过，不影响其余连接。
+    """
+    for signal, slot in connections:
+        try:
+            signal.disconnect(slot)
+        except (TypeError, RuntimeError):
+            pass  # 已经断开
@@ -20,6 +20,9 @@ import os
 import random
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.api_client import api_client
+from services.entity_store import entity_store
+from ui.signal_utils import disconnect_all
+from models import SouvenirIndex
 
 
 RARITY_CONFIG = {
@@ -76,11 +79,9 @@ class SouvenirSlot(CardWidget):
     
     def _update_display(self):
         if self.souvenir:
-            rarity = self.souvenir.get('rarity', 'Common')
-            config = RARITY_CONFIG.get(rarity, RARITY_CONFIG['Common'])
+            config = RARITY_CONFIG.get(self.souvenir.rarity, RARITY_CONFIG['Common'])
             self.icon_label.setText('🎁')
-            name = self.souvenir.get('name', '纪念品')[:6]
-            self.name_label.setText(name)
+            self.name_label.setText(self.souvenir.name[:6])
             self.name_label.setStyleSheet(f"color: {config['accent']};")
             self.setStyleSheet(f"SouvenirSlot {{ background: {config['bg']}; border: 2px solid {config['accent']}; border-radius: 12px; }}")
         else:
@@ -96,11 +97,15 @@ class SouvenirSlot(CardWidget):
 
 
 class SouvenirSelectDialog(QDialog):
-    selected = pyqtSignal(dict)
+    selected = pyqtSignal(object)
     
-    def __init__(self, souvenirs, exclude_ids=None, rarity_filter=None, parent=None):
+    def __init__(self, collection, exclude_ids=None, rarity_filter=None, parent=None):
+        """
+        Args:
+            collection: SouvenirIndex（由调用方在数据加载时构建）
+        """
         super().__init__(parent)
-        self.souvenirs = souvenirs
+        self.collection = collection
         self.exclude_ids = exclude_ids or []
         self.rarity_filter = rarity_filter
         
@@ -126,9 +131,8 @@ class SouvenirSelectDialog(QDialog):
         grid_layout = QGridLayout(grid_widget)
         grid_layout.setSpacing(10)
         
-        available = [s for s in self.souvenirs if s.get('id') not in self.exclude_ids]
-        if self.rarity_filter:
-            available = [s for s in available if s.get('rarity') == self.rarity_filter]
+        available = self.collection.select(rarity=self.rarity_filter or 'all',
+                                           exclude_ids=self.exclude_ids)
         
         cols = 4
         for i, souvenir in enumerate(available):
@@ -148,8 +152,7 @@ class SouvenirSelectDialog(QDialog):
         layout.addWidget(close_btn)
     
     def _create_souvenir_card(self, souvenir):
-        rarity = souvenir.get('rarity', 'Common')
-        config = RARITY_CONFIG.get(rarity, RARITY_CONFIG['Common'])
+        config = RARITY_CONFIG.get(souvenir.rarity, RARITY_CONFIG['Common'])
         
         card = CardWidget()
         card.setFixedSize(100, 100)
@@ -164,7 +167,7 @@ class SouvenirSelectDialog(QDialog):
         icon.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon)
         
-        name = CaptionLabel(souvenir.get('name', '纪念品')[:6])
+        name = CaptionLabel(souvenir.name[:6])
         name.setAlignment(Qt.AlignCenter)
         layout.addWidget(name)
         
@@ -181,6 +184,7 @@ class SynthesisDialog(QDialog):
         super().__init__(parent)
         self.frog = frog
         self.souvenirs = []
+        self.collection = SouvenirIndex()
         self.slots = []
         self.current_rarity = None
         
@@ -190,6 +194,7 @@ class SynthesisDialog(QDialog):
         
         self._setup_content()
         self._load_data()
+        entity_store.collection_changed.connect(self._on_collection_changed)
     
     def _setup_content(self):
         layout = QVBoxLayout(self)
@@ -255,8 +260,32 @@ class SynthesisDialog(QDialog):
         layout.addWidget(close_btn)
     
     def _load_data(self):
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        self.souvenirs = api_client.get_souvenirs(frog_id)
+        api_client.call_async('get_souvenirs', self.frog.api_id,
+                              on_success=self._on_souvenirs_loaded, owner=self)
+    
+    def _on_souvenirs_loaded(self, souvenirs):
+        self.souvenirs = souvenirs
+        self.collection = SouvenirIndex(souvenirs)
+    
+    def done(self, result):
+        """关闭时断开全局数据信号，已关闭的对话框不再随数据变化刷新"""
+        disconnect_all((entity_store.collection_changed, self._on_collection_changed))
+        super().done(result)
+    
+    def _on_collection_changed(self, kind, scope):
+        """纪念品增减（如在画廊中赠送）：同步列表并清掉已不存在的槽位"""
+        if kind != 'souvenir' or scope != self.frog.api_id:
+            return
+        self.souvenirs = entity_store.collection('souvenir', scope)
+        self.collection = SouvenirIndex(self.souvenirs)
+        remaining = {id(s) for s in self.souvenirs}
+        changed = False
+        for slot in self.slots:
+            if slot.souvenir is not None and id(slot.souvenir) not in remaining:
+                slot.clear()
+                changed = True
+        if changed:
+            self._update_preview()
     
     def _on_slot_clicked(self, index):
         if self.slots[index].souvenir:
@@ -264,14 +293,14 @@ class SynthesisDialog(QDialog):
             self._update_preview()
             return
         
-        exclude_ids = [s.souvenir.get('id') for s in self.slots if s.souvenir]
+        exclude_ids = [s.souvenir.id for s in self.slots if s.souvenir]
         rarity_filter = None
         for slot in self.slots:
             if slot.souvenir:
-                rarity_filter = slot.souvenir.get('rarity')
+                rarity_filter = slot.souvenir.rarity
                 break
         
-        dialog = SouvenirSelectDialog(self.souvenirs, exclude_ids, rarity_filter, self)
+        dialog = SouvenirSelectDialog(self.collection, exclude_ids, rarity_filter, self)
         dialog.selected.connect(lambda s: self._on_souvenir_selected(index, s))
         dialog.exec_()
     
@@ -294,7 +323,7 @@ class SynthesisDialog(QDialog):
             self.current_rarity = None
             return
         
-        rarity = filled_slots[0].souvenir.get('rarity', 'Common')
+        rarity = filled_slots[0].souvenir.rarity
         self.current_rarity = rarity
         config = RARITY_CONFIG.get(rarity, RARITY_CONFIG['Common'])
         
@@ -19,6 +19,8 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.api_client import api_client
+from services.entity_store import entity_store
+from ui.signal_utils import disconnect_all
 
 
 TEAM_BONUS = {
@@ -35,7 +37,7 @@ CHAIN_OPTIONS = [
 
 
 class FriendInviteCard(CardWidget):
-    toggled = pyqtSignal(dict, bool)
+    toggled = pyqtSignal(object, bool)
     
     def __init__(self, friend, parent=None):
         super().__init__(parent)
@@ -56,12 +58,11 @@ class FriendInviteCard(CardWidget):
         avatar.setAlignment(Qt.AlignCenter)
         layout.addWidget(avatar)
         
-        name = self.friend.get('name', '未知')[:8]
-        self.name_label = CaptionLabel(name)
+        self.name_label = CaptionLabel(self.friend.name[:8])
         self.name_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.name_label)
         
-        status = self.friend.get('status', 'Idle')
+        status = self.friend.status
         status_text = '🏠 空闲' if status == 'Idle' else '✈️ 旅行中'
         self.status_label = CaptionLabel(status_text)
         self.status_label.setStyleSheet('color: #8B949E; font-size: 10px;')
@@ -102,6 +103,7 @@ class TeamTravelDialog(QDialog):
         
         self._setup_content()
         self._load_data()
+        entity_store.entity_changed.connect(self._on_entity_changed)
     
     def _setup_content(self):
         layout = QVBoxLayout(self)
@@ -125,7 +127,7 @@ class TeamTravelDialog(QDialog):
         team_card = CardWidget(self)
         team_layout = QHBoxLayout(team_card)
         team_layout.addWidget(BodyLabel('🐸 队伍:'))
-        my_frog_label = CaptionLabel(f"🐸 {self.frog.get('name', '我')} (队长)")
+        my_frog_label = CaptionLabel(f"🐸 {self.frog.name} (队长)")
         my_frog_label.setStyleSheet('color: #F59E0B;')
         team_layout.addWidget(my_frog_label)
         team_layout.addStretch()
@@ -197,10 +199,29 @@ class TeamTravelDialog(QDialog):
         layout.addWidget(close_btn)
     
     def _load_data(self):
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        self.friends = api_client.get_friends(frog_id)
+        api_client.call_async('get_friends', self.frog.api_id,
+                              on_success=self._on_friends_loaded, owner=self)
+    
+    def _on_friends_loaded(self, friends):
+        self.friends = friends
         self._display_friends()
     
+    def done(self, result):
+        """关闭时断开全局数据信号，已关闭的对话框不再随数据变化刷新"""
+        disconnect_all((entity_store.entity_changed, self._on_entity_changed))
+        super().done(result)
+    
+    def _on_entity_changed(self, kind, entity):
+        """好友状态变化（如出发旅行）时更新对应卡片"""
+        if kind != 'friend':
+            return
+        for card in self.friend_cards:
+            if card.friend is entity:
+                busy = entity.status != 'Idle'
+                card.status_label.setText('✈️ 旅行中' if busy else '🏠 空闲')
+                card.setEnabled(not busy)
+                break
+    
     def _display_friends(self):
         while self.friends_layout.count():
             item = self.friends_layout.takeAt(0)
@@ -225,7 +246,7 @@ class TeamTravelDialog(QDialog):
         if selected:
             if len(self.selected_friends) >= 3:
                 for card in self.friend_cards:
-                    if card.friend.get('id') == friend.get('id'):
+                    if card.friend.id == friend.id:
                         card.selected = False
                         card._update_style()
                         break
@@ -235,7 +256,7 @@ class TeamTravelDialog(QDialog):
             self.selected_friends.append(friend)
         else:
             self.selected_friends = [f for f in self.selected_friends 
-                                     if f.get('id') != friend.get('id')]
+                                     if f.id != friend.id]
         self._update_bonus()
     
     def _update_bonus(self):
@@ -260,17 +281,23 @@ class TeamTravelDialog(QDialog):
         team_size = len(self.selected_friends) + 1
         bonus = TEAM_BONUS.get(team_size, {'xp': 0, 'rarity': 0, 'name': '单人'})
         
-        try:
-            frog_id = self.frog.get('tokenId') or self.frog.get('id')
-            result = api_client.start_travel(frog_id, 'TEAM', chain['name'].lower(), duration)
-            
-            if result.get('success'):
-                InfoBar.success('成功', f"组队旅行开始！加成: XP +{bonus['xp']}%", parent=self,
-                               position=InfoBarPosition.TOP, duration=3000)
-                self.close()
-            else:
-                InfoBar.error('失败', result.get('error', '未知错误'), parent=self,
-                            position=InfoBarPosition.TOP, duration=2000)
-        except Exception as e:
-            InfoBar.error('错误', str(e), parent=self,
+        # 请求返回前禁用按钮，避免重复出发
+        self.start_btn.setEnabled(False)
+        api_client.call_async('start_travel', self.frog.api_id, 'TEAM', chain['name'].lower(), duration,
+                              on_success=lambda result: self._on_travel_started(result, bonus),
+                              on_error=self._on_travel_error, owner=self)
+    
+    def _on_travel_started(self, result, bonus):
+        if result.get('success'):
+            InfoBar.success('成功', f"组队旅行开始！加成: XP +{bonus['xp']}%", parent=self,
+                           position=InfoBarPosition.TOP, duration=3000)
+            self.close()
+        else:
+            self.start_btn.setEnabled(True)
+            InfoBar.error('失败', result.get('error', '未知错误'), parent=self,
                         position=InfoBarPosition.TOP, duration=2000)
+    
+    def _on_travel_error(self, error):
+        self.start_btn.setEnabled(True)
+        InfoBar.error('错误', str(error), parent=self,
+                    position=InfoBarPosition.TOP, duration=2000)
@@ -54,16 +54,12 @@ class TravelDialog(QDialog):
         info_layout.setContentsMargins(20, 16, 20, 16)
         info_layout.setSpacing(12)
         
-        name = self.frog.get('name', '未命名')
-        status = self.frog.get('status', 'Idle')
-        travels = self.frog.get('totalTravels', 0)
-        level = self.frog.get('level', 1)
-        
-        info_layout.addRow(CaptionLabel('名称:'), BodyLabel(f'🐸 {name}'))
-        status_text = {'Idle': '🏠 空闲', 'Traveling': '✈️ 旅行中'}.get(status, status)
+        frog = self.frog
+        info_layout.addRow(CaptionLabel('名称:'), BodyLabel(f'🐸 {frog.name}'))
+        status_text = {'Idle': '🏠 空闲', 'Traveling': '✈️ 旅行中'}.get(frog.status, frog.status)
         info_layout.addRow(CaptionLabel('状态:'), BodyLabel(status_text))
-        info_layout.addRow(CaptionLabel('等级:'), BodyLabel(f'⭐ Lv.{level}'))
-        info_layout.addRow(CaptionLabel('旅行次数:'), BodyLabel(f'🧳 {travels} 次'))
+        info_layout.addRow(CaptionLabel('等级:'), BodyLabel(f'⭐ Lv.{frog.level}'))
+        info_layout.addRow(CaptionLabel('旅行次数:'), BodyLabel(f'🧳 {frog.total_travels} 次'))
         
         layout.addWidget(info_card)
         
@@ -134,7 +130,7 @@ class TravelDialog(QDialog):
         layout.addWidget(param_card)
         layout.addStretch()
         
-        if self.frog.get('status') != 'Idle':
+        if self.frog.status != 'Idle':
             self.random_btn.setEnabled(False)
             self.visit_btn.setEnabled(False)
         
@@ -150,7 +146,7 @@ class TravelDialog(QDialog):
         layout.addWidget(self.history_list)
         
         refresh_btn = PushButton(FluentIcon.SYNC, '刷新')
-        refresh_btn.clicked.connect(self._load_history)
+        refresh_btn.clicked.connect(self._on_refresh)
         layout.addWidget(refresh_btn)
         
         return page
@@ -158,37 +154,50 @@ class TravelDialog(QDialog):
     def _load_data(self):
         self._load_history()
     
+    def _on_refresh(self):
+        api_client.invalidate_cache('/travels')
+        self._load_history()
+    
     def _load_history(self):
+        api_client.call_async('get_frog_travels', self.frog.api_id,
+                              on_success=self._on_history_loaded, owner=self)
+    
+    def _on_history_loaded(self, travels):
         self.history_list.clear()
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
-        travels = api_client.get_frog_travels(frog_id)
         
         for travel in travels:
-            status = travel.get('status', 'Unknown')
-            chain_id = travel.get('chainId', 0)
-            chain_name = {7001: 'ZetaChain', 97: 'BSC', 11155111: 'Sepolia'}.get(chain_id, f'Chain {chain_id}')
-            start_time = travel.get('startTime', '')[:10]
-            status_emoji = {'Completed': '✅', 'Active': '🔄', 'Cancelled': '❌'}.get(status, '❓')
-            self.history_list.addItem(f'{status_emoji} {start_time} - {chain_name}')
+            status_emoji = {'Completed': '✅', 'Active': '🔄', 'Cancelled': '❌'}.get(travel.status, '❓')
+            self.history_list.addItem(f'{status_emoji} {travel.start_date} - {travel.chain_name}')
         
         if not travels:
             self.history_list.addItem('暂无旅行记录')
     
     def _start_travel(self, travel_type):
         # 后端期望 tokenId 而非数据库 id
-        frog_id = self.frog.get('tokenId') or self.frog.get('id')
+        frog_id = self.frog.api_id
         chain = self.chain_combo.currentText().lower().replace(' ', '')
         duration = self.duration_spin.value()
         
-        try:
-            result = api_client.start_travel(frog_id, travel_type, chain, duration)
-            if result.get('success'):
-                InfoBar.success('成功', '旅行已开始！', parent=self,
-                              position=InfoBarPosition.TOP, duration=2000)
-                self.close()
-            else:
-                InfoBar.error('失败', result.get('error', '未知错误'), parent=self,
-                            position=InfoBarPosition.TOP, duration=3000)
-        except Exception as e:
-            InfoBar.error('错误', str(e), parent=self,
+        # 请求返回前禁用按钮，避免重复出发
+        self.random_btn.setEnabled(False)
+        self.visit_btn.setEnabled(False)
+        api_client.call_async('start_travel', frog_id, travel_type, chain, duration,
+                              on_success=self._on_travel_started,
+                              on_error=self._on_travel_error, owner=self)
+    
+    def _on_travel_started(self, result):
+        if result.get('success'):
+            InfoBar.success('成功', '旅行已开始！', parent=self,
+                          position=InfoBarPosition.TOP, duration=2000)
+            self.close()
+        else:
+            self.random_btn.setEnabled(True)
+            self.visit_btn.setEnabled(True)
+            InfoBar.error('失败', result.get('error', '未知错误'), parent=self,
                         position=InfoBarPosition.TOP, duration=3000)
+    
+    def _on_travel_error(self, error):
+        self.random_btn.setEnabled(True)
+        self.visit_btn.setEnabled(True)
+        InfoBar.error('错误', str(error), parent=self,
+                    position=InfoBarPosition.TOP, duration=3000)